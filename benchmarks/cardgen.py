@@ -0,0 +1,134 @@
+"""Synthetic camera-card generator for the benchmark suite.
+
+Cards are deterministic for a given profile, seed and scale so results stay
+comparable across commits. File contents are a seeded block repeated to size
+with a per-file header, which keeps generation I/O bound (no RNG per byte)
+while still giving every file its own digest.
+
+Sizes are multiplied by ``OCOPY_BENCH_SCALE`` (default ``1``, a few seconds
+per benchmark); use e.g. ``OCOPY_BENCH_SCALE=64`` for numbers closer to a
+real card.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+KiB = 1024
+MiB = 1024 * KiB
+
+_BLOCK_SIZE = 64 * KiB
+
+
+@dataclass(frozen=True)
+class CardProfile:
+    """Shape of one synthetic card.
+
+    ``clips`` large single-file clips, ``sequences`` image sequences of
+    ``frames`` files each, and a sidecar tree ``sidecar_depth`` folders deep
+    with ``sidecars_per_level`` small metadata files on each level.
+    """
+
+    name: str
+    clips: int = 0
+    clip_size: int = 0
+    sequences: int = 0
+    frames: int = 0
+    frame_size: int = 0
+    sidecar_depth: int = 0
+    sidecars_per_level: int = 0
+    sidecar_size: int = 2 * KiB
+
+    def scaled(self, scale: float) -> CardProfile:
+        """Return a copy with byte sizes multiplied by ``scale`` (file counts stay the same)."""
+        return CardProfile(
+            name=self.name,
+            clips=self.clips,
+            clip_size=int(self.clip_size * scale),
+            sequences=self.sequences,
+            frames=self.frames,
+            frame_size=int(self.frame_size * scale),
+            sidecar_depth=self.sidecar_depth,
+            sidecars_per_level=self.sidecars_per_level,
+            sidecar_size=self.sidecar_size,
+        )
+
+    @property
+    def file_count(self) -> int:
+        return self.clips * 2 + self.sequences * self.frames + self.sidecar_depth * self.sidecars_per_level
+
+    @property
+    def total_size(self) -> int:
+        return (
+            self.clips * (self.clip_size + self.sidecar_size)
+            + self.sequences * self.frames * self.frame_size
+            + self.sidecar_depth * self.sidecars_per_level * self.sidecar_size
+        )
+
+
+PROFILES: dict[str, CardProfile] = {
+    # Cinema camera: a handful of huge clips, each with an XML sidecar.
+    "clips": CardProfile("clips", clips=4, clip_size=32 * MiB),
+    # Raw / VFX plates: thousands of mid-size frames in per-clip folders.
+    "frames": CardProfile("frames", sequences=4, frames=500, frame_size=64 * KiB),
+    # Consumer / broadcast card: deep PRIVATE/... style metadata tree.
+    "sidecars": CardProfile("sidecars", sidecar_depth=8, sidecars_per_level=100),
+    # A bit of everything, closest to a real shoot day.
+    "mixed": CardProfile(
+        "mixed",
+        clips=2,
+        clip_size=32 * MiB,
+        sequences=2,
+        frames=250,
+        frame_size=64 * KiB,
+        sidecar_depth=6,
+        sidecars_per_level=40,
+    ),
+}
+
+
+def bench_scale() -> float:
+    return float(os.environ.get("OCOPY_BENCH_SCALE", "1"))
+
+
+def _write_file(path: Path, size: int, block: bytes) -> None:
+    header = f"{path.name}\n".encode()
+    with open(path, "wb") as f:
+        f.write(header[:size])
+        remaining = size - min(len(header), size)
+        while remaining > 0:
+            chunk = block[:remaining]
+            f.write(chunk)
+            remaining -= len(chunk)
+
+
+def generate_card(root: Path, profile: CardProfile, seed: int = 0) -> Path:
+    """Write a card shaped like ``profile`` to ``root / profile.name`` and return that path."""
+    rng = random.Random(seed)
+    block = rng.randbytes(_BLOCK_SIZE)
+    card = root / profile.name
+    card.mkdir(parents=True)
+
+    clip_dir = card / "CLIPS"
+    for i in range(1, profile.clips + 1):
+        clip_dir.mkdir(exist_ok=True)
+        _write_file(clip_dir / f"A001C{i:03d}_{seed:04d}XX.mov", profile.clip_size, block)
+        _write_file(clip_dir / f"A001C{i:03d}_{seed:04d}XX.xml", profile.sidecar_size, block)
+
+    for s in range(1, profile.sequences + 1):
+        seq_dir = card / "SEQUENCES" / f"A001C{s:03d}"
+        seq_dir.mkdir(parents=True)
+        for frame in range(profile.frames):
+            _write_file(seq_dir / f"A001C{s:03d}_{frame:07d}.dng", profile.frame_size, block)
+
+    level = card / "PRIVATE"
+    for depth in range(profile.sidecar_depth):
+        level = level / f"LEVEL{depth}"
+        level.mkdir(parents=True)
+        for n in range(profile.sidecars_per_level):
+            _write_file(level / f"M{depth:02d}{n:04d}.XML", profile.sidecar_size, block)
+
+    return card
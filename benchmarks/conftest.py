@@ -0,0 +1,55 @@
+import itertools
+import shutil
+
+import pytest
+
+from benchmarks.cardgen import PROFILES, bench_scale, generate_card
+from ocopy.checkpoint import Checkpoint
+
+
+@pytest.fixture(autouse=True)
+def _clear_hash_caches():
+    from ocopy.hash import _cached_load_ascmhl
+    from ocopy.mhl import _cached_load_mhl_index
+
+    for fn in (_cached_load_ascmhl, _cached_load_mhl_index):
+        fn.cache_clear()
+    Checkpoint._READ_CACHE.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _no_update_check(monkeypatch):
+    monkeypatch.setenv("OCOPY_NO_UPDATE_CHECK", "1")
+
+
+@pytest.fixture(scope="session")
+def cards(tmp_path_factory):
+    """Generate every profile once per session; benchmarks only ever read these."""
+    root = tmp_path_factory.mktemp("cards")
+    scale = bench_scale()
+    return {name: generate_card(root, profile.scaled(scale)) for name, profile in PROFILES.items()}
+
+
+@pytest.fixture(params=sorted(PROFILES))
+def card(request, cards):
+    return cards[request.param]
+
+
+@pytest.fixture
+def fresh_destinations(tmp_path):
+    """Return a ``setup`` callable for ``benchmark.pedantic`` that hands out empty destinations per round."""
+    rounds = itertools.count()
+    previous: list = []
+
+    def make(count: int = 2):
+        for d in previous:
+            shutil.rmtree(d, ignore_errors=True)
+        previous.clear()
+        n = next(rounds)
+        previous.extend(tmp_path / f"round{n}_dst{i}" for i in range(count))
+        for d in previous:
+            d.mkdir()
+        return list(previous)
+
+    return make
@@ -0,0 +1,35 @@
+"""End-to-end copy benchmarks: ``copy_and_seal`` per card profile and manifest flavor."""
+
+import pytest
+
+from ocopy.verified_copy import copy_and_seal
+
+ROUNDS = 3
+
+
+def test_copy_and_seal_ascmhl(benchmark, card, fresh_destinations):
+    benchmark.extra_info["files"] = sum(1 for p in card.rglob("*") if p.is_file())
+    benchmark.pedantic(
+        copy_and_seal,
+        setup=lambda: ((card, fresh_destinations()), {}),
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.parametrize("card", ["mixed"], indirect=True)
+def test_copy_and_seal_legacy_mhl(benchmark, card, fresh_destinations):
+    benchmark.pedantic(
+        copy_and_seal,
+        setup=lambda: ((card, fresh_destinations()), {"legacy_mhl": True}),
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.parametrize("card", ["mixed"], indirect=True)
+def test_copy_without_verification(benchmark, card, fresh_destinations):
+    """Baseline: plain fan-out copy, no re-read and no manifest."""
+    benchmark.pedantic(
+        copy_and_seal,
+        setup=lambda: ((card, fresh_destinations()), {"verify": False, "mhl": False}),
+        rounds=ROUNDS,
+    )
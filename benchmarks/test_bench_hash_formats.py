@@ -0,0 +1,98 @@
+"""Per-core throughput of each hash format, in memory and through ``get_hash`` / ``copy_and_seal``.
+
+``extra_info["gb_per_s"]`` is computed from the mean round time, so the saved
+JSON can be compared across machines and commits without post-processing.
+"""
+
+import random
+
+import pytest
+
+from benchmarks.cardgen import MiB, bench_scale
+from ocopy.hash import get_hash
+from ocopy.hash_formats import HASH_FORMATS, MultiHasher, new_hasher
+from ocopy.verified_copy import copy_and_seal
+
+ROUNDS = 5
+CHUNK = 1024 * 1024
+
+
+def _hash_buffer(hash_format: str, buffer: bytes) -> str:
+    hasher = new_hasher(hash_format)
+    view = memoryview(buffer)
+    for offset in range(0, len(view), CHUNK):
+        hasher.update(view[offset : offset + CHUNK])
+    return hasher.hexdigest()
+
+
+def _record_throughput(benchmark, nbytes: int) -> None:
+    benchmark.extra_info["bytes"] = nbytes
+    if benchmark.stats is None:
+        # --benchmark-disable: the benchmarks only run as smoke tests.
+        return
+    benchmark.extra_info["gb_per_s"] = round(nbytes / benchmark.stats.stats.mean / 1e9, 3)
+
+
+@pytest.fixture(scope="module")
+def buffer():
+    # One seeded block repeated, like cardgen; randbytes() of the whole buffer overflows on Python 3.11.
+    size = int(256 * MiB * bench_scale())
+    block = random.Random(0).randbytes(MiB)
+    return (block * (size // MiB + 1))[:size]
+
+
+@pytest.mark.parametrize("hash_format", sorted(HASH_FORMATS))
+def test_hash_in_memory(benchmark, buffer, hash_format):
+    """Single core, no I/O: the upper bound each format can reach."""
+    benchmark.pedantic(_hash_buffer, args=(hash_format, buffer), rounds=ROUNDS)
+    _record_throughput(benchmark, len(buffer))
+
+
+def _hash_buffer_multi(hash_formats: list[str], buffer: bytes) -> dict[str, str]:
+    hasher = MultiHasher(hash_formats)
+    view = memoryview(buffer)
+    for offset in range(0, len(view), CHUNK):
+        hasher.update(view[offset : offset + CHUNK])
+    return hasher.hexdigests()
+
+
+@pytest.mark.parametrize("parallel", [False, True], ids=["sequential", "multi_hasher"])
+def test_delivery_digests(benchmark, buffer, parallel):
+    """xxh64 + md5 + sha1 from one pass: one hasher after the other vs. :class:`MultiHasher` threads."""
+    formats = ["xxh64", "md5", "sha1"]
+    if parallel:
+        benchmark.pedantic(_hash_buffer_multi, args=(formats, buffer), rounds=ROUNDS)
+    else:
+        benchmark.pedantic(lambda: [_hash_buffer(fmt, buffer) for fmt in formats], rounds=ROUNDS)
+    _record_throughput(benchmark, len(buffer))
+
+
+@pytest.mark.parametrize("hash_format", sorted(HASH_FORMATS))
+def test_get_hash_file(benchmark, tmp_path, buffer, hash_format):
+    """Verification read of one (page-cached) file."""
+    path = tmp_path / "clip.mov"
+    path.write_bytes(buffer)
+    benchmark.pedantic(get_hash, args=(path,), kwargs={"hash_format": hash_format}, rounds=ROUNDS)
+    _record_throughput(benchmark, len(buffer))
+
+
+@pytest.mark.parametrize("hash_format", sorted(HASH_FORMATS))
+@pytest.mark.parametrize("card", ["clips"], indirect=True)
+def test_copy_and_seal_hash_format(benchmark, card, fresh_destinations, hash_format):
+    benchmark.pedantic(
+        copy_and_seal,
+        setup=lambda: ((card, fresh_destinations()), {"hash_format": hash_format}),
+        rounds=3,
+    )
+
+
+@pytest.mark.parametrize("parallel", [False, True], ids=["sequential", "background"])
+@pytest.mark.parametrize("extra_hashes", [(), ("md5", "sha1")], ids=["xxh64", "xxh64+md5+sha1"])
+def test_get_hash_large_file(benchmark, tmp_path, buffer, parallel, extra_hashes):
+    """One large file: hashing on the reading thread vs. on background threads (``get_hash(parallel=...)``)."""
+    path = tmp_path / "clip.mov"
+    path.write_bytes(buffer)
+    benchmark.pedantic(
+        lambda: get_hash(path, parallel=parallel, extra_hashes=dict.fromkeys(extra_hashes, "")), rounds=ROUNDS
+    )
+    _record_throughput(benchmark, len(buffer))
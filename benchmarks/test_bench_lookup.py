@@ -0,0 +1,124 @@
+"""Hashing, trusted-digest lookup and manifest benchmarks on an already copied ``mixed`` card.
+
+One module-scoped copy is made into several destinations, each prepared with a
+single trust source (ASC MHL, legacy MHL or checkpoint), so every ``find_hash``
+benchmark exercises exactly one lookup path.
+"""
+
+import datetime
+import shutil
+
+import pytest
+
+from ocopy.ascmhl_seal import seal_ascmhl_destinations
+from ocopy.checkpoint import Checkpoint
+from ocopy.hash import _cached_load_ascmhl, find_hash, multi_xxhash_check
+from ocopy.ignored import ascmhl_folder_name
+from ocopy.mhl import _cached_load_mhl_index, write_mhl
+from ocopy.verified_copy import copy_and_seal
+
+ROUNDS = 5
+TRUST_SOURCES = ["ascmhl", "legacy_mhl", "checkpoint", "resume", "unsealed"]
+
+
+def _cold_caches():
+    _cached_load_ascmhl.cache_clear()
+    _cached_load_mhl_index.cache_clear()
+    Checkpoint._READ_CACHE.clear()
+
+
+def _write_checkpoint(root, source, file_infos) -> bytes:
+    cp = Checkpoint(root)
+    cp.ensure_exists()
+    for fi in file_infos:
+        cp.record(fi.source.relative_to(source).as_posix(), fi.size, fi.mtime, fi.file_hash)
+    return cp.path.read_bytes()
+
+
+@pytest.fixture(scope="module")
+def copied(tmp_path_factory, cards):
+    """Copy the ``mixed`` card once and give each destination its own trust source."""
+    source = cards["mixed"]
+    parents = {name: tmp_path_factory.mktemp(name) for name in TRUST_SOURCES}
+    result = copy_and_seal(source, list(parents.values()), mhl=False)
+    roots = {name: parent / source.name for name, parent in parents.items()}
+
+    seal_ascmhl_destinations([roots["ascmhl"]], source, result.file_infos)
+    write_mhl([roots["legacy_mhl"]], result.file_infos, source, datetime.datetime.now())
+    checkpoints = {name: _write_checkpoint(roots[name], source, result.file_infos) for name in ("checkpoint", "resume")}
+
+    return source, parents, roots, result.file_infos, checkpoints
+
+
+def test_multi_xxhash_check_largest_clip(benchmark, copied):
+    source, _, roots, file_infos, _ = copied
+    largest = max(file_infos, key=lambda fi: fi.size).source
+    rel = largest.relative_to(source)
+    files = [largest, roots["ascmhl"] / rel, roots["legacy_mhl"] / rel]
+    benchmark.extra_info["bytes"] = largest.stat().st_size * len(files)
+    assert benchmark.pedantic(multi_xxhash_check, args=(files,), rounds=ROUNDS) != "hashes_do_not_match"
+
+
+@pytest.mark.parametrize("trust_source", ["ascmhl", "legacy_mhl", "checkpoint"])
+def test_find_hash_every_file(benchmark, copied, trust_source):
+    """Resume-style lookups from a cold cache: one ``find_hash`` per copied file."""
+    source, _, roots, file_infos, _ = copied
+    targets = [roots[trust_source] / fi.source.relative_to(source) for fi in file_infos]
+    benchmark.extra_info["files"] = len(targets)
+
+    def lookup_all():
+        return sum(1 for t in targets if find_hash(t))
+
+    found = benchmark.pedantic(lookup_all, setup=_cold_caches, rounds=ROUNDS)
+    assert found == len(targets)
+
+
+def test_checkpoint_lookup_every_file(benchmark, copied):
+    source, _, roots, file_infos, _ = copied
+    cp = Checkpoint(roots["checkpoint"])
+    keys = [(fi.source.relative_to(source).as_posix(), fi.size, fi.mtime) for fi in file_infos]
+
+    def lookup_all():
+        return sum(1 for key in keys if cp.lookup(*key))
+
+    assert benchmark.pedantic(lookup_all, setup=_cold_caches, rounds=ROUNDS) == len(keys)
+
+
+def test_resume_from_checkpoint(benchmark, copied):
+    """``copy_and_seal --skip-existing`` over a fully checkpointed destination (no byte is re-read)."""
+    source, parents, roots, _, checkpoints = copied
+    root = roots["resume"]
+
+    def restore():
+        shutil.rmtree(root / ascmhl_folder_name, ignore_errors=True)
+        (root / Checkpoint.FILENAME).write_bytes(checkpoints["resume"])
+        _cold_caches()
+
+    benchmark.pedantic(
+        copy_and_seal,
+        args=(source, [parents["resume"]]),
+        kwargs={"skip_existing": True},
+        setup=restore,
+        rounds=ROUNDS,
+    )
+
+
+def test_write_legacy_mhl(benchmark, copied, fresh_destinations):
+    source, _, _, file_infos, _ = copied
+    start = datetime.datetime.now()
+    benchmark.pedantic(
+        write_mhl,
+        setup=lambda: ((fresh_destinations(), file_infos, source, start), {}),
+        rounds=ROUNDS,
+    )
+
+
+def test_seal_ascmhl(benchmark, copied):
+    source, _, roots, file_infos, _ = copied
+    root = roots["unsealed"]
+    benchmark.pedantic(
+        seal_ascmhl_destinations,
+        args=([root], source, file_infos),
+        setup=lambda: shutil.rmtree(root / ascmhl_folder_name, ignore_errors=True),
+        rounds=ROUNDS,
+    )
@@ -1,6 +1,5 @@
 import tempfile
 from pathlib import Path
-from time import sleep
 
 from ocopy.verified_copy import CopyJob
 
@@ -21,8 +20,7 @@ def simple_example():
 
         # Create the copy job and wait until it is finished
         job = CopyJob(source, destinations, overwrite=True, verify=True)
-        while job.finished is not True:
-            sleep(0.1)
+        job.wait()
 
         # Print errors
         for error in job.errors:
@@ -0,0 +1,207 @@
+"""Tar archive destinations, written in the same pass as the directory copies.
+
+An :class:`ArchiveWriter` turns the chunks :func:`ocopy.verified_copy.copy`
+reads from the source into members of a POSIX (pax) tar archive, e.g. for LTO
+or object storage staging, so an offload doesn't have to be read a second time
+to package it. The xxh64 of every member's data and of the archive itself are
+computed while the bytes are written and stored next to the archive in
+``<archive>.json``::
+
+    {"archive": "A001.tar", "size": 1064960, "xxh64": "...",
+     "members": [{"name": "A001/clip.mov", "offset": 1536, "size": 1048576, "mtime": ..., "xxh64": "..."}]}
+
+The archive is written to ``<archive>.copy_in_progress`` and only renamed once
+it is complete. Archives can't be resumed: a cancelled or failed job discards
+the partial one, and a later run writes it from the start.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import stat
+import tarfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import cast
+
+import xxhash
+
+from ocopy.throttle import Throttle, ThrottleGroup
+from ocopy.tracing import span
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveError(OSError):
+    """Raised when a file can't be added to an archive, or the archive can't be completed."""
+
+
+@dataclass
+class ArchiveMember:
+    """One file in the archive; ``offset`` is where its data starts."""
+
+    name: str
+    offset: int
+    size: int
+    mtime: float
+    xxh64: str = ""
+
+
+class MemberWriter:
+    """Streams the data of one file into the archive; see :meth:`ArchiveWriter.open_member`."""
+
+    def __init__(self, archive: ArchiveWriter, member: ArchiveMember, start: int, archive_hash: xxhash.xxh64) -> None:
+        self.member = member
+        self._archive = archive
+        self._start = start
+        self._archive_hash = archive_hash
+        self._hash = xxhash.xxh64()
+        self._written = 0
+        self._discarded = False
+
+    def write(self, data: bytes | memoryview) -> None:
+        self._archive._write(data)
+        self._hash.update(data)
+        self._written += len(data)
+
+    def close(self) -> None:
+        """Finish the member; raises :class:`ArchiveError` if the file changed size while it was read."""
+        if self._written != self.member.size:
+            raise ArchiveError(
+                f"{self.member.name} changed size while it was archived ({self.member.size} -> {self._written} bytes)"
+            )
+        self._archive._write(tarfile.NUL * (-self.member.size % tarfile.BLOCKSIZE))
+        self.member.xxh64 = self._hash.hexdigest()
+        self._archive._commit(self.member)
+
+    def discard(self) -> None:
+        """Take the member out of the archive again; it must be the last one written."""
+        if not self._discarded:
+            self._discarded = True
+            self._archive._rewind(self._start, self._archive_hash, self.member)
+
+
+class ArchiveWriter:
+    """Writes ``path``, a tar archive with the files of a copy job under ``root``/."""
+
+    def __init__(self, path: Path, root: str) -> None:
+        self.path = path
+        self.root = root
+        self.members: list[ArchiveMember] = []
+        self.error: OSError | None = None
+        self.finished = False
+        self._tmp = path.with_name(path.name + ".copy_in_progress")
+        self._f = self._tmp.open("wb")
+        self._hash = xxhash.xxh64()
+        self._pos = 0
+        self._names: set[str] = set()
+
+    def __contains__(self, rel_path: str) -> bool:
+        return self._name(rel_path) in self._names
+
+    def add_directory(self, rel_path: str, st: os.stat_result) -> None:
+        info = self._info(rel_path, st)
+        info.type = tarfile.DIRTYPE
+        self._write(info.tobuf(tarfile.PAX_FORMAT))
+
+    def open_member(self, rel_path: str, st: os.stat_result) -> MemberWriter:
+        """Write the header of ``rel_path``; its data follows through :meth:`MemberWriter.write`."""
+        start, snapshot = self._pos, cast(xxhash.xxh64, self._hash.copy())
+        info = self._info(rel_path, st)
+        info.size = st.st_size
+        self._write(info.tobuf(tarfile.PAX_FORMAT))
+        return MemberWriter(self, ArchiveMember(info.name, self._pos, st.st_size, st.st_mtime), start, snapshot)
+
+    def add_file(self, rel_path: str, file_path: Path, throttle: Throttle | ThrottleGroup | None = None) -> None:
+        """Read ``file_path`` into the archive, for files the copy itself didn't read (e.g. skipped ones)."""
+        member = self.open_member(rel_path, file_path.stat())
+        try:
+            with span("archive.file", file=str(file_path)), open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    if throttle is not None:
+                        throttle.consume(len(chunk))
+                    member.write(chunk)
+            member.close()
+        except BaseException:
+            member.discard()
+            raise
+
+    def finish(self) -> str:
+        """Complete the archive and its ``.json`` sidecar, returning the archive's xxh64."""
+        with span("archive.finish"):
+            self._write(tarfile.NUL * (2 * tarfile.BLOCKSIZE))
+            self._write(tarfile.NUL * (-self._pos % tarfile.RECORDSIZE))
+            if self.error is None:
+                try:
+                    self._f.flush()
+                    os.fsync(self._f.fileno())
+                except OSError as err:
+                    self.error = err
+            self._f.close()
+            if self.error is not None:
+                self._tmp.unlink(missing_ok=True)
+                raise ArchiveError(f"Could not write archive {self.path}: {self.error}") from self.error
+            digest = self._hash.hexdigest()
+            os.replace(self._tmp, self.path)
+            manifest = {
+                "archive": self.path.name,
+                "size": self._pos,
+                "xxh64": digest,
+                "members": [asdict(member) for member in self.members],
+            }
+            sidecar = self.path.with_name(self.path.name + ".json")
+            tmp = sidecar.with_name(sidecar.name + ".tmp")
+            tmp.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+            os.replace(tmp, sidecar)
+        self.finished = True
+        return digest
+
+    def abort(self) -> None:
+        """Discard the partial archive (no-op once finished)."""
+        if self.finished:
+            return
+        self._f.close()
+        with contextlib.suppress(FileNotFoundError):
+            self._tmp.unlink()
+
+    def _name(self, rel_path: str) -> str:
+        return f"{self.root}/{rel_path}"
+
+    def _info(self, rel_path: str, st: os.stat_result) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(self._name(rel_path))
+        info.mtime = st.st_mtime
+        info.mode = stat.S_IMODE(st.st_mode)
+        return info
+
+    def _write(self, data: bytes | memoryview) -> None:
+        # After a write error the archive is lost, but the directory copies carry on; finish() reports it.
+        if self.error is not None:
+            return
+        try:
+            self._f.write(data)
+        except OSError as err:
+            self.error = err
+            return
+        self._hash.update(data)
+        self._pos += len(data)
+
+    def _commit(self, member: ArchiveMember) -> None:
+        self.members.append(member)
+        self._names.add(member.name)
+
+    def _rewind(self, start: int, archive_hash: xxhash.xxh64, member: ArchiveMember) -> None:
+        if self.members and self.members[-1] is member:
+            self.members.pop()
+            self._names.discard(member.name)
+        if self.error is not None:
+            return
+        try:
+            self._f.seek(start)
+            self._f.truncate()
+        except OSError as err:
+            self.error = err
+            return
+        self._pos = start
+        self._hash = archive_hash
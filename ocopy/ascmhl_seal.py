@@ -1,4 +1,10 @@
-"""Seal ASC MHL histories using mhllib with precomputed xxh64 digests (no media re-read)."""
+"""Seal ASC MHL histories using mhllib with precomputed file digests (no media re-read).
+
+The one exception is a history whose original hashes use a different format
+than this run's ``--hash-format``: ASC MHL only accepts a new format next to a
+verified hash in the original one, so those files are re-hashed in the original
+format on the destination.
+"""
 
 from __future__ import annotations
 
@@ -6,6 +12,7 @@ import datetime
 import importlib.metadata
 import os
 import platform
+from collections.abc import Callable
 from pathlib import Path
 
 from ascmhl import errors
@@ -19,6 +26,8 @@ from ascmhl.history import MHLHistory
 from ascmhl.traverse import post_order_lexicographic
 
 from ocopy.file_info import FileInfo
+from ocopy.hash import get_hash
+from ocopy.hash_formats import HASH_FORMATS
 from ocopy.ignored import ignored_paths
 from ocopy.utils import get_user_display_name
 
@@ -27,6 +36,17 @@ class ASCMHLSealError(Exception):
     """Raised when ASC MHL sealing fails (completeness, verification, or chain errors)."""
 
 
+_ASCMHL_ERRORS = (
+    errors.CompletenessCheckFailedException,
+    errors.VerificationFailedException,
+    errors.NoMHLHistoryException,
+    errors.ModifiedMHLManifestFileException,
+    errors.MissingMHLManifestException,
+    errors.NoMHLChainException,
+    AssertionError,
+)
+
+
 def _commit_ocopy_generation(session: MHLGenerationCreationSession) -> None:
     creator_info = MHLCreatorInfo()
     creator_info.tool = MHLTool("o/COPY", importlib.metadata.version("ocopy"))
@@ -81,19 +101,31 @@ def _file_infos_by_relposix(file_infos: list[FileInfo], source_root: Path) -> di
     return by_rel
 
 
-def seal_ascmhl_at_destination(content_root: Path, source_root: Path, file_infos: list[FileInfo]) -> None:
-    """
-    Append one ASC MHL generation under ``content_root`` using hashes from ``file_infos``.
+def _original_format_digest(history: MHLHistory, file_path: str, fi: FileInfo) -> tuple[str, str] | None:
+    """``(format, digest)`` of ``file_path`` in its history's original format when that differs from ``fi``'s."""
+    relative_path = history.get_relative_file_path(file_path)
+    file_history, history_relative_path = history.find_history_for_path(relative_path)
+    original = file_history.find_original_hash_entry_for_path(history_relative_path)
+    if original is None or original.hash_format == fi.hash_format or original.hash_format in fi.extra_hashes:
+        return None
+    if original.hash_format not in HASH_FORMATS:
+        raise ASCMHLSealError(
+            f"{relative_path} was originally hashed with {original.hash_format}, which o/COPY cannot verify"
+        )
+    return original.hash_format, get_hash(Path(file_path), hash_format=original.hash_format)
 
-    Directory content/structure hashes are omitted (``ascmhl create -n`` parity) to avoid
-    extra implementation surface; per-file records still match ocopy's xxh64.
+
+FileHashes = tuple[int, float, list[tuple[str, str]]]
+"""``(size, mtime, [(hash_format, digest), ...])`` to record for one file."""
+
+
+def _append_generation(root: str, history: MHLHistory, file_hashes: Callable[[str, str], FileHashes | None]) -> None:
+    """Append one generation recording ``file_hashes(file_path, rel_posix)`` for every file under ``root``.
+
+    Files it returns ``None`` for are left out of the generation; files of earlier
+    generations that are gone from disk fail the completeness check.
     """
-    root = str(Path(content_root).resolve())
-    src_root = source_root.resolve()
     root_path = Path(root)
-    by_rel = _file_infos_by_relposix(file_infos, src_root)
-
-    history = _load_or_bootstrap_history(root)
     ignore_spec = get_ignore_spec_including_nested_ignores(history, tuple(sorted(ignored_paths)), None)
     session = MHLGenerationCreationSession(history, ignore_spec)
 
@@ -104,20 +136,22 @@ def seal_ascmhl_at_destination(content_root: Path, source_root: Path, file_infos
 
     for folder_path, children in post_order_lexicographic(root, ignore_spec.get_path_spec()):
         for item_name, is_dir in children:
-            if is_dir:
-                continue
             file_path = os.path.join(folder_path, item_name)
+            # Earlier generations record directories too (``ascmhl create`` discards them the same way).
             not_found_paths.discard(file_path)
+            if is_dir:
+                continue
 
             rel_posix = Path(file_path).resolve().relative_to(root_path).as_posix()
-            fi = by_rel.get(rel_posix)
-            if fi is None:
-                # File was ignored by copytree (e.g. ``.DS_Store``) or lives outside the copy set.
+            hashes = file_hashes(file_path, rel_posix)
+            if hashes is None:
                 continue
 
-            mtime = datetime.datetime.fromtimestamp(fi.mtime)
-            if not session.append_file_hash(file_path, fi.size, mtime, "xxh64", fi.file_hash):
-                raise ASCMHLSealError(f"ASC MHL hash mismatch while sealing {rel_posix}")
+            size, mtime, digests = hashes
+            modification_date = datetime.datetime.fromtimestamp(mtime)
+            for hash_format, digest in digests:
+                if not session.append_file_hash(file_path, size, modification_date, hash_format, digest):
+                    raise ASCMHLSealError(f"ASC MHL hash mismatch while sealing {rel_posix}")
 
         # ``--no_directory_hashes`` parity: record directory entries without content/structure hashes.
         modification_date = datetime.datetime.fromtimestamp(os.path.getmtime(folder_path))
@@ -132,19 +166,60 @@ def seal_ascmhl_at_destination(content_root: Path, source_root: Path, file_infos
         raise ASCMHLSealError(f"ASC MHL completeness check failed: {exc}") from exc
 
 
+def seal_ascmhl_at_destination(content_root: Path, source_root: Path, file_infos: list[FileInfo]) -> None:
+    """
+    Append one ASC MHL generation under ``content_root`` using hashes from ``file_infos``.
+
+    Directory content/structure hashes are omitted (``ascmhl create -n`` parity) to avoid
+    extra implementation surface; per-file records still match ocopy's digests (``FileInfo.hash_format``).
+    """
+    root = str(Path(content_root).resolve())
+    by_rel = _file_infos_by_relposix(file_infos, source_root.resolve())
+    history = _load_or_bootstrap_history(root)
+
+    def file_hashes(file_path: str, rel_posix: str) -> FileHashes | None:
+        fi = by_rel.get(rel_posix)
+        if fi is None:
+            # File was ignored by copytree (e.g. ``.DS_Store``) or lives outside the copy set.
+            return None
+        original = _original_format_digest(history, file_path, fi)
+        digests = [original] if original is not None else []
+        digests.extend({fi.hash_format: fi.file_hash, **fi.extra_hashes}.items())
+        return fi.size, fi.mtime, digests
+
+    _append_generation(root, history, file_hashes)
+
+
+def seal_verified_generation(content_root: Path, verified: dict[str, tuple[str, str]]) -> None:
+    """Append a generation to ``content_root``'s existing history that re-records ``verified`` digests in place.
+
+    ``verified`` maps POSIX paths relative to ``content_root`` to ``(hash_format, digest)``
+    as just re-computed from disk (see :mod:`ocopy.audit`); ASC MHL marks them ``verified``.
+    """
+    root = str(Path(content_root).resolve())
+    try:
+        history = MHLHistory.load_from_path(root)
+    except _ASCMHL_ERRORS as e:
+        raise ASCMHLSealError(f"failed loading ASC MHL history of {content_root}: {e}") from e
+
+    def file_hashes(file_path: str, rel_posix: str) -> FileHashes | None:
+        entry = verified.get(rel_posix)
+        if entry is None:
+            return None
+        st = os.stat(file_path)
+        return st.st_size, st.st_mtime, [entry]
+
+    try:
+        _append_generation(root, history, file_hashes)
+    except _ASCMHL_ERRORS as e:
+        raise ASCMHLSealError(f"failed sealing {content_root}: {e}") from e
+
+
 def seal_ascmhl_destinations(destinations: list[Path], source: Path, file_infos: list[FileInfo]) -> None:
     for dest_root in destinations:
         try:
             seal_ascmhl_at_destination(dest_root, source, file_infos)
         except ASCMHLSealError as e:
             raise ASCMHLSealError(f"failed sealing destination {dest_root}: {e}") from e
-        except (
-            errors.CompletenessCheckFailedException,
-            errors.VerificationFailedException,
-            errors.NoMHLHistoryException,
-            errors.ModifiedMHLManifestFileException,
-            errors.MissingMHLManifestException,
-            errors.NoMHLChainException,
-            AssertionError,
-        ) as e:
+        except _ASCMHL_ERRORS as e:
             raise ASCMHLSealError(f"failed sealing destination {dest_root}: {e}") from e
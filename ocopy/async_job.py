@@ -0,0 +1,242 @@
+"""asyncio front end for :func:`ocopy.verified_copy.copy_and_seal`.
+
+:class:`AsyncCopyJob` runs the copy on its own thread, like
+:class:`~ocopy.verified_copy.CopyJob`, but reports to an event loop instead of
+being polled: progress is handed to the loop (coalesced, so a fast copy doesn't
+flood it), completion resolves a future, and cancelling sets the job's
+:data:`~ocopy.verified_copy.CancelToken`. One loop can follow hundreds of jobs
+without a polling task per job::
+
+    async with AsyncCopyJob(card, [raid, shuttle]) as job:
+        async for event in job.events():
+            if isinstance(event, CopyProgress):
+                print(event.percent_done)
+    print(job.errors)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Callable, Generator
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any
+
+from ocopy.progress import ProgressPhase, ProgressUpdate
+from ocopy.utils import folder_size
+from ocopy.verified_copy import CopyResult, CopyTreeError, DestinationsDropped, ErrorListEntry, copy_and_seal
+
+
+@dataclass(frozen=True, slots=True)
+class CopyProgress:
+    """Progress of an :class:`AsyncCopyJob`; ``total_done`` counts copied and verified bytes."""
+
+    percent_done: int
+    total_done: float
+    current_item: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class CopyFinished:
+    """Last event of an :class:`AsyncCopyJob`."""
+
+    result: CopyResult
+    errors: list[ErrorListEntry] = field(default_factory=list)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.result.cancelled
+
+
+CopyEvent = CopyProgress | CopyFinished
+
+
+class _LoopProgress:
+    """Stands in for the progress queue of the copy thread; see :func:`ocopy.progress.get_progress_queue`.
+
+    Updates are summed under a lock and at most one callback per loop iteration
+    turns them into a :class:`CopyProgress`.
+    """
+
+    def __init__(self, job: AsyncCopyJob, loop: asyncio.AbstractEventLoop) -> None:
+        self._job = job
+        self._loop = loop
+        self._lock = Lock()
+        self._pending = 0.0
+        self._current_item: str | None = None
+        self._scheduled = False
+
+    def put(self, update: ProgressUpdate) -> None:
+        nbytes = update.nbytes
+        if update.phase == ProgressPhase.VERIFY:
+            nbytes /= max(1, update.parallel_verify_readers)
+        with self._lock:
+            self._pending += nbytes
+            self._current_item = update.path.name.removesuffix(".copy_in_progress")
+            if self._scheduled:
+                return
+            self._scheduled = True
+        with contextlib.suppress(RuntimeError):  # the loop is already closed
+            self._loop.call_soon_threadsafe(self._deliver)
+
+    def _deliver(self) -> None:
+        with self._lock:
+            nbytes, self._pending = self._pending, 0.0
+            current_item = self._current_item
+            self._scheduled = False
+        self._job._progress(nbytes, current_item)
+
+
+class _CopyThread(Thread):
+    """Runs the copy; like ``CopyJob`` it carries the ``_progress_queue`` that ``get_progress_queue`` looks up."""
+
+    def __init__(self, target: Callable[[], None], progress: _LoopProgress) -> None:
+        super().__init__(target=target, name="ocopy-async", daemon=True)
+        self._progress_queue = progress
+
+
+class AsyncCopyJob:
+    """Copy ``source`` to ``destinations`` for an asyncio caller.
+
+    ``options`` are the keyword arguments of
+    :func:`~ocopy.verified_copy.copy_and_seal`. The job starts on entering
+    ``async with`` or on :meth:`start`; ``await job`` (or :meth:`wait`) returns
+    its :class:`~ocopy.verified_copy.CopyResult`, with per-file failures in
+    :attr:`errors` as on ``CopyJob``. Leaving ``async with`` through an exception,
+    or cancelling the task that awaits the job, cancels the copy.
+    """
+
+    def __init__(self, source: Path, destinations: list[Path], **options: Any) -> None:
+        if "cancel_token" in options:
+            raise TypeError("AsyncCopyJob provides its own cancel_token; use cancel()")
+        self.source = source
+        self.destinations = destinations
+        self.options = options
+        self.errors: list[ErrorListEntry] = []
+        self.result: CopyResult | None = None
+        self.total_size = 0
+        self.total_done = 0.0
+        self.current_item: str | None = None
+        self._cancel = Event()
+        self._done: asyncio.Future[CopyResult] | None = None
+        self._latest: CopyEvent | None = None
+        self._listeners: set[asyncio.Event] = set()
+        self._thread: Thread | None = None
+
+    async def __aenter__(self) -> AsyncCopyJob:
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.cancel()
+        with contextlib.suppress(Exception):
+            await self.wait()
+
+    def __await__(self) -> Generator[Any, None, CopyResult]:
+        return self.wait().__await__()
+
+    def start(self) -> None:
+        """Start the copy thread; must be called from the event loop that follows the job."""
+        if self._thread is not None:
+            raise RuntimeError("AsyncCopyJob was already started")
+        loop = asyncio.get_running_loop()
+        self._done = loop.create_future()
+        self._thread = _CopyThread(partial(self._run, loop), _LoopProgress(self, loop))
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Stop at the next chunk; in-progress files and checkpoints are kept for resume."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self._done is not None and self._done.done()
+
+    @property
+    def percent_done(self) -> int:
+        if self.finished:
+            return 100
+        todo = self.total_size * (2 if self.options.get("verify", True) else 1)
+        return min(100, round(100 / todo * self.total_done)) if todo else 0
+
+    async def wait(self) -> CopyResult:
+        """Wait for the job; cancelling the waiting task cancels the copy as well."""
+        if self._done is None:
+            raise RuntimeError("AsyncCopyJob was not started")
+        try:
+            return await asyncio.shield(self._done)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+    async def events(self) -> AsyncIterator[CopyEvent]:
+        """Yield :class:`CopyProgress` events as the copy advances, then one :class:`CopyFinished`.
+
+        Each event is the latest state: progress made while the consumer was busy
+        is merged into the next event rather than queued, so a slow consumer
+        never makes events pile up. Several consumers may iterate at once.
+        """
+        changed = asyncio.Event()
+        if self._latest is not None:
+            changed.set()
+        self._listeners.add(changed)
+        try:
+            while True:
+                await changed.wait()
+                changed.clear()
+                event = self._latest
+                assert event is not None
+                yield event
+                if isinstance(event, CopyFinished):
+                    return
+        finally:
+            self._listeners.discard(changed)
+
+    def _run(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            self.total_size = folder_size(self.source)
+            try:
+                result = copy_and_seal(self.source, self.destinations, cancel_token=self._cancel.is_set, **self.options)
+                errors = []
+            except DestinationsDropped as e:
+                result, errors = e.result, e.args[0]
+            except CopyTreeError as e:
+                result, errors = CopyResult(), e.args[0]
+        except BaseException as e:
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(self._fail, e)
+            return
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(self._finish, result, errors)
+
+    def _progress(self, nbytes: float, current_item: str | None) -> None:
+        if self.finished:
+            return
+        self.total_done += nbytes
+        self.current_item = current_item
+        self._publish(CopyProgress(self.percent_done, self.total_done, current_item))
+
+    def _finish(self, result: CopyResult, errors: list[ErrorListEntry]) -> None:
+        assert self._done is not None
+        self.result = result
+        self.errors = errors
+        self._done.set_result(result)
+        self._publish(CopyFinished(result, errors))
+
+    def _fail(self, error: BaseException) -> None:
+        assert self._done is not None
+        self._done.set_exception(error)
+        self._publish(CopyFinished(CopyResult(), [ErrorListEntry(self.source, self.destinations, str(error))]))
+
+    def _publish(self, event: CopyEvent) -> None:
+        self._latest = event
+        for changed in self._listeners:
+            changed.set()
@@ -0,0 +1,315 @@
+"""Re-verify existing copies against their ASC MHL history or legacy ``.mhl`` files (``ocopy verify``).
+
+Every file recorded for a copy root is re-hashed from disk in the format it was
+recorded in and compared to the recorded digest; nothing is copied. Later
+generations (or later ``.mhl`` files) shadow earlier ones, matching
+:func:`ocopy.hash.find_hash`. Reads run on a thread pool, capped per device by a
+:class:`ocopy.devices.DeviceLimiter`, so an audit of a RAID full of copy roots
+keeps every disk busy without thrashing spinning ones.
+
+Large archives can be audited in slices (e.g. nightly, with a
+:class:`ocopy.throttle.Throttle` keeping the disks usable for ingest): an
+:class:`AuditBudget` ends the slice, and an :class:`AuditState` sidecar
+(``.ocopy-audit``) remembers which files this pass already verified so the next
+slice continues where the last one stopped. Once every file was checked the pass
+is complete and the sidecar is removed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar
+
+from ocopy.backup_check import IN_PROGRESS_MARKER
+from ocopy.devices import DeviceLimiter
+from ocopy.hash import _load_ascmhl_history, get_hash
+from ocopy.hash_formats import HASH_FORMATS
+from ocopy.ignored import ascmhl_folder_name, is_ignored_basename
+from ocopy.mhl import _cached_load_mhl_index
+from ocopy.throttle import Throttle
+from ocopy.verified_copy import VERIFY_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class AuditError(Exception):
+    """Raised when a directory has no MHL history to verify against."""
+
+
+@dataclass(frozen=True)
+class RecordedFile:
+    """The digest an MHL history holds for one file."""
+
+    rel_path: str
+    """POSIX path relative to the copy root."""
+    hash_format: str
+    digest: str
+
+
+@dataclass
+class AuditReport:
+    """Outcome of re-verifying one copy root (or one slice of it)."""
+
+    root: Path
+    history: str
+    """``"ascmhl"`` or ``"mhl"`` (legacy flat MHL)."""
+    verified: list[RecordedFile] = field(default_factory=list)
+    """Files re-hashed and matching in this slice."""
+    previously_verified: list[RecordedFile] = field(default_factory=list)
+    """Files an earlier slice of the same pass verified (taken from the :class:`AuditState`)."""
+    missing: list[str] = field(default_factory=list)
+    altered: list[str] = field(default_factory=list)
+    unreadable: dict[str, str] = field(default_factory=dict)
+    """Relative path -> error message of files that couldn't be read."""
+    new: list[str] = field(default_factory=list)
+    """Files on disk that no generation records; reported, but not a failure."""
+    in_progress: list[str] = field(default_factory=list)
+    """``.copy_in_progress`` files a cancelled copy left behind; reported, but not a failure."""
+    remaining: list[str] = field(default_factory=list)
+    """Files the :class:`AuditBudget` left for the next slice."""
+    bytes_read: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.altered or self.unreadable)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every recorded file has been checked in this pass."""
+        return not self.remaining
+
+    def as_dict(self) -> dict:
+        """JSON-serializable summary, as written by ``ocopy verify --report``."""
+        return {
+            "root": str(self.root),
+            "history": self.history,
+            "verified": [f.rel_path for f in self.verified],
+            "previously_verified": len(self.previously_verified),
+            "missing": self.missing,
+            "altered": self.altered,
+            "unreadable": self.unreadable,
+            "new": self.new,
+            "in_progress": self.in_progress,
+            "remaining": len(self.remaining),
+            "bytes_read": self.bytes_read,
+            "complete": self.complete,
+        }
+
+
+@dataclass
+class AuditBudget:
+    """How much one audit slice may read; shared by every root of an ``ocopy verify`` run.
+
+    A file that was started is always finished, so a slice can overshoot by the
+    files in flight.
+    """
+
+    max_bytes: int | None = None
+    deadline: float | None = None
+    """:func:`time.monotonic` value after which no further file is started."""
+    spent: int = 0
+
+    def exhausted(self) -> bool:
+        if self.max_bytes is not None and self.spent >= self.max_bytes:
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+
+class AuditState:
+    """Copy-root sidecar (``.ocopy-audit``) of files verified in the current audit pass.
+
+    One JSON object per line: ``rel_path``, ``size``, ``mtime``, ``format`` and
+    ``digest``, appended and ``fsync``-ed as each file passes. A file counts as
+    done only while its size, mtime (2 s tolerance) and recorded digest are
+    unchanged. Altered and unreadable files are not recorded, so every slice
+    reports them again until they are fixed.
+    """
+
+    FILENAME: ClassVar[str] = ".ocopy-audit"
+
+    def __init__(self, copy_root: Path) -> None:
+        self.path = copy_root / self.FILENAME
+
+    def record(self, file: RecordedFile, size: int, mtime: float) -> None:
+        payload = json.dumps(
+            {
+                "rel_path": file.rel_path,
+                "size": size,
+                "mtime": mtime,
+                "format": file.hash_format,
+                "digest": file.digest,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        fd = os.open(str(self.path), os.O_APPEND | os.O_CREAT | os.O_WRONLY, 0o644)
+        try:
+            os.write(fd, (payload + "\n").encode("utf-8"))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def load(self) -> dict[str, tuple[int, float, RecordedFile]]:
+        """``rel_path -> (size, mtime, RecordedFile)``; the last record of a path wins."""
+        try:
+            raw = self.path.read_bytes()
+        except OSError:
+            return {}
+        done: dict[str, tuple[int, float, RecordedFile]] = {}
+        for line in raw.splitlines():
+            try:
+                rec = json.loads(line)
+                rel = rec["rel_path"]
+                done[rel] = (int(rec["size"]), float(rec["mtime"]), RecordedFile(rel, rec["format"], rec["digest"]))
+            except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError):
+                continue
+        return done
+
+    def clear(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+
+
+def _ascmhl_records(root: Path) -> dict[str, RecordedFile] | None:
+    history = _load_ascmhl_history(root)
+    if history is None:
+        return None
+    records: dict[str, RecordedFile] = {}
+    for hash_list in history.hash_lists:
+        for media_hash in hash_list.media_hashes:
+            if media_hash.is_directory or not media_hash.path:
+                continue
+            # ocopy records the primary digest first; skip formats it can't compute (e.g. a vendor's own).
+            for entry in media_hash.hash_entries:
+                if entry.hash_format in HASH_FORMATS and entry.hash_string:
+                    rel = Path(media_hash.path).as_posix()
+                    records[rel] = RecordedFile(rel, entry.hash_format, entry.hash_string)
+                    break
+    return records
+
+
+def _legacy_records(root: Path) -> dict[str, RecordedFile] | None:
+    mhls = sorted(root.glob("*.mhl"))
+    if not mhls:
+        return None
+    records: dict[str, RecordedFile] = {}
+    for mhl_path in mhls:
+        index = _cached_load_mhl_index(str(mhl_path.resolve()), mhl_path.stat().st_mtime_ns)
+        records.update((rel, RecordedFile(rel, "xxh64", digest)) for rel, digest in index.items())
+    return records
+
+
+def recorded_files(root: Path) -> tuple[str, dict[str, RecordedFile]]:
+    """``(history, {rel_path: RecordedFile})`` of ``root``; ASC MHL wins over legacy ``.mhl`` files."""
+    if (root / ascmhl_folder_name).is_dir():
+        records = _ascmhl_records(root)
+        if records is None:
+            raise AuditError(f"{root} has an unreadable ASC MHL history")
+        return "ascmhl", records
+    records = _legacy_records(root)
+    if records is None:
+        raise AuditError(f"{root} has no ASC MHL history or .mhl file")
+    return "mhl", records
+
+
+def _files_on_disk(root: Path) -> Iterator[tuple[str, os.stat_result]]:
+    """``(rel_posix, stat)`` of every file under ``root`` that ocopy would copy, minus top-level ``.mhl`` files."""
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not is_ignored_basename(d)]
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        for filename in files:
+            if is_ignored_basename(filename) or (rel_dir == "." and filename.endswith(".mhl")):
+                continue
+            try:
+                st = os.stat(os.path.join(dirpath, filename))
+            except OSError:
+                logger.warning(f"Could not stat {os.path.join(dirpath, filename)}")
+                continue
+            yield (filename if rel_dir == "." else f"{rel_dir}/{filename}"), st
+
+
+def audit_destination(
+    root: Path,
+    *,
+    workers: int = VERIFY_WORKERS,
+    limiter: DeviceLimiter | None = None,
+    throttle: Throttle | None = None,
+    state: AuditState | None = None,
+    budget: AuditBudget | None = None,
+) -> AuditReport:
+    """Re-hash every file ``root``'s MHL history records and compare it to the recorded digest.
+
+    With a ``state``, files an earlier slice of this pass verified are skipped,
+    newly verified ones are added, and the state is cleared once the pass is
+    complete. A ``budget`` stops starting files once it is exhausted; the rest
+    are listed in :attr:`AuditReport.remaining`.
+    """
+    history, records = recorded_files(root)
+    on_disk = dict(_files_on_disk(root))
+    unrecorded = sorted(on_disk.keys() - records.keys())
+    report = AuditReport(
+        root=root,
+        history=history,
+        missing=sorted(records.keys() - on_disk.keys()),
+        new=[rel for rel in unrecorded if IN_PROGRESS_MARKER not in rel.rsplit("/", 1)[-1]],
+        in_progress=[rel for rel in unrecorded if IN_PROGRESS_MARKER in rel.rsplit("/", 1)[-1]],
+    )
+    limiter = limiter or DeviceLimiter()
+    done = state.load() if state is not None else {}
+
+    pending: list[RecordedFile] = []
+    for rel in sorted(records.keys() & on_disk.keys()):
+        record, st = records[rel], on_disk[rel]
+        size, mtime, verified = done.get(rel, (None, 0.0, None))
+        if verified == record and size == st.st_size and abs(mtime - st.st_mtime) <= 2.0:
+            report.previously_verified.append(record)
+        else:
+            pending.append(record)
+
+    def check(record: RecordedFile) -> str:
+        return get_hash(root / record.rel_path, hash_format=record.hash_format, limiter=limiter, throttle=throttle)
+
+    def collect(record: RecordedFile, future: Future[str]) -> None:
+        try:
+            digest = future.result()
+        except OSError as err:
+            logger.warning(f"Could not read {root / record.rel_path}: {err}")
+            report.unreadable[record.rel_path] = str(err)
+            return
+        if digest != record.digest:
+            report.altered.append(record.rel_path)
+            return
+        report.verified.append(record)
+        if state is not None:
+            st = on_disk[record.rel_path]
+            state.record(record, st.st_size, st.st_mtime)
+
+    # Files are submitted as workers free up (not all at once) so the budget is checked before each one.
+    in_flight: deque[tuple[RecordedFile, Future[str]]] = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocopy-audit") as executor:
+        for index, record in enumerate(pending):
+            if budget is not None and budget.exhausted():
+                report.remaining = [r.rel_path for r in pending[index:]]
+                break
+            size = on_disk[record.rel_path].st_size
+            report.bytes_read += size
+            if budget is not None:
+                budget.spent += size
+            in_flight.append((record, executor.submit(check, record)))
+            if len(in_flight) >= workers:
+                collect(*in_flight.popleft())
+        while in_flight:
+            collect(*in_flight.popleft())
+
+    if state is not None and report.complete:
+        state.clear()
+    return report
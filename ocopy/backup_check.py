@@ -1,11 +1,27 @@
 import logging
 import os
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path, PurePosixPath
 
+from ocopy.file_info import FileInfo
 from ocopy.ignored import is_ignored_basename
+from ocopy.tracing import span
 
 logger = logging.getLogger(__name__)
 
+IN_PROGRESS_MARKER = "copy_in_progress"
+
+
+@dataclass
+class DestinationReport:
+    """Post-copy completeness of one destination, gathered in a single tree walk."""
+
+    destination: Path
+    missing: list[str] = field(default_factory=list)
+    in_progress: list[Path] = field(default_factory=list)
+
 
 def get_signatures(path: Path) -> set:
     signatures = set()
@@ -25,30 +41,124 @@ def get_signatures(path: Path) -> set:
     return signatures
 
 
-def get_missing(src: str, dst: str) -> tuple[list[str], int]:
-    logger.info(f"Searching all files from {src} in {dst}")
-    src_path = Path(src)
-
-    missing = get_signatures(src_path)
-    count = len(missing)
-    logger.info("Found %d files on %s", count, src_path)
-
-    endings = tuple({os.path.splitext(m[0])[1] or m[0] for m in missing})
+def _scan_destination(dst: str, endings: tuple[str, ...]) -> tuple[set, list[Path]]:
+    """Walk ``dst`` once, returning signatures of files with ``endings`` and any in-progress temp files."""
+    found = set()
+    in_progress: list[Path] = []
 
     for root, dirs, files in os.walk(dst):
         dirs.sort(reverse=True)
 
         dirs[:] = [d for d in dirs if not is_ignored_basename(d)]
-        files = [f for f in files if not is_ignored_basename(f) and f.endswith(endings)]
 
         for filename in files:
+            if is_ignored_basename(filename):
+                continue
             filepath = os.path.join(root, filename)
+            if IN_PROGRESS_MARKER in filename:
+                in_progress.append(Path(filepath))
+            if not filename.endswith(endings):
+                continue
             try:
-                missing.difference_update([(filename, os.path.getsize(filepath))])
+                found.add((filename, os.path.getsize(filepath)))
             except OSError:
                 logger.warning(f"Could not get size for {filepath}")
 
-    missing_files = [m[0] for m in missing]
+    return found, in_progress
+
+
+def _missing_against(src_signatures: set, dst: str) -> tuple[list[str], list[Path]]:
+    endings = tuple({os.path.splitext(m[0])[1] or m[0] for m in src_signatures})
+    found, in_progress = _scan_destination(dst, endings)
+    missing_files = [m[0] for m in src_signatures - found]
     logger.info(f"Missing files: {missing_files}")
+    return missing_files, in_progress
+
+
+def get_missing(src: str, dst: str) -> tuple[list[str], int]:
+    logger.info(f"Searching all files from {src} in {dst}")
+    src_path = Path(src)
+
+    signatures = get_signatures(src_path)
+    count = len(signatures)
+    logger.info("Found %d files on %s", count, src_path)
 
+    missing_files, _ = _missing_against(signatures, dst)
     return missing_files, count
+
+
+def check_destination(src_signatures: set, dst: Path) -> DestinationReport:
+    missing, in_progress = _missing_against(src_signatures, dst.as_posix())
+    return DestinationReport(dst, missing, in_progress)
+
+
+def _plan_by_directory(file_infos: list[FileInfo], source_root: Path) -> dict[PurePosixPath, dict[str, int]]:
+    """Group the copy plan as ``relative directory -> {basename: size}``."""
+    plan: dict[PurePosixPath, dict[str, int]] = {}
+    for fi in file_infos:
+        rel = PurePosixPath(fi.source.relative_to(source_root).as_posix())
+        plan.setdefault(rel.parent, {})[rel.name] = fi.size
+    return plan
+
+
+def check_destination_against_plan(plan: dict[PurePosixPath, dict[str, int]], dst: Path) -> DestinationReport:
+    """Check ``dst`` against an in-memory copy plan with one ``scandir`` per planned directory.
+
+    Unlike :func:`get_missing` this matches by relative path, so identically named
+    clips in different folders can't stand in for each other. Missing entries are
+    reported as POSIX paths relative to ``dst``.
+    """
+    report = DestinationReport(dst)
+    for rel_dir, expected in sorted(plan.items()):
+        present: dict[str, int] = {}
+        try:
+            with os.scandir(dst / rel_dir) as entries:
+                for entry in entries:
+                    if IN_PROGRESS_MARKER in entry.name:
+                        report.in_progress.append(Path(entry.path))
+                    if entry.name not in expected:
+                        continue
+                    try:
+                        present[entry.name] = entry.stat().st_size
+                    except OSError:
+                        logger.warning(f"Could not get size for {entry.path}")
+        except OSError:
+            logger.warning(f"Could not scan {dst / rel_dir}")
+        for name, size in sorted(expected.items()):
+            if present.get(name) != size:
+                report.missing.append((rel_dir / name).as_posix())
+    logger.info(f"Missing files: {report.missing}")
+    return report
+
+
+def check_destinations(
+    src: Path, destinations: list[Path], file_infos: list[FileInfo] | None = None
+) -> list[DestinationReport]:
+    """Check every destination against ``src`` concurrently.
+
+    With ``file_infos`` (the verified copy plan) each destination is checked by
+    relative path without walking the source again. Without it, the source is
+    walked once and compared by ``(basename, size)`` signature as in
+    :func:`get_missing`, which is the independent "deep" check.
+
+    Each destination usually sits on its own drive, so the metadata walks overlap
+    instead of adding up. Reports are returned in ``destinations`` order.
+    """
+    if not destinations:
+        return []
+    with span("check.destinations", destinations=len(destinations)):
+        return _check_destinations(src, destinations, file_infos)
+
+
+def _check_destinations(
+    src: Path, destinations: list[Path], file_infos: list[FileInfo] | None
+) -> list[DestinationReport]:
+    if file_infos is not None:
+        check = partial(check_destination_against_plan, _plan_by_directory(file_infos, src))
+    else:
+        src_signatures = get_signatures(src)
+        logger.info("Found %d files on %s", len(src_signatures), src)
+        check = partial(check_destination, src_signatures)
+
+    with ThreadPoolExecutor(max_workers=len(destinations)) as executor:
+        return list(executor.map(check, destinations))
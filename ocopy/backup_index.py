@@ -0,0 +1,245 @@
+"""Persistent, incrementally updated index of an archive volume for fast "is this card backed up?" checks."""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import ClassVar
+
+from ocopy.hash import _load_ascmhl_history
+from ocopy.ignored import ascmhl_folder_name, is_ignored_basename
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    xxh64 TEXT
+);
+CREATE INDEX IF NOT EXISTS files_name_size ON files (name, size);
+CREATE TABLE IF NOT EXISTS histories (
+    root TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class IndexUpdate:
+    """Counters describing what one :meth:`BackupIndex.update` pass changed."""
+
+    scanned: int = 0
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    hashes: int = 0
+
+
+@dataclass
+class BackupMatch:
+    """One candidate location of a source tree inside the archive."""
+
+    root: str
+    """POSIX path relative to the archive root (``""`` for the archive root itself)."""
+    matched: int
+    with_xxh64: int
+    missing: list[str] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing
+
+
+class BackupIndex:
+    """SQLite index (``.ocopy-index``) of every file on an archive volume.
+
+    Rows hold the POSIX path relative to the archive root, size, ``mtime_ns`` and
+    (when an ASC MHL history on the volume records one) the xxh64 digest. Updates
+    only rewrite rows whose size or mtime changed and only re-read ASC MHL
+    histories whose ``ascmhl/`` folder changed or that cover a changed file, so a
+    second pass over an untouched 500k-file archive is a pure metadata walk.
+
+    Lookups match by relative path *and* size, so identically named clips from
+    different shoot days are never confused with each other.
+    """
+
+    FILENAME: ClassVar[str] = ".ocopy-index"
+
+    def __init__(self, archive_root: Path) -> None:
+        self.archive_root = Path(archive_root)
+        self.path = self.archive_root / self.FILENAME
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> BackupIndex:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def update(self) -> IndexUpdate:
+        """Bring the index in line with the volume; returns what changed."""
+        stats = IndexUpdate()
+        known = {row[0]: (row[1], row[2]) for row in self._db.execute("SELECT path, size, mtime_ns FROM files")}
+        seen: set[str] = set()
+        changed_paths: list[str] = []
+        history_roots: dict[str, int] = {}
+
+        with self._db:
+            for rel, name, st in self._walk(history_roots):
+                stats.scanned += 1
+                seen.add(rel)
+                previous = known.get(rel)
+                if previous == (st.st_size, st.st_mtime_ns):
+                    continue
+                if previous is None:
+                    stats.added += 1
+                else:
+                    stats.changed += 1
+                changed_paths.append(rel)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO files (path, name, size, mtime_ns, xxh64) VALUES (?, ?, ?, ?, NULL)",
+                    (rel, name, st.st_size, st.st_mtime_ns),
+                )
+
+            removed = [(p,) for p in known.keys() - seen]
+            self._db.executemany("DELETE FROM files WHERE path = ?", removed)
+            stats.removed = len(removed)
+
+            stats.hashes = self._harvest_histories(history_roots, changed_paths)
+
+        return stats
+
+    def find_backups(self, source: Path) -> list[BackupMatch]:
+        """Return archive locations holding ``source``'s files, best match first.
+
+        A location counts a source file when the archive holds a file at the same
+        path relative to that location with the same size. Complete matches sort
+        first; an empty list means no file of ``source`` was found at all.
+        """
+        wanted = list(_source_files(source))
+        counts: Counter[str] = Counter()
+        hashed: Counter[str] = Counter()
+        found: dict[str, set[str]] = {}
+        for rel, size in wanted:
+            name = PurePosixPath(rel).name
+            for path, xxh64 in self._db.execute(
+                "SELECT path, xxh64 FROM files WHERE name = ? AND size = ?", (name, size)
+            ):
+                if path == rel:
+                    root = ""
+                elif path.endswith("/" + rel):
+                    root = path[: -len(rel) - 1]
+                else:
+                    continue
+                counts[root] += 1
+                if xxh64:
+                    hashed[root] += 1
+                found.setdefault(root, set()).add(rel)
+
+        matches = [
+            BackupMatch(
+                root=root,
+                matched=matched,
+                with_xxh64=hashed[root],
+                missing=sorted(rel for rel, _ in wanted if rel not in found[root]),
+            )
+            for root, matched in counts.items()
+        ]
+        matches.sort(key=lambda m: (len(m.missing), -m.with_xxh64, m.root))
+        return matches
+
+    def _walk(self, history_roots: dict[str, int]):
+        """Yield ``(rel_posix, name, stat)`` for every non-ignored file under the archive root."""
+        stack = [(self.archive_root, "")]
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                logger.warning(f"Could not scan {directory}")
+                continue
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name == ascmhl_folder_name:
+                            history_roots[rel_dir] = entry.stat().st_mtime_ns
+                        if not is_ignored_basename(entry.name):
+                            stack.append((Path(entry.path), rel))
+                        continue
+                    if is_ignored_basename(entry.name) or not entry.is_file(follow_symlinks=False):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    logger.warning(f"Could not stat {entry.path}")
+                    continue
+                yield rel, entry.name, st
+
+    def _harvest_histories(self, history_roots: dict[str, int], changed_paths: list[str]) -> int:
+        """Fill ``xxh64`` from ASC MHL histories that changed or cover a changed file."""
+        recorded = dict(self._db.execute("SELECT root, mtime_ns FROM histories"))
+        self._db.executemany(
+            "DELETE FROM histories WHERE root = ?", [(r,) for r in recorded.keys() - history_roots.keys()]
+        )
+
+        covering_changes: set[str] = set()
+        for rel in changed_paths:
+            for parent in PurePosixPath(rel).parents:
+                key = "" if parent == PurePosixPath(".") else parent.as_posix()
+                if key in history_roots:
+                    covering_changes.add(key)
+
+        filled = 0
+        for root, mtime_ns in sorted(history_roots.items()):
+            if recorded.get(root) == mtime_ns and root not in covering_changes:
+                continue
+            prefix = f"{root}/" if root else ""
+            history = _load_ascmhl_history(self.archive_root / root)
+            if history is None:
+                continue
+            # Later generations shadow earlier ones, matching ``find_hash``.
+            latest: dict[str, tuple[int | None, str]] = {}
+            for hash_list in history.hash_lists:
+                for media_hash in hash_list.media_hashes:
+                    if media_hash.is_directory or not media_hash.path:
+                        continue
+                    entry = media_hash.find_hash_entry_for_format("xxh64")
+                    if entry is not None and entry.hash_string:
+                        latest[Path(media_hash.path).as_posix()] = (media_hash.file_size, entry.hash_string)
+            for rel, (size, digest) in latest.items():
+                cur = self._db.execute(
+                    "UPDATE files SET xxh64 = ? WHERE path = ? AND (? IS NULL OR size = ?)",
+                    (digest, prefix + rel, size, size),
+                )
+                filled += cur.rowcount
+            self._db.execute("INSERT OR REPLACE INTO histories (root, mtime_ns) VALUES (?, ?)", (root, mtime_ns))
+        return filled
+
+
+def _source_files(source: Path):
+    """Yield ``(rel_posix, size)`` for every non-ignored file under ``source``."""
+    for root, dirs, files in os.walk(source):
+        dirs[:] = [d for d in dirs if not is_ignored_basename(d)]
+        rel_root = Path(root).relative_to(source).as_posix()
+        for filename in files:
+            if is_ignored_basename(filename):
+                continue
+            rel = filename if rel_root == "." else f"{rel_root}/{filename}"
+            try:
+                yield rel, os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                logger.warning(f"Could not get size for {os.path.join(root, filename)}")
@@ -0,0 +1,172 @@
+"""Copy several cards to the same destinations at once (``ocopy batch``).
+
+Every source becomes a :class:`~ocopy.verified_copy.CopyJob`. A job only starts
+while its source device and every destination device have a free slot, so a hub
+full of cards is read in parallel while each destination disk sees a bounded
+number of writers. Jobs start in the order given, but one that has to wait does
+not hold back later ones that fit.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache
+from pathlib import Path
+from threading import Condition, Event, Thread
+from typing import Any
+
+from ocopy.devices import default_readers, device_of
+from ocopy.verified_copy import CopyJob, ErrorListEntry
+
+JOBS_PER_SOURCE_DEVICE = 1
+"""Cards copied at once from the same device (two folders of one card are read one after the other)."""
+
+
+def default_writers(device: int) -> int:
+    """Jobs writing to ``device`` at once: like verification readers, one per spinning disk and more for SSDs."""
+    return default_readers(device)
+
+
+class DeviceSlots:
+    """Counts the running jobs per device against a per-device limit."""
+
+    def __init__(self, limit: Callable[[int], int]) -> None:
+        self._limit = cache(limit)
+        self._busy: Counter[int] = Counter()
+
+    def free(self, devices: Iterable[int]) -> bool:
+        return all(self._busy[device] < self._limit(device) for device in devices)
+
+    def take(self, devices: Iterable[int]) -> None:
+        self._busy.update(devices)
+
+    def give(self, devices: Iterable[int]) -> None:
+        self._busy.subtract(devices)
+
+
+class BatchJob(Thread):
+    """Copy each of ``sources`` into every one of ``destinations``, scheduled per device.
+
+    At most ``jobs_per_source_device`` jobs read from the same device and at most
+    ``writers_per_destination_device`` write to each destination device (default:
+    :func:`default_writers`). ``options`` are passed on to every
+    :class:`~ocopy.verified_copy.CopyJob`, whose outcome is kept in :attr:`jobs`.
+    """
+
+    jobs: list[CopyJob]
+    finished: bool
+
+    def __init__(
+        self,
+        sources: list[Path],
+        destinations: list[Path],
+        jobs_per_source_device: int = JOBS_PER_SOURCE_DEVICE,
+        writers_per_destination_device: int | None = None,
+        auto_start: bool = True,
+        **options: Any,
+    ):
+        if jobs_per_source_device < 1 or (writers_per_destination_device or 1) < 1:
+            raise ValueError("Device limits must be at least 1")
+        names = Counter(source.name for source in sources)
+        if duplicates := sorted(name for name, count in names.items() if count > 1):
+            raise ValueError(f"Sources would be copied to the same folder: {', '.join(duplicates)}")
+        super().__init__()
+        self.daemon = True
+        self.destinations = destinations
+        self.finished = False
+        self._changed = Condition()
+        self._cancel = Event()
+        self._done = Event()
+        self._source_slots = DeviceSlots(lambda _: jobs_per_source_device)
+        self._destination_slots = DeviceSlots(lambda device: writers_per_destination_device or default_writers(device))
+        self._destination_devices = sorted({device_of(d) for d in destinations})
+        self.jobs = [
+            CopyJob(source, destinations, auto_start=False, progress_changed=self._changed, **options)
+            for source in sources
+        ]
+        self._source_devices = {job: device_of(job.source) for job in self.jobs}
+        self.not_started: list[CopyJob] = []
+        self._start_time = time.time()
+
+        if auto_start:
+            self.start()
+
+    def cancel(self) -> None:
+        """Stop the running jobs at their next chunk and don't start the others."""
+        with self._changed:
+            self._cancel.set()
+            for job in self.jobs:
+                if job.is_alive():
+                    job.cancel()
+            self._changed.notify_all()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until every job has finished; returns ``False`` if ``timeout`` expired first."""
+        return self._done.wait(timeout)
+
+    @property
+    def running(self) -> list[CopyJob]:
+        return [job for job in self.jobs if job.is_alive() and not job.finished]
+
+    @property
+    def interrupted_by_cancel(self) -> bool:
+        return bool(self.not_started) or any(job.interrupted_by_cancel for job in self.jobs)
+
+    @property
+    def errors(self) -> list[ErrorListEntry]:
+        return [error for job in self.jobs for error in job.errors]
+
+    @property
+    def total_size(self) -> int:
+        return sum(job.total_size for job in self.jobs)
+
+    @property
+    def percent_done(self) -> int:
+        if self.finished:
+            return 100
+        todo = sum(job.todo_size for job in self.jobs)
+        return round(100 / todo * sum(job.total_done for job in self.jobs)) if todo else 100
+
+    @property
+    def speed(self) -> float:
+        """Bytes per second copied by all jobs together."""
+        copied = sum(job.total_done / 2 if job.verify else job.total_done for job in self.jobs)
+        return copied / max(time.time() - self._start_time, 1e-6)
+
+    @property
+    def progress(self) -> Iterator[str | None]:
+        """Like :attr:`CopyJob.progress`; yields the names of the cards being copied."""
+        for i in range(1, 101):
+            with self._changed:
+                self._changed.wait_for(lambda i=i: self.percent_done >= i)
+            yield ", ".join(job.source.name for job in self.running) or None
+
+    def run(self):
+        self._start_time = time.time()
+        pending = list(self.jobs)
+        running: list[CopyJob] = []
+        with self._changed:
+            while pending or running:
+                for job in [job for job in running if job.finished]:
+                    running.remove(job)
+                    self._source_slots.give([self._source_devices[job]])
+                    self._destination_slots.give(self._destination_devices)
+                if self._cancel.is_set():
+                    self.not_started, pending = pending, []
+                for job in list(pending):
+                    source_device = [self._source_devices[job]]
+                    if self._source_slots.free(source_device) and self._destination_slots.free(
+                        self._destination_devices
+                    ):
+                        self._source_slots.take(source_device)
+                        self._destination_slots.take(self._destination_devices)
+                        pending.remove(job)
+                        running.append(job)
+                        job.start()
+                if running:
+                    self._changed.wait()
+            self.finished = True
+            self._changed.notify_all()
+        self._done.set()
@@ -8,14 +8,29 @@ import os
 from pathlib import Path
 from typing import ClassVar
 
+from ocopy.hash_formats import DEFAULT_HASH_FORMAT, HASH_FORMATS
+from ocopy.tracing import span
+
+# (rel_path, size, hash format) -> [(mtime, digest), ...] in file order.
+_Index = dict[tuple[str, int, str], list[tuple[float, str]]]
+# (rel_path, size) -> [(mtime, durable offset), ...] in file order.
+_PartialIndex = dict[tuple[str, int], list[tuple[float, int]]]
+
 
 class Checkpoint:
     """Per-destination copy-root sidecar (``.ocopy-checkpoint``).
 
-    Records one JSON object per line: ``rel_path``, ``size``, ``mtime``, ``xxh64``.
+    Records one JSON object per line: ``rel_path``, ``size``, ``mtime`` and the
+    digest under its hash format name (``xxh64``, ``xxh3``, ``md5``, ...), plus any
+    extra digests computed in the same pass.
     Append-only with ``fsync`` after each record for crash safety. Readers tolerate
     a truncated final line (partial write).
 
+    Large files that are still being copied get ``partial`` records instead of
+    a digest: the number of bytes of the ``.copy_in_progress`` file known to be
+    on stable storage, so an interrupted run can continue that file instead of
+    starting it from zero (see :meth:`record_partial`).
+
     Lookups are backed by a process-wide cache keyed by resolved path + file mtime,
     so repeated ``find_hash`` calls on resume don't re-parse the same JSONL file
     once per lookup. The cache is populated lazily and invalidated whenever the
@@ -25,8 +40,8 @@ class Checkpoint:
     FILENAME: ClassVar[str] = ".ocopy-checkpoint"
 
     # Keyed by the resolved on-disk path. Each entry stores the file's mtime_ns at
-    # index time plus the parsed records grouped by (rel_path, size).
-    _READ_CACHE: ClassVar[dict[Path, tuple[int, dict[tuple[str, int], list[tuple[float, str]]]]]] = {}
+    # index time plus the parsed digest and partial records grouped by (rel_path, size).
+    _READ_CACHE: ClassVar[dict[Path, tuple[int, _Index, _PartialIndex]]] = {}
 
     def __init__(self, copy_root: Path) -> None:
         self._copy_root = copy_root
@@ -49,59 +64,88 @@ class Checkpoint:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.path.touch(exist_ok=True)
 
-    def record(self, rel_path: str, size: int, mtime: float, xxh64: str) -> None:
+    def record(
+        self,
+        rel_path: str,
+        size: int,
+        mtime: float,
+        digest: str,
+        hash_format: str = DEFAULT_HASH_FORMAT,
+        extra_hashes: dict[str, str] | None = None,
+    ) -> None:
         """Append one JSONL record and ``fsync`` it for crash safety."""
-        payload = json.dumps(
-            {"rel_path": rel_path, "size": size, "mtime": mtime, "xxh64": xxh64},
-            sort_keys=True,
-            separators=(",", ":"),
-        )
+        self._append({**(extra_hashes or {}), "rel_path": rel_path, "size": size, "mtime": mtime, hash_format: digest})
+
+    def record_partial(self, rel_path: str, size: int, mtime: float, offset: int) -> None:
+        """Record that the first ``offset`` bytes of ``rel_path``'s in-progress file are durable.
+
+        The caller must have ``fsync``-ed the in-progress file up to ``offset`` first.
+        """
+        self._append({"rel_path": rel_path, "size": size, "mtime": mtime, "partial": offset})
+
+    def _append(self, record: dict) -> None:
+        payload = json.dumps(record, sort_keys=True, separators=(",", ":"))
         data = (payload + "\n").encode("utf-8")
-        fd = os.open(str(self.path), os.O_APPEND | os.O_CREAT | os.O_WRONLY, 0o644)
-        try:
-            os.write(fd, data)
-            os.fsync(fd)
-        finally:
-            os.close(fd)
+        with span("checkpoint.record"):
+            fd = os.open(str(self.path), os.O_APPEND | os.O_CREAT | os.O_WRONLY, 0o644)
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
         self._READ_CACHE.pop(self.path, None)
 
-    def lookup(self, rel_path: str, size: int, mtime: float) -> str | None:
-        """Return the recorded ``xxh64`` for a matching ``(rel_path, size, mtime)``.
+    def lookup(self, rel_path: str, size: int, mtime: float, hash_format: str = DEFAULT_HASH_FORMAT) -> str | None:
+        """Return the recorded ``hash_format`` digest for a matching ``(rel_path, size, mtime)``.
 
         Matches on exact size; mtime comparison uses a 2-second tolerance to paper
         over sub-second filesystem truncation (FAT, some network filesystems).
         Last matching record wins so later re-records shadow earlier ones.
         """
-        index = self._read_index()
+        index, _ = self._read_index()
         best: str | None = None
-        for rec_mtime, h in index.get((rel_path, size), ()):
+        for rec_mtime, h in index.get((rel_path, size, hash_format), ()):
             if abs(rec_mtime - mtime) <= 2.0:
                 best = h
         return best
 
+    def partial_offset(self, rel_path: str, size: int, mtime: float) -> int:
+        """Return the last durable in-progress offset recorded for ``(rel_path, size, mtime)`` (``0`` if none).
+
+        Same matching rules as :meth:`lookup`. The offset is only a hint: callers
+        still compare the in-progress bytes against the source before trusting them.
+        """
+        _, partials = self._read_index()
+        best = 0
+        for rec_mtime, offset in partials.get((rel_path, size), ()):
+            if abs(rec_mtime - mtime) <= 2.0:
+                best = offset
+        return best
+
     def clear(self) -> None:
         """Delete the checkpoint (called after a successful seal)."""
         with contextlib.suppress(FileNotFoundError):
             self.path.unlink()
         self._READ_CACHE.pop(self.path, None)
 
-    def _read_index(self) -> dict[tuple[str, int], list[tuple[float, str]]]:
+    def _read_index(self) -> tuple[_Index, _PartialIndex]:
         """Parse the file into an indexed form, memoized per (path, mtime_ns)."""
         path = self.path
         try:
             st_mtime_ns = path.stat().st_mtime_ns
         except FileNotFoundError:
-            return {}
+            return {}, {}
 
         cached = self._READ_CACHE.get(path)
         if cached is not None and cached[0] == st_mtime_ns:
-            return cached[1]
+            return cached[1], cached[2]
 
-        index: dict[tuple[str, int], list[tuple[float, str]]] = {}
+        index: _Index = {}
+        partials: _PartialIndex = {}
         try:
             raw = path.read_bytes()
         except OSError:
-            return {}
+            return {}, {}
         for line in raw.splitlines():
             if not line.strip():
                 continue
@@ -112,16 +156,18 @@ class Checkpoint:
             rel = rec.get("rel_path")
             size = rec.get("size")
             mtime = rec.get("mtime")
-            h = rec.get("xxh64")
-            if not isinstance(rel, str) or not isinstance(h, str) or not h:
-                continue
-            if not isinstance(size, int) or mtime is None:
+            offset = rec.get("partial")
+            if not isinstance(rel, str) or not isinstance(size, int) or mtime is None:
                 continue
             try:
                 mtime_f = float(mtime)
             except (TypeError, ValueError):
                 continue
-            index.setdefault((rel, size), []).append((mtime_f, h))
-
-        self._READ_CACHE[path] = (st_mtime_ns, index)
-        return index
+            digests = [(fmt, h) for fmt in HASH_FORMATS if isinstance(h := rec.get(fmt), str) and h]
+            for fmt, h in digests:
+                index.setdefault((rel, size, fmt), []).append((mtime_f, h))
+            if not digests and isinstance(offset, int) and not isinstance(offset, bool) and 0 < offset <= size:
+                partials.setdefault((rel, size), []).append((mtime_f, offset))
+
+        self._READ_CACHE[path] = (st_mtime_ns, index, partials)
+        return index, partials
@@ -1,16 +1,20 @@
 #!/usr/bin/env python3
 import json
 import sys
-import time
 from pathlib import Path
 
 import click
 
-from ocopy.backup_check import get_missing
-from ocopy.cli.update import Updater, suggested_update_command
+from ocopy.backup_check import check_destinations
+from ocopy.batch import JOBS_PER_SOURCE_DEVICE, BatchJob
+from ocopy.block_hash import BLOCK_SIZE
+from ocopy.hash_formats import DEFAULT_HASH_FORMAT, HASH_FORMATS
+from ocopy.io_priority import IO_CLASSES
+from ocopy.memory import ByteBudget, get_byte_budget, set_byte_budget
+from ocopy.mhl import LEGACY_MHL_HASH_ELEMENTS
 from ocopy.sleep_inhibit import sleep_inhibit_best_effort
-from ocopy.utils import folder_size, free_space, get_mount
-from ocopy.verified_copy import CopyJob
+from ocopy.utils import file_count, folder_size, free_space, get_mount
+from ocopy.verified_copy import DEDUPE_MODES, STALL_TIMEOUT, VERIFY_WORKERS, CopyJob
 
 
 def _report_cancelled(job: CopyJob, machine_readable: bool) -> None:
@@ -33,8 +37,79 @@ def _report_cancelled(job: CopyJob, machine_readable: bool) -> None:
         click.secho(f"Checkpoint: {cp}", fg="yellow")
 
 
-@click.command()
+def _install_profiler(ctx: click.Context, report_path: Path, **run_info) -> None:
+    """Trace every pipeline stage and write the report when the command exits (including ``sys.exit``)."""
+    from ocopy.tracing import StageProfiler, set_tracer
+
+    profiler = StageProfiler()
+    previous = set_tracer(profiler)
+
+    def write_report() -> None:
+        set_tracer(previous)
+        if (budget := get_byte_budget()) is not None:
+            run_info["memory"] = budget.as_dict()
+        profiler.write_report(report_path, **run_info)
+        click.secho(f"Profile report written to {report_path}", fg="blue", err=True)
+
+    ctx.call_on_close(write_report)
+
+
+def _install_byte_budget(megabytes: float | None) -> None:
+    """Install the ``--memory-budget`` for the rest of the command."""
+    if megabytes is None:
+        return
+    previous = set_byte_budget(ByteBudget(int(megabytes * 1e6)))
+    click.get_current_context().call_on_close(lambda: set_byte_budget(previous))
+
+
+def _destination_bandwidth_limits(values: tuple[str, ...], destinations: list[Path]) -> dict[Path, float]:
+    """Parse ``--destination-bandwidth [DEST=]MB`` values into bytes per second per destination."""
+    limits: dict[Path, float] = {}
+    for value in values:
+        dest, _, megabytes = value.rpartition("=")
+        try:
+            rate = float(megabytes) * 1e6
+        except ValueError:
+            rate = 0.0
+        if rate <= 0:
+            raise click.UsageError(f"--destination-bandwidth {value}: expected a positive number of MB/s")
+        if not dest:
+            limits.update(dict.fromkeys(destinations, rate))
+            continue
+        matches = [d for d in destinations if d.resolve() == Path(dest).resolve()]
+        if not matches:
+            raise click.UsageError(f"--destination-bandwidth {value}: {dest} is not one of the destinations")
+        limits[matches[0]] = rate
+    return limits
+
+
+class _DefaultCopyGroup(click.Group):
+    """Route anything that isn't a subcommand to ``copy`` so ``ocopy SOURCE DESTINATIONS...`` keeps working.
+
+    A source folder named like a subcommand (e.g. ``batch``) is copied as well.
+    """
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if (
+            args
+            and (args[0] not in self.commands or Path(args[0]).exists())
+            and args[0] not in (*ctx.help_option_names, "--version")
+        ):
+            args = ["copy", *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=_DefaultCopyGroup)
 @click.version_option(prog_name="o/COPY", package_name="ocopy")
+def cli():
+    """
+    o/COPY by OTTOMATIC
+
+    Copy a card with "ocopy SOURCE DESTINATIONS...", short for "ocopy copy SOURCE DESTINATIONS...".
+    """
+
+
+@cli.command("copy")
 @click.option(
     "--overwrite/--dont-overwrite",
     help="Allow overwriting of destination files (defaults to --dont-overwrite)",
@@ -71,12 +146,149 @@ def _report_cancelled(job: CopyJob, machine_readable: bool) -> None:
     default=False,
     help="Write legacy flat MHL v1.1 ``*.mhl`` files instead of ASC MHL ``ascmhl/`` (implies --mhl)",
 )
+@click.option(
+    "--deep-check",
+    is_flag=True,
+    default=False,
+    help=(
+        "After copying, re-walk the source and look for every file by name and size on each destination "
+        "(defaults to checking each destination against the verified copy plan)"
+    ),
+)
+@click.option(
+    "--update-check/--no-update-check",
+    help=(
+        "Look up the latest o/COPY release at most once a day (defaults to --update-check; "
+        "OCOPY_NO_UPDATE_CHECK=1 also disables it)"
+    ),
+    default=True,
+)
+@click.option(
+    "--block-verify",
+    is_flag=True,
+    default=False,
+    help=(
+        "Also hash every file in 64 MiB blocks so a verification mismatch only rewrites the damaged blocks "
+        "(block digests are kept in .ocopy-blocks on each destination)"
+    ),
+)
+@click.option(
+    "--hash-format",
+    type=click.Choice(list(HASH_FORMATS)),
+    default=DEFAULT_HASH_FORMAT,
+    show_default=True,
+    help="File digest to compute and record; xxh3 and xxh128 are faster than xxh64 but not supported by --legacy-mhl",
+)
+@click.option(
+    "--extra-hash",
+    "extra_hashes",
+    type=click.Choice(list(HASH_FORMATS)),
+    multiple=True,
+    help=(
+        "Also compute and record this digest from the same read pass, e.g. --extra-hash md5 --extra-hash sha1 "
+        "for deliveries that require them (repeatable)"
+    ),
+)
+@click.option(
+    "--verify-workers",
+    type=click.IntRange(min=1),
+    default=VERIFY_WORKERS,
+    show_default=True,
+    help="With --skip-existing, verify up to N files that are already on every destination at once",
+    metavar="N",
+)
+@click.option(
+    "--readers-per-device",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Read at most N files at once from each disk while verifying (default: 1 for HDDs, 4 for SSDs)",
+    metavar="N",
+)
+@click.option(
+    "--max-bandwidth",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Read at most MB megabytes per second in total (source reads and verification reads)",
+    metavar="MB",
+)
+@click.option(
+    "--destination-bandwidth",
+    "destination_bandwidths",
+    multiple=True,
+    help=(
+        "Write to (and verify on) each destination at most MB megabytes per second, or only DEST with DEST=MB "
+        "(repeatable)"
+    ),
+    metavar="[DEST=]MB",
+)
+@click.option(
+    "--io-class",
+    type=click.Choice(list(IO_CLASSES)),
+    default=None,
+    help="Linux I/O scheduling class for the copy, like ionice (e.g. idle so playback from the same disks wins)",
+)
+@click.option(
+    "--io-level",
+    type=click.IntRange(0, 7),
+    default=None,
+    help="Priority within --io-class realtime or best-effort, 0 (highest) to 7",
+)
+@click.option(
+    "--isolate-failing-destinations",
+    is_flag=True,
+    default=False,
+    help="Drop a destination that fails or stalls and finish the copy to the others instead of holding them back",
+)
+@click.option(
+    "--stall-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=STALL_TIMEOUT,
+    show_default=True,
+    help="Seconds a destination may take no data before --isolate-failing-destinations drops it",
+    metavar="SECONDS",
+)
+@click.option(
+    "--sparse",
+    is_flag=True,
+    default=False,
+    help="Skip reading holes in sparse source files and keep them as holes in the copies",
+)
+@click.option(
+    "--dedupe",
+    type=click.Choice(list(DEDUPE_MODES)),
+    default=None,
+    help=(
+        "Copy hardlinked files once and hardlink them on the destinations too; with 'content', also clone files "
+        "with identical content where the destination supports reflinks"
+    ),
+)
+@click.option(
+    "--archive",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Also write the copy into this tar archive in the same pass, with xxh64 digests in FILE.json",
+    metavar="FILE",
+)
+@click.option(
+    "--memory-budget",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Hold at most MB megabytes of file data in read buffers at once",
+    metavar="MB",
+)
+@click.option(
+    "--profile-report",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Write a JSON breakdown of the time spent in each pipeline stage (read, write, verify, seal, ...) to FILE",
+    metavar="FILE",
+)
 @click.argument("source", nargs=1, type=click.Path(exists=True, readable=True, file_okay=False, dir_okay=True))
 @click.argument(
     "destinations", nargs=-1, type=click.Path(exists=True, readable=True, writable=True, file_okay=False, dir_okay=True)
 )
 @click.pass_context
-def cli(
+def copy_command(
     ctx: click.Context,
     overwrite: bool,
     verify: bool,
@@ -84,12 +296,28 @@ def cli(
     machine_readable: bool,
     mhl: bool,
     legacy_mhl: bool,
+    deep_check: bool,
+    update_check: bool,
+    block_verify: bool,
+    hash_format: str,
+    extra_hashes: tuple[str, ...],
+    verify_workers: int,
+    readers_per_device: int | None,
+    max_bandwidth: float | None,
+    destination_bandwidths: tuple[str, ...],
+    io_class: str | None,
+    io_level: int | None,
+    isolate_failing_destinations: bool,
+    stall_timeout: float,
+    sparse: bool,
+    dedupe: str | None,
+    archive: Path | None,
+    memory_budget: float | None,
+    profile_report: Path | None,
     source: str,
     destinations: list[str],
 ):
     """
-    o/COPY by OTTOMATIC
-
     Copy SOURCE directory to DESTINATIONS
     """
     # ``--legacy-mhl`` selects the manifest flavor and implies manifest writing. The only
@@ -98,11 +326,27 @@ def cli(
         if not mhl and ctx.get_parameter_source("mhl") == click.core.ParameterSource.COMMANDLINE:
             raise click.UsageError("--legacy-mhl cannot be combined with --no-mhl")
         mhl = True
+        if hash_format != "xxh64":
+            raise click.UsageError("--legacy-mhl only supports --hash-format xxh64")
+        if unsupported := sorted(set(extra_hashes) - set(LEGACY_MHL_HASH_ELEMENTS)):
+            raise click.UsageError(f"--legacy-mhl can't hold --extra-hash {', '.join(unsupported)}")
+
+    if io_level is not None and io_class is None:
+        raise click.UsageError("--io-level needs --io-class")
+    if archive is not None and not destinations:
+        raise click.UsageError("--archive is written alongside destination directories; give at least one")
+    destination_limits = _destination_bandwidth_limits(destination_bandwidths, [Path(d) for d in destinations])
+
+    from ocopy.cli.update import Updater, suggested_update_command
 
-    updater = Updater()
+    updater = Updater(enabled=update_check)
+
+    _install_byte_budget(memory_budget)
+    if profile_report is not None:
+        _install_profiler(ctx, profile_report, source=source, destinations=list(destinations))
 
     size = folder_size(source)
-    for destination in destinations:
+    for destination in [*destinations, *([archive.absolute().parent] if archive is not None else [])]:
         free = free_space(destination)
         if free < size:
             click.secho(
@@ -125,26 +369,46 @@ def cli(
             skip_existing=skip_existing,
             mhl=mhl,
             legacy_mhl=legacy_mhl,
+            block_size=BLOCK_SIZE if block_verify else None,
+            hash_format=hash_format,
+            extra_hash_formats=extra_hashes,
+            verify_workers=verify_workers,
+            readers_per_device=readers_per_device,
+            bandwidth_limit=max_bandwidth * 1e6 if max_bandwidth else None,
+            destination_bandwidth_limits=destination_limits,
+            io_class=io_class,
+            io_level=io_level,
+            isolate_destinations=isolate_failing_destinations,
+            stall_timeout=stall_timeout,
+            sparse=sparse,
+            dedupe=dedupe,
+            archive=archive,
         )
-        if machine_readable:
-            for _ in job.progress:
-                click.echo(job.percent_done)
-        else:
-            with click.progressbar(job.progress, length=100, item_show_func=lambda name: name) as progress:
-                for _ in progress:
-                    pass
+        try:
+            if machine_readable:
+                for _ in job.progress:
+                    click.echo(job.percent_done)
+            else:
+                with click.progressbar(job.progress, length=100, item_show_func=lambda name: name) as progress:
+                    for _ in progress:
+                        pass
+        except KeyboardInterrupt:
+            # Stop at the next chunk so large in-progress files are synced and recorded for resume.
+            job.cancel()
 
-        while not job.finished:
-            time.sleep(0.1)
-            # TODO: break loop if this takes too long
+        job.wait()
 
         if job.interrupted_by_cancel:
             _report_cancelled(job, machine_readable)
             sys.exit(3)
 
-        # TODO: check all destinations in parallel
-        for destination in destination_paths:
-            missing, _ = get_missing(source, str(destination / Path(source).name))
+        # A failed run has no complete copy plan to check against, so fall back to the deep check.
+        plan = None if deep_check or job.errors else job.result.file_infos
+        # Dropped destinations may not answer anymore; the errors below list what they lack.
+        checked = [d for d in destination_paths if d not in job.result.dropped_destinations]
+        reports = check_destinations(Path(source), [d / Path(source).name for d in checked], plan)
+        for destination, report in zip(checked, reports, strict=True):
+            missing = report.missing
             if missing:
                 missing_list = "\n".join(missing)
                 click.secho(
@@ -156,7 +420,7 @@ def cli(
                     fg="red",
                 )
 
-            in_progress_files = list((destination / Path(source).name).glob("**/*copy_in_progress*"))
+            in_progress_files = report.in_progress
             if len(in_progress_files):
                 in_progress_list = "\n".join([f.as_posix() for f in in_progress_files])
                 click.secho(
@@ -171,6 +435,23 @@ def cli(
 
         click.echo(f"\n{job.speed / 1000 / 1000:.2f} MB/s")
 
+        if job.repaired_blocks:
+            click.secho(
+                f"\nRepaired {job.repaired_blocks} damaged block{'s' if job.repaired_blocks > 1 else ''} "
+                "on the destinations after a verification mismatch.",
+                fg="yellow",
+            )
+
+        if job.archive_xxh64:
+            click.secho(f"\nArchive {archive} written, xxh64 {job.archive_xxh64}.", fg="green")
+
+        if job.linked_files:
+            click.secho(
+                f"\nLinked {job.linked_files} duplicate file{'s' if job.linked_files > 1 else ''} "
+                "on the destinations instead of copying them again.",
+                fg="yellow",
+            )
+
         if job.skipped_files:
             click.secho(
                 f"\nSkipped {job.skipped_files} existing file{'s' if job.skipped_files > 1 else ''} "
@@ -192,5 +473,509 @@ def cli(
     updater.join(timeout=1)
 
 
+@cli.command("batch")
+@click.option(
+    "--destination",
+    "-d",
+    "destinations",
+    multiple=True,
+    required=True,
+    type=click.Path(exists=True, readable=True, writable=True, file_okay=False, dir_okay=True),
+    help="Copy every source into this directory (repeatable)",
+)
+@click.option(
+    "--overwrite/--dont-overwrite",
+    help="Allow overwriting of destination files (defaults to --dont-overwrite)",
+    default=False,
+)
+@click.option(
+    "--verify/--dont-verify",
+    help="Verify copy by re-calculating the xxHash of the source and all destinations (defaults to --verify)",
+    default=True,
+)
+@click.option(
+    "--skip-existing/--dont-skip",
+    help="Skip existing files with the same size and modification time (defaults to --skip-existing)",
+    default=True,
+)
+@click.option(
+    "--machine-readable/--human-readable",
+    help="Output machine-readable progress (defaults to --human-readable)",
+    default=False,
+)
+@click.option(
+    "--mhl/--no-mhl",
+    help="Write an ASC Media Hash List to each copy (defaults to --mhl)",
+    default=True,
+)
+@click.option(
+    "--hash-format",
+    type=click.Choice(list(HASH_FORMATS)),
+    default=DEFAULT_HASH_FORMAT,
+    show_default=True,
+    help="File digest to compute and record",
+)
+@click.option(
+    "--jobs-per-source-device",
+    type=click.IntRange(min=1),
+    default=JOBS_PER_SOURCE_DEVICE,
+    show_default=True,
+    help="Copy at most N sources from the same device at once",
+    metavar="N",
+)
+@click.option(
+    "--writers-per-destination-device",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Write at most N sources to each destination disk at once (default: 1 for HDDs, 4 for SSDs)",
+    metavar="N",
+)
+@click.option(
+    "--isolate-failing-destinations",
+    is_flag=True,
+    default=False,
+    help="Drop a destination that fails or stalls and finish the copy to the others instead of holding them back",
+)
+@click.option(
+    "--sparse",
+    is_flag=True,
+    default=False,
+    help="Skip reading holes in sparse source files and keep them as holes in the copies",
+)
+@click.option(
+    "--dedupe",
+    type=click.Choice(list(DEDUPE_MODES)),
+    default=None,
+    help=(
+        "Copy hardlinked files once and hardlink them on the destinations too; with 'content', also clone files "
+        "with identical content where the destination supports reflinks"
+    ),
+)
+@click.option(
+    "--memory-budget",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Hold at most MB megabytes of file data in read buffers at once, shared by all sources",
+    metavar="MB",
+)
+@click.argument(
+    "sources", nargs=-1, required=True, type=click.Path(exists=True, readable=True, file_okay=False, dir_okay=True)
+)
+def batch_command(
+    destinations: tuple[str, ...],
+    overwrite: bool,
+    verify: bool,
+    skip_existing: bool,
+    machine_readable: bool,
+    mhl: bool,
+    hash_format: str,
+    jobs_per_source_device: int,
+    writers_per_destination_device: int | None,
+    isolate_failing_destinations: bool,
+    sparse: bool,
+    dedupe: str | None,
+    memory_budget: float | None,
+    sources: tuple[str, ...],
+):
+    """
+    Copy several SOURCES (e.g. all cards in a reader hub) to the same destinations
+    """
+    source_paths = [Path(s) for s in sources]
+    destination_paths = [Path(d) for d in destinations]
+    size = sum(folder_size(s) for s in sources)
+    for destination in destinations:
+        free = free_space(destination)
+        if free < size:
+            click.secho(
+                f"{destination} does not have enough free space (need {size} bytes, have {free} bytes).",
+                fg="red",
+            )
+            sys.exit(1)
+
+    _install_byte_budget(memory_budget)
+    try:
+        batch = BatchJob(
+            source_paths,
+            destination_paths,
+            jobs_per_source_device=jobs_per_source_device,
+            writers_per_destination_device=writers_per_destination_device,
+            overwrite=overwrite,
+            verify=verify,
+            skip_existing=skip_existing,
+            mhl=mhl,
+            hash_format=hash_format,
+            isolate_destinations=isolate_failing_destinations,
+            sparse=sparse,
+            dedupe=dedupe,
+            auto_start=False,
+        )
+    except ValueError as err:
+        raise click.UsageError(str(err)) from err
+    click.secho(f"Copying {', '.join(sources)} to {', '.join(destinations)}", fg="green")
+
+    with sleep_inhibit_best_effort(warn=lambda msg: click.secho(msg, fg="yellow")):
+        batch.start()
+        try:
+            if machine_readable:
+                for _ in batch.progress:
+                    click.echo(batch.percent_done)
+            else:
+                with click.progressbar(batch.progress, length=100, item_show_func=lambda name: name) as progress:
+                    for _ in progress:
+                        pass
+        except KeyboardInterrupt:
+            batch.cancel()
+        batch.wait()
+
+    click.echo(f"\n{batch.speed / 1000 / 1000:.2f} MB/s")
+    incomplete = False
+    for job in batch.jobs:
+        if job in batch.not_started:
+            click.secho(f"{job.source}: not started", fg="yellow")
+        elif job.interrupted_by_cancel:
+            click.secho(f"{job.source}: cancelled after {job.verified_files_count} file(s)", fg="yellow")
+        elif job.errors:
+            click.secho(f"{job.source}: {len(job.errors)} error(s)", fg="red")
+            for error in job.errors:
+                click.secho(f"Failed to copy {error.source.name}:\n{error.error_message}", fg="red")
+        elif job.verified_files_count < (expected := file_count(job.source)):
+            click.secho(f"{job.source}: only {job.verified_files_count} of {expected} file(s) copied", fg="red")
+            incomplete = True
+        else:
+            click.secho(f"{job.source}: {job.verified_files_count} file(s) copied", fg="green")
+
+    if batch.interrupted_by_cancel:
+        sys.exit(3)
+    if batch.errors or incomplete:
+        sys.exit(1)
+
+
+@cli.command("verify")
+@click.option(
+    "--seal/--no-seal",
+    help="Append an ASC MHL generation recording the re-verified files once a pass finds nothing missing or altered "
+    "(defaults to --no-seal)",
+    default=False,
+)
+@click.option(
+    "--verify-workers",
+    type=click.IntRange(min=1),
+    default=VERIFY_WORKERS,
+    show_default=True,
+    help="Verify up to N files at once",
+    metavar="N",
+)
+@click.option(
+    "--readers-per-device",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Read at most N files at once from each disk (default: 1 for HDDs, 4 for SSDs)",
+    metavar="N",
+)
+@click.option(
+    "--max-bandwidth",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Read at most MB megabytes per second in total",
+    metavar="MB",
+)
+@click.option(
+    "--max-iops",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Issue at most N reads (of up to 1 MiB) per second in total",
+    metavar="N",
+)
+@click.option(
+    "--slice-minutes",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Stop starting new files after N minutes; the next run continues the pass",
+    metavar="N",
+)
+@click.option(
+    "--slice-gb",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Stop starting new files after N gigabytes; the next run continues the pass",
+    metavar="N",
+)
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Append a JSON line per destination describing what this run verified",
+)
+@click.option(
+    "--io-class",
+    type=click.Choice(list(IO_CLASSES)),
+    default=None,
+    help="Linux I/O scheduling class for the audit, like ionice (e.g. idle so ingest on the same disks wins)",
+)
+@click.option(
+    "--io-level",
+    type=click.IntRange(0, 7),
+    default=None,
+    help="Priority within --io-class realtime or best-effort, 0 (highest) to 7",
+)
+@click.argument("destinations", nargs=-1, required=True, type=click.Path(exists=True, file_okay=False, dir_okay=True))
+def verify_command(
+    seal: bool,
+    verify_workers: int,
+    readers_per_device: int | None,
+    max_bandwidth: float | None,
+    max_iops: float | None,
+    slice_minutes: float | None,
+    slice_gb: float | None,
+    report_path: Path | None,
+    io_class: str | None,
+    io_level: int | None,
+    destinations: tuple[str, ...],
+):
+    """
+    Re-verify copies in DESTINATIONS against their ASC MHL history or legacy MHL files
+    """
+    import datetime
+    import time
+
+    from ocopy.audit import AuditBudget, AuditError, AuditState, audit_destination
+    from ocopy.devices import DeviceLimiter
+    from ocopy.io_priority import io_priority
+    from ocopy.throttle import Throttle
+
+    if io_level is not None and io_class is None:
+        raise click.UsageError("--io-level needs --io-class")
+
+    limiter = DeviceLimiter(readers_per_device)
+    throttle = Throttle(max_bandwidth * 1e6 if max_bandwidth else None, max_iops)
+    budget = AuditBudget(
+        max_bytes=int(slice_gb * 1e9) if slice_gb else None,
+        deadline=time.monotonic() + slice_minutes * 60 if slice_minutes else None,
+    )
+    failed = False
+    for destination in destinations:
+        root = Path(destination)
+        started = datetime.datetime.now(datetime.UTC)
+        try:
+            with io_priority(io_class, io_level):
+                report = audit_destination(
+                    root,
+                    workers=verify_workers,
+                    limiter=limiter,
+                    throttle=throttle,
+                    state=AuditState(root),
+                    budget=budget,
+                )
+        except AuditError as err:
+            click.secho(str(err), fg="red")
+            failed = True
+            continue
+
+        if report_path is not None:
+            finished = datetime.datetime.now(datetime.UTC)
+            line = {"started": started.isoformat(), "finished": finished.isoformat(), **report.as_dict()}
+            with open(report_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(line) + "\n")
+
+        for label, paths in (("Missing", report.missing), ("Altered", report.altered)):
+            for rel in paths:
+                click.secho(f"{label}: {root / rel}", fg="red")
+        for rel, error in report.unreadable.items():
+            click.secho(f"Unreadable: {root / rel} ({error})", fg="red")
+        for rel in report.new:
+            click.secho(f"New (not in history): {root / rel}", fg="yellow")
+        for rel in report.in_progress:
+            click.secho(f"In progress (left by a cancelled copy): {root / rel}", fg="yellow")
+
+        checked = len(report.verified) + len(report.previously_verified)
+        if not report.ok:
+            problems = len(report.missing) + len(report.altered) + len(report.unreadable)
+            click.secho(f"{root}: {problems} problem{'s' if problems > 1 else ''}, {checked} files verified.", fg="red")
+            failed = True
+            continue
+        if not report.complete:
+            click.secho(
+                f"{root}: {checked} files verified so far, {len(report.remaining)} left for the next run.", fg="yellow"
+            )
+            continue
+
+        click.secho(f"{root}: all {checked} recorded files verified.", fg="green")
+        if seal:
+            if report.history != "ascmhl":
+                click.secho(f"{root} only has legacy MHL files, not sealing.", fg="yellow")
+                continue
+            from ocopy.ascmhl_seal import ASCMHLSealError, seal_verified_generation
+
+            verified = report.previously_verified + report.verified
+            try:
+                seal_verified_generation(root, {f.rel_path: (f.hash_format, f.digest) for f in verified})
+            except ASCMHLSealError as err:
+                click.secho(str(err), fg="red")
+                failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+@cli.command("serve")
+@click.option(
+    "--port",
+    type=click.IntRange(min=0, max=65535),
+    default=None,
+    help="Serve the job API on localhost:PORT (default: 8765 unless --socket is given)",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Serve the job API on this Unix socket instead",
+)
+@click.option(
+    "--queue-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Where the job queue is kept between runs (default: daemon-queue.json in the user state directory)",
+    metavar="FILE",
+)
+@click.option(
+    "--jobs-per-source-device",
+    type=click.IntRange(min=1),
+    default=JOBS_PER_SOURCE_DEVICE,
+    show_default=True,
+    help="Run at most N jobs reading from the same device at once",
+    metavar="N",
+)
+@click.option(
+    "--writers-per-destination-device",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Run at most N jobs writing to each destination disk at once (default: 1 for HDDs, 4 for SSDs)",
+    metavar="N",
+)
+@click.option(
+    "--verify-workers",
+    type=click.IntRange(min=1),
+    default=VERIFY_WORKERS,
+    show_default=True,
+    help="Verify up to N existing files at once, shared by all jobs",
+    metavar="N",
+)
+@click.option(
+    "--readers-per-device",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Read at most N files at once from each disk while verifying, across all jobs",
+    metavar="N",
+)
+@click.option(
+    "--memory-budget",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Hold at most MB megabytes of file data in read buffers at once, shared by all jobs",
+    metavar="MB",
+)
+def serve_command(
+    port: int | None,
+    socket_path: Path | None,
+    queue_file: Path | None,
+    jobs_per_source_device: int,
+    writers_per_destination_device: int | None,
+    verify_workers: int,
+    readers_per_device: int | None,
+    memory_budget: float | None,
+):
+    """
+    Run copy jobs submitted over a local HTTP API until interrupted
+    """
+    from ocopy.daemon import DEFAULT_PORT, JobServer, default_queue_file, make_server
+
+    if port is not None and socket_path is not None:
+        raise click.UsageError("--port and --socket can't be combined")
+    _install_byte_budget(memory_budget)
+    jobs = JobServer(
+        queue_file or default_queue_file(),
+        jobs_per_source_device=jobs_per_source_device,
+        writers_per_destination_device=writers_per_destination_device,
+        verify_workers=verify_workers,
+        readers_per_device=readers_per_device,
+    )
+    try:
+        server = make_server(jobs, port=DEFAULT_PORT if port is None else port, socket_path=socket_path)
+    except OSError as err:
+        jobs.close()
+        click.secho(f"Can't serve the job API: {err}", fg="red")
+        sys.exit(1)
+    click.secho(f"Serving copy jobs on {server.url} (Ctrl-C to stop)", fg="green")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.secho("Stopping; running jobs will resume on the next start.", fg="yellow")
+    finally:
+        server.server_close()
+        jobs.close()
+
+
+@cli.command("index")
+@click.argument("archive", type=click.Path(exists=True, writable=True, file_okay=False, dir_okay=True))
+def index_command(archive: str):
+    """
+    Build or refresh the backup index of an ARCHIVE volume
+    """
+    from ocopy.backup_index import BackupIndex
+
+    with BackupIndex(Path(archive)) as index:
+        stats = index.update()
+    click.secho(
+        f"Indexed {stats.scanned} files on {archive}: {stats.added} added, {stats.changed} changed, "
+        f"{stats.removed} removed, {stats.hashes} xxh64 digests read from ASC MHL.",
+        fg="green",
+    )
+
+
+@cli.command("backup-check")
+@click.option(
+    "--update/--no-update",
+    help="Refresh the archive index before checking (defaults to --update)",
+    default=True,
+)
+@click.argument("source", nargs=1, type=click.Path(exists=True, readable=True, file_okay=False, dir_okay=True))
+@click.argument("archive", nargs=1, type=click.Path(exists=True, writable=True, file_okay=False, dir_okay=True))
+def backup_check_command(update: bool, source: str, archive: str):
+    """
+    Check whether SOURCE is already backed up somewhere on ARCHIVE
+    """
+    from ocopy.backup_index import BackupIndex
+
+    with BackupIndex(Path(archive)) as index:
+        if update:
+            index.update()
+        matches = index.find_backups(Path(source))
+
+    if not matches:
+        click.secho(f"No file from {source} was found on {archive}.", fg="red")
+        sys.exit(1)
+
+    complete = [m for m in matches if m.complete]
+    for match in complete:
+        click.secho(
+            f"{source} is backed up at {Path(archive) / match.root} "
+            f"({match.matched} files, {match.with_xxh64} with a known xxh64).",
+            fg="green",
+        )
+    if complete:
+        return
+
+    best = matches[0]
+    missing_list = "\n".join(best.missing)
+    click.secho(
+        f"{len(best.missing)} file{'s' if len(best.missing) > 1 else ''} missing at the closest match "
+        f"{Path(archive) / best.root}:\n{missing_list}",
+        fg="red",
+    )
+    sys.exit(1)
+
+
 if __name__ == "__main__":
     cli()  # pragma: no cover
@@ -1,27 +1,94 @@
+import json
 import logging
+import os
 import sys
+import time
 from importlib.metadata import PackageNotFoundError, distributions
 from importlib.metadata import version as get_version
 from pathlib import Path
 from threading import Thread
 
-import requests
 from packaging.version import InvalidVersion, Version
 
 logger = logging.getLogger(__name__)
 
+RELEASES_URL = "https://api.github.com/repos/OTTOMATIC-IO/ocopy/releases/latest"
+UPDATE_CHECK_TTL = 24 * 60 * 60
+"""Seconds a cached release lookup (including a failed one) is trusted before asking GitHub again."""
+REQUEST_TIMEOUT = 5
+DISABLE_ENV = "OCOPY_NO_UPDATE_CHECK"
+
+
+def update_check_disabled() -> bool:
+    """True when ``OCOPY_NO_UPDATE_CHECK`` is set to anything but an empty string or ``0``."""
+    return os.environ.get(DISABLE_ENV, "") not in ("", "0")
+
+
+def _cache_path() -> Path:
+    """Per-user cache file for the last release lookup.
+
+    ``XDG_CACHE_HOME`` wins on every platform when set; otherwise the platform's
+    usual user cache directory is used.
+    """
+    if xdg := os.environ.get("XDG_CACHE_HOME"):
+        base = Path(xdg)
+    elif sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path.home() / ".cache"
+    return base / "ocopy" / "update-check.json"
+
+
+_NOT_CACHED = object()
+
+
+def _read_cached_tag() -> object:
+    """Return the cached ``tag_name`` (possibly ``None``) or ``_NOT_CACHED`` when missing or stale."""
+    try:
+        data = json.loads(_cache_path().read_text(encoding="utf-8"))
+        checked_at = float(data["checked_at"])
+    except (OSError, ValueError, TypeError, KeyError):
+        return _NOT_CACHED
+    if not 0 <= time.time() - checked_at < UPDATE_CHECK_TTL:
+        return _NOT_CACHED
+    return data.get("tag_name")
+
+
+def _write_cached_tag(tag_name: str | None) -> None:
+    path = _cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"checked_at": time.time(), "tag_name": tag_name}), encoding="utf-8")
+    except OSError:
+        logger.debug("Could not write update check cache %s", path, exc_info=True)
+
 
 def _normalize_dist_name(name: str) -> str:
     return (name or "").lower().replace("-", "_")
 
 
+# ``dist_name -> installer``; a module-level dict rather than ``lru_cache`` so it
+# survives ``importlib.reload`` for callers holding the original function.
+_INSTALLER_CACHE: dict[str, str | None] = {}
+
+
 def _read_installer(dist_name: str) -> str | None:
     """Read the PEP 376 ``INSTALLER`` file when present.
 
     ``importlib.metadata.distribution()`` can resolve editable installs to a legacy
     ``.egg-info`` tree that has no ``INSTALLER``, while a parallel ``.dist-info`` in
     ``site-packages`` does — so we scan distributions and prefer ``.dist-info``.
+    The scan reads every installed distribution's metadata, so the answer is
+    memoized for the life of the process.
     """
+    if dist_name not in _INSTALLER_CACHE:
+        _INSTALLER_CACHE[dist_name] = _scan_installer(dist_name)
+    return _INSTALLER_CACHE[dist_name]
+
+
+def _scan_installer(dist_name: str) -> str | None:
     want = _normalize_dist_name(dist_name)
     fallback: str | None = None
     for dist in distributions():
@@ -117,17 +184,26 @@ def suggested_update_command() -> str:
 
 
 class Updater(Thread):
-    def __init__(self):
+    """Background check for a newer release on GitHub.
+
+    The lookup result is cached on disk for :data:`UPDATE_CHECK_TTL`, so most runs
+    never touch the network. ``enabled=False`` or ``OCOPY_NO_UPDATE_CHECK=1`` skips
+    the check entirely.
+    """
+
+    def __init__(self, enabled: bool = True):
         super().__init__()
         self.daemon = True
+        self.enabled = enabled and not update_check_disabled()
         self.latest_version = None
         self.installed_version = None
         self.finished = False
         self.start()
 
     def run(self):
-        self._get_latest_version()
-        self._get_installed_version()
+        if self.enabled:
+            self._get_latest_version()
+            self._get_installed_version()
         self.finished = True
 
     @property
@@ -138,12 +214,23 @@ class Updater(Thread):
         return self.latest_version > self.installed_version
 
     def _get_latest_version(self):
-        try:
-            r = requests.get("https://api.github.com/repos/OTTOMATIC-IO/ocopy/releases/latest")
-            r.raise_for_status()
-            tag_name = r.json().get("tag_name")
-        except requests.exceptions.RequestException:
-            self.finished = True
+        tag_name = _read_cached_tag()
+        if tag_name is _NOT_CACHED:
+            # ``requests`` (and urllib3) load on the updater thread, off the CLI's startup path.
+            import requests
+
+            try:
+                r = requests.get(RELEASES_URL, timeout=REQUEST_TIMEOUT)
+                r.raise_for_status()
+                tag_name = r.json().get("tag_name")
+            except requests.exceptions.RequestException:
+                # Cache the failure too: an offline cart shouldn't retry (and wait) on every run.
+                _write_cached_tag(None)
+                self.finished = True
+                return
+            _write_cached_tag(tag_name)
+        elif tag_name is None:
+            # Cached failed lookup.
             return
 
         self.latest_version = self._parse_version(tag_name)
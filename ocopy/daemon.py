@@ -0,0 +1,478 @@
+"""Long-running copy job server (``ocopy serve``) for ingest station UIs.
+
+Jobs are submitted, followed and cancelled through a small JSON API over HTTP,
+either on a localhost port or on a Unix socket:
+
+- ``POST /jobs`` with ``{"source": ..., "destinations": [...], "options": {...}}``
+  queues a job (``options`` are :data:`JOB_OPTIONS`) and returns it.
+- ``GET /jobs`` lists all jobs, ``GET /jobs/<id>`` returns one.
+- ``GET /jobs/<id>/progress?after=P`` waits (up to ``timeout`` seconds, default
+  30) until the job is past ``P`` percent or finished, so clients don't poll.
+- ``POST /jobs/<id>/cancel`` (or ``DELETE /jobs/<id>``) cancels a job.
+
+``POST`` requests must be sent as ``Content-Type: application/json``, and on the
+localhost port the ``Host`` header must name ``127.0.0.1`` or ``localhost``.
+Otherwise any web page open on the machine could submit jobs, through a "simple"
+cross-origin request or by rebinding its DNS name to ``127.0.0.1``.
+
+Every job runs in the server process, so the ASC MHL and legacy MHL caches stay
+warm across jobs, and all jobs share one verification thread pool and the same
+per-device read limits. Jobs are started like ``ocopy batch`` schedules cards
+(see :mod:`ocopy.batch`). The queue is saved to a JSON file: jobs that were
+queued or running when the server stopped are started again on the next start
+and resume from their checkpoints.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from threading import Condition, Thread
+from typing import Any, cast
+from urllib.parse import parse_qs, urlsplit
+
+from ocopy.batch import JOBS_PER_SOURCE_DEVICE, DeviceSlots, default_writers
+from ocopy.devices import DeviceLimiter, device_of
+from ocopy.verified_copy import VERIFY_WORKERS, CopyJob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+JOB_OPTIONS: dict[str, type | tuple[type, ...]] = {
+    "overwrite": bool,
+    "verify": bool,
+    "skip_existing": bool,
+    "mhl": bool,
+    "legacy_mhl": bool,
+    "hash_format": str,
+    "extra_hash_formats": list,
+    "block_size": int,
+    "bandwidth_limit": (int, float),
+    "io_class": str,
+    "io_level": int,
+    "isolate_destinations": bool,
+    "stall_timeout": (int, float),
+    "sparse": bool,
+    "dedupe": str,
+}
+""":class:`~ocopy.verified_copy.CopyJob` options a submitted job may set, with their JSON types."""
+
+PROGRESS_TIMEOUT = 30.0
+"""Longest a ``/progress`` request waits for news before answering anyway."""
+
+
+def state_dir() -> Path:
+    """Per-user directory for the server's state, such as the job queue.
+
+    ``XDG_STATE_HOME`` wins on every platform when set; otherwise the platform's
+    usual place for per-user application data is used.
+    """
+    if xdg := os.environ.get("XDG_STATE_HOME"):
+        base = Path(xdg)
+    elif sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path.home() / ".local" / "state"
+    return base / "ocopy"
+
+
+def default_queue_file() -> Path:
+    """Where ``ocopy serve`` keeps its job queue unless told otherwise."""
+    return state_dir() / "daemon-queue.json"
+
+
+class JobRequestError(ValueError):
+    """Raised for a job submission the server can't accept."""
+
+
+@dataclass
+class QueuedJob:
+    """One submitted copy job; ``state`` is ``queued``, ``running``, ``done``, ``failed`` or ``cancelled``."""
+
+    id: str
+    source: Path
+    destinations: list[Path]
+    options: dict[str, Any] = field(default_factory=dict)
+    state: str = "queued"
+    submitted: float = field(default_factory=time.time)
+    errors: list[str] = field(default_factory=list)
+    copy_job: CopyJob | None = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("done", "failed", "cancelled")
+
+    @property
+    def percent_done(self) -> int:
+        if self.state == "done":
+            return 100
+        return self.copy_job.percent_done if self.copy_job is not None and self.state == "running" else 0
+
+    def record(self) -> dict[str, Any]:
+        """What is kept in the queue file."""
+        return {
+            "id": self.id,
+            "source": str(self.source),
+            "destinations": [str(d) for d in self.destinations],
+            "options": self.options,
+            "state": self.state,
+            "submitted": self.submitted,
+            "errors": self.errors,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """The record plus live progress, as the API returns it."""
+        job = self.copy_job
+        started = job is not None and self.state != "queued"
+        return {
+            **self.record(),
+            "percent_done": self.percent_done,
+            "current_item": job.current_item if started and self.state == "running" else None,
+            "speed": job.speed if started else 0.0,
+            "files_verified": job.verified_files_count if started else 0,
+            "skipped_files": job.skipped_files if started else 0,
+            "dropped_destinations": {str(d): files for d, files in job.result.dropped_destinations.items()}
+            if started
+            else {},
+        }
+
+
+class JobServer:
+    """Queue of copy jobs run in this process, scheduled per source and destination device.
+
+    ``queue_file`` (``None``: kept in memory only) persists the queue across
+    restarts. At most ``jobs_per_source_device`` jobs read from one device and
+    ``writers_per_destination_device`` write to one (default:
+    :func:`ocopy.batch.default_writers`); all jobs share a pool of
+    ``verify_workers`` verification threads and ``readers_per_device`` limits.
+    """
+
+    def __init__(
+        self,
+        queue_file: Path | None = None,
+        *,
+        jobs_per_source_device: int = JOBS_PER_SOURCE_DEVICE,
+        writers_per_destination_device: int | None = None,
+        verify_workers: int = VERIFY_WORKERS,
+        readers_per_device: int | None = None,
+        auto_start: bool = True,
+    ) -> None:
+        self.queue_file = queue_file
+        self._changed = Condition()
+        self._jobs: dict[str, QueuedJob] = {}
+        self._devices: dict[str, list[int]] = {}
+        self._source_slots = DeviceSlots(lambda _: jobs_per_source_device)
+        self._destination_slots = DeviceSlots(lambda device: writers_per_destination_device or default_writers(device))
+        self._device_limiter = DeviceLimiter(readers_per_device)
+        self._verify_executor = (
+            ThreadPoolExecutor(max_workers=verify_workers, thread_name_prefix="ocopy-verify")
+            if verify_workers > 1
+            else None
+        )
+        self._stopping = False
+        self._scheduler = Thread(target=self._schedule, name="ocopy-scheduler", daemon=True)
+        self._load()
+        if auto_start:
+            self.start()
+
+    def start(self) -> None:
+        self._scheduler.start()
+
+    def submit(self, source: Path, destinations: list[Path], options: dict[str, Any] | None = None) -> QueuedJob:
+        """Queue a copy of ``source`` to ``destinations``; raises :class:`JobRequestError` if it can't run."""
+        options = dict(options or {})
+        for name, value in options.items():
+            if name not in JOB_OPTIONS:
+                raise JobRequestError(f"Unknown option {name!r}")
+            if not isinstance(value, JOB_OPTIONS[name]):
+                raise JobRequestError(f"Option {name!r} has the wrong type")
+        for path in (source, *destinations):
+            if not path.is_dir():
+                raise JobRequestError(f"{path} is not a directory")
+        if not destinations:
+            raise JobRequestError("At least one destination is needed")
+        job = QueuedJob(uuid.uuid4().hex[:12], source, destinations, options)
+        self._prepare(job)
+        with self._changed:
+            self._jobs[job.id] = job
+            self._save()
+            self._changed.notify_all()
+        return job
+
+    def cancel(self, job_id: str) -> QueuedJob:
+        """Cancel a queued job right away, or stop a running one at its next chunk."""
+        with self._changed:
+            job = self._jobs[job_id]
+            if job.state == "queued":
+                job.state = "cancelled"
+                self._save()
+                self._changed.notify_all()
+            elif job.state == "running" and job.copy_job is not None:
+                job.copy_job.cancel()
+            return job
+
+    def get(self, job_id: str) -> QueuedJob:
+        """The job with ``job_id``; raises ``KeyError`` for an unknown one."""
+        with self._changed:
+            return self._jobs[job_id]
+
+    def jobs(self) -> list[QueuedJob]:
+        with self._changed:
+            return list(self._jobs.values())
+
+    def wait_for_progress(self, job_id: str, after: int, timeout: float = PROGRESS_TIMEOUT) -> QueuedJob:
+        """Block until the job is past ``after`` percent or finished, or ``timeout`` passed."""
+        with self._changed:
+            job = self._jobs[job_id]
+            self._changed.wait_for(lambda: job.finished or job.percent_done > after, timeout)
+            return job
+
+    def close(self) -> None:
+        """Stop running jobs (they are queued again for the next start) and the scheduler."""
+        with self._changed:
+            self._stopping = True
+            running = [job for job in self._jobs.values() if job.state == "running"]
+            for job in running:
+                assert job.copy_job is not None
+                job.copy_job.cancel()
+            self._changed.notify_all()
+        for job in running:
+            assert job.copy_job is not None
+            job.copy_job.wait()
+        if self._scheduler.is_alive():
+            self._scheduler.join()
+        with self._changed:
+            for job in running:
+                job.state = "queued"
+            self._save()
+        if self._verify_executor is not None:
+            self._verify_executor.shutdown()
+
+    def _prepare(self, job: QueuedJob) -> None:
+        try:
+            job.copy_job = CopyJob(
+                job.source,
+                job.destinations,
+                auto_start=False,
+                progress_changed=self._changed,
+                verify_executor=self._verify_executor,
+                device_limiter=self._device_limiter,
+                **job.options,
+            )
+        except (TypeError, ValueError) as err:
+            raise JobRequestError(str(err)) from err
+        self._devices[job.id] = [device_of(job.source), *sorted({device_of(d) for d in job.destinations})]
+
+    def _schedule(self) -> None:
+        with self._changed:
+            while not self._stopping:
+                for job in self._jobs.values():
+                    if job.state == "running" and job.copy_job is not None and job.copy_job.finished:
+                        self._finish(job)
+                for job in self._jobs.values():
+                    if job.state == "queued":
+                        source_device, *destination_devices = self._devices[job.id]
+                        if self._source_slots.free([source_device]) and self._destination_slots.free(
+                            destination_devices
+                        ):
+                            self._source_slots.take([source_device])
+                            self._destination_slots.take(destination_devices)
+                            job.state = "running"
+                            assert job.copy_job is not None
+                            job.copy_job.start()
+                            self._save()
+                self._changed.wait()
+
+    def _finish(self, job: QueuedJob) -> None:
+        source_device, *destination_devices = self._devices[job.id]
+        self._source_slots.give([source_device])
+        self._destination_slots.give(destination_devices)
+        assert job.copy_job is not None
+        if job.copy_job.interrupted_by_cancel:
+            job.state = "cancelled"
+        elif job.copy_job.errors:
+            job.state = "failed"
+            job.errors = [f"{error.source.name}: {error.error_message}" for error in job.copy_job.errors]
+        else:
+            job.state = "done"
+        self._save()
+        self._changed.notify_all()
+
+    def _load(self) -> None:
+        if self.queue_file is None or not self.queue_file.exists():
+            return
+        for record in json.loads(self.queue_file.read_text(encoding="utf-8")):
+            job = QueuedJob(
+                record["id"],
+                Path(record["source"]),
+                [Path(d) for d in record["destinations"]],
+                record["options"],
+                # Interrupted by the last shutdown; the checkpoints let it resume.
+                "queued" if record["state"] == "running" else record["state"],
+                record["submitted"],
+                record["errors"],
+            )
+            if job.state == "queued":
+                try:
+                    self._prepare(job)
+                except (JobRequestError, OSError) as err:
+                    job.state = "failed"
+                    job.errors = [str(err)]
+            self._jobs[job.id] = job
+
+    def _save(self) -> None:
+        if self.queue_file is None:
+            return
+        self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.queue_file.with_name(self.queue_file.name + ".tmp")
+        tmp.write_text(json.dumps([job.record() for job in self._jobs.values()], indent=1), encoding="utf-8")
+        os.replace(tmp, self.queue_file)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    @property
+    def jobs(self) -> JobServer:
+        return cast("_TCPServer | _UnixServer", self.server).jobs
+
+    def do_GET(self) -> None:
+        if not self._allowed():
+            return
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        jobs = self.jobs
+        if parts == ["jobs"]:
+            self._reply(HTTPStatus.OK, [job.as_dict() for job in jobs.jobs()])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            self._with_job(parts[1], jobs.get)
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "progress":
+            query = parse_qs(url.query)
+            try:
+                after = int(query.get("after", ["-1"])[0])
+                timeout = min(float(query.get("timeout", [PROGRESS_TIMEOUT])[0]), PROGRESS_TIMEOUT)
+            except ValueError:
+                self._reply(HTTPStatus.BAD_REQUEST, {"error": "after and timeout must be numbers"})
+                return
+            self._with_job(parts[1], lambda job_id: jobs.wait_for_progress(job_id, after, timeout))
+        else:
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"No such resource: {url.path}"})
+
+    def do_POST(self) -> None:
+        if not self._allowed():
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._reply(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, {"error": "Requests must be sent as application/json"})
+            return
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        jobs = self.jobs
+        if parts == ["jobs"]:
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                job = jobs.submit(
+                    Path(request["source"]), [Path(d) for d in request["destinations"]], request.get("options")
+                )
+            except (KeyError, TypeError, ValueError) as err:
+                # JobRequestError and malformed JSON are ValueErrors too.
+                self._reply(HTTPStatus.BAD_REQUEST, {"error": str(err) or "Invalid job"})
+                return
+            self._reply(HTTPStatus.CREATED, job.as_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            self._with_job(parts[1], jobs.cancel)
+        else:
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"No such resource: {self.path}"})
+
+    def do_DELETE(self) -> None:
+        if not self._allowed():
+            return
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "jobs":
+            self._with_job(parts[1], self.jobs.cancel)
+        else:
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"No such resource: {self.path}"})
+
+    def _allowed(self) -> bool:
+        """Refuse requests for another host name, i.e. from a web page that rebound its DNS name to us."""
+        if not isinstance(self.server, _TCPServer):
+            # Browsers can't reach a Unix socket.
+            return True
+        port = self.server.server_port
+        if self.headers.get("Host") in (f"127.0.0.1:{port}", f"localhost:{port}"):
+            return True
+        self._reply(HTTPStatus.FORBIDDEN, {"error": f"Unexpected Host header: {self.headers.get('Host')}"})
+        return False
+
+    def _with_job(self, job_id: str, action: Callable[[str], QueuedJob]) -> None:
+        try:
+            job = action(job_id)
+        except KeyError:
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"No such job: {job_id}"})
+            return
+        self._reply(HTTPStatus.OK, job.as_dict())
+
+    def _reply(self, status: HTTPStatus, body: Any) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "local"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, jobs: JobServer, address: tuple[str, int]) -> None:
+        self.jobs = jobs
+        super().__init__(address, _Handler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class _UnixServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, jobs: JobServer, path: Path) -> None:
+        self.jobs = jobs
+        # A socket file left behind by a server that didn't shut down cleanly.
+        if path.is_socket():
+            path.unlink()
+        super().__init__(str(path), _Handler)
+        self.url = f"unix:{path}"
+
+
+def make_server(
+    jobs: JobServer, *, port: int = DEFAULT_PORT, socket_path: Path | None = None
+) -> _TCPServer | _UnixServer:
+    """HTTP server for ``jobs`` on ``socket_path`` if given, else on ``localhost:port``.
+
+    Call ``serve_forever()`` on the result, and ``server_close()`` and
+    ``jobs.close()`` when done.
+    """
+    if socket_path is not None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError(f"Unix sockets are not supported on this platform: {socket_path}")
+        return _UnixServer(jobs, socket_path)
+    return _TCPServer(jobs, ("127.0.0.1", port))
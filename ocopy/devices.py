@@ -0,0 +1,80 @@
+"""Per-device read concurrency limits for verification.
+
+Paths are grouped by the device they live on (``st_dev``, i.e. the same
+grouping as :func:`ocopy.utils.get_mount`). Spinning disks get a single reader
+at a time because parallel streams turn into seeks; SSDs and NVMe get several,
+since they only reach full speed with a deep queue. On Linux the kind of disk is
+read from ``/sys/dev/block/<major>:<minor>/queue/rotational``; elsewhere (and
+for network or virtual filesystems) :data:`UNKNOWN_READERS` applies.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+from collections.abc import Generator
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+
+ROTATIONAL_READERS = 1
+SOLID_STATE_READERS = 4
+UNKNOWN_READERS = 2
+
+
+def device_of(path: Path) -> int:
+    """``st_dev`` of ``path``, or of its nearest existing parent (e.g. for a file that isn't written yet)."""
+    for candidate in (path, *path.parents):
+        with contextlib.suppress(OSError):
+            return candidate.stat().st_dev
+    return 0
+
+
+def is_rotational(device: int) -> bool | None:
+    """Whether ``device`` is a spinning disk; ``None`` when the OS doesn't tell."""
+    if not hasattr(os, "major"):
+        return None
+    sys_dev = Path("/sys/dev/block") / f"{os.major(device)}:{os.minor(device)}"
+    # Partitions don't have a queue of their own; their parent disk's directory does.
+    for queue in (sys_dev / "queue", sys_dev / ".." / "queue"):
+        with contextlib.suppress(OSError, ValueError):
+            return int((queue / "rotational").read_text().strip()) == 1
+    return None
+
+
+def default_readers(device: int) -> int:
+    rotational = is_rotational(device)
+    if rotational is None:
+        return UNKNOWN_READERS
+    return ROTATIONAL_READERS if rotational else SOLID_STATE_READERS
+
+
+class DeviceLimiter:
+    """Caps how many files are read at the same time from each device.
+
+    ``readers_per_device`` overrides the automatic per-device default (see the
+    module docstring). Every reader holds exactly one slot and never waits for a
+    second one, so readers on different devices can't deadlock each other.
+    """
+
+    def __init__(self, readers_per_device: int | None = None) -> None:
+        self.readers_per_device = readers_per_device
+        self._lock = Lock()
+        self._slots: dict[int, BoundedSemaphore] = {}
+
+    def limit_for(self, device: int) -> int:
+        return self.readers_per_device or default_readers(device)
+
+    def _semaphore(self, path: Path) -> BoundedSemaphore:
+        device = device_of(path)
+        with self._lock:
+            slots = self._slots.get(device)
+            if slots is None:
+                slots = self._slots[device] = BoundedSemaphore(self.limit_for(device))
+            return slots
+
+    @contextlib.contextmanager
+    def reading(self, path: Path) -> Generator[None]:
+        """Hold one of ``path``'s device slots for the duration of the block."""
+        slots = self._semaphore(path)
+        with slots:
+            yield
@@ -1,6 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from ocopy.hash_formats import DEFAULT_HASH_FORMAT
+
 
 @dataclass
 class FileInfo:
@@ -8,3 +10,5 @@ class FileInfo:
     file_hash: str
     size: int
     mtime: float
+    hash_format: str = DEFAULT_HASH_FORMAT
+    extra_hashes: dict[str, str] = field(default_factory=dict)
@@ -1,49 +1,183 @@
+from __future__ import annotations
+
+import contextlib
 from concurrent import futures
 from functools import lru_cache, partial
 from pathlib import Path
 from queue import Queue
+from typing import TYPE_CHECKING
 
-import xxhash
-from ascmhl import errors as ascmhl_errors
-from ascmhl.__version__ import ascmhl_folder_name
-from ascmhl.history import MHLHistory
-
+from ocopy.block_hash import BlockHasher
 from ocopy.checkpoint import Checkpoint
-from ocopy.mhl import find_mhl, xxh64_from_legacy_mhl_path
+from ocopy.hash_formats import DEFAULT_HASH_FORMAT, MultiHasher, background_threshold
+from ocopy.ignored import ascmhl_folder_name
+from ocopy.memory import get_byte_budget
+from ocopy.mhl import LEGACY_MHL_HASH_ELEMENTS, digest_from_legacy_mhl_path, find_mhl
 from ocopy.progress import ProgressPhase, ProgressUpdate, get_progress_queue
+from ocopy.tracing import span
+
+if TYPE_CHECKING:
+    from ascmhl.history import MHLHistory
 
+    from ocopy.devices import DeviceLimiter
+    from ocopy.throttle import BandwidthLimits, Throttle, ThrottleGroup
 
-def get_hash(file_path: Path, progress_queue: Queue[ProgressUpdate] | None = None, total_files: int = 1) -> str:
-    x = xxhash.xxh64()
 
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            x.update(chunk)
-            if progress_queue:
-                progress_queue.put(
-                    ProgressUpdate(
-                        ProgressPhase.VERIFY,
-                        file_path,
-                        len(chunk),
-                        parallel_verify_readers=total_files,
-                    ),
-                )
+def get_hash(
+    file_path: Path,
+    progress_queue: Queue[ProgressUpdate] | None = None,
+    total_files: int = 1,
+    block_hasher: BlockHasher | None = None,
+    hash_format: str = DEFAULT_HASH_FORMAT,
+    extra_hashes: dict[str, str] | None = None,
+    parallel: bool | None = None,
+    limiter: DeviceLimiter | None = None,
+    throttle: Throttle | ThrottleGroup | None = None,
+) -> str:
+    """Return the ``hash_format`` digest of ``file_path``.
 
-    return x.hexdigest()
+    Every format named by an ``extra_hashes`` key is computed from the same read
+    pass and its digest stored under that key.
 
+    ``parallel`` hashes on background threads while this thread keeps reading
+    (see :class:`ocopy.hash_formats.MultiHasher`); by default that starts once
+    :data:`~ocopy.hash_formats.PARALLEL_HASH_MIN_SIZE` bytes were read. The
+    digest is the same either way.
+
+    With a ``limiter`` the file is only read while one of its device's reader
+    slots is free; a ``throttle`` caps the read rate. Reads are charged to the
+    :func:`~ocopy.memory.get_byte_budget` if one is installed.
+    """
+    x = MultiHasher(
+        [hash_format, *(extra_hashes or ())],
+        background_after=background_threshold(parallel),
+        consumers=[block_hasher.update] if block_hasher is not None else [],
+    )
+    slot = limiter.reading(file_path) if limiter is not None else contextlib.nullcontext()
+    budget = get_byte_budget()
+    with span("verify.file", file=str(file_path)), slot, open(file_path, "rb") as f:
+        try:
+            while True:
+                if budget is None:
+                    chunk, lease = f.read(1024 * 1024), None
+                else:
+                    chunk, lease = budget.read(f, 1024 * 1024)
+                if not chunk:
+                    break
+                if throttle is not None:
+                    throttle.consume(len(chunk))
+                x.update(chunk, lease)
+                if progress_queue:
+                    progress_queue.put(
+                        ProgressUpdate(
+                            ProgressPhase.VERIFY,
+                            file_path,
+                            len(chunk),
+                            parallel_verify_readers=total_files,
+                        ),
+                    )
+        finally:
+            x.close()
 
-def multi_xxhash_check(filenames: list[Path]) -> str:
-    with futures.ThreadPoolExecutor(max_workers=len(filenames)) as executor:
-        unique_file_hashes = {
-            file_hash
-            for file_hash in executor.map(
-                partial(get_hash, progress_queue=get_progress_queue(), total_files=len(filenames)), filenames
+    digests = x.hexdigests()
+    if extra_hashes is not None:
+        extra_hashes.update((extra, digests[extra]) for extra in extra_hashes)
+    return digests[hash_format]
+
+
+def multi_xxhash_check(
+    filenames: list[Path],
+    hash_format: str = DEFAULT_HASH_FORMAT,
+    extra_hashes: dict[str, str] | None = None,
+    limiter: DeviceLimiter | None = None,
+    bandwidth: BandwidthLimits | None = None,
+) -> str:
+    """Hash all ``filenames`` in parallel and return their common digest (or ``"hashes_do_not_match"``).
+
+    ``extra_hashes`` is filled from the first file, the reference copy. Reads are
+    throttled to the ``bandwidth`` caps of each file's location.
+    """
+    hash_file = partial(
+        get_hash,
+        progress_queue=get_progress_queue(),
+        total_files=len(filenames),
+        hash_format=hash_format,
+        limiter=limiter,
+    )
+    with span("verify", files=len(filenames)), futures.ThreadPoolExecutor(max_workers=len(filenames)) as executor:
+        jobs = [
+            executor.submit(
+                hash_file,
+                path,
+                extra_hashes=extra_hashes if i == 0 else None,
+                throttle=bandwidth.for_read(path) if bandwidth is not None else None,
             )
-        }
+            for i, path in enumerate(filenames)
+        ]
+        unique_file_hashes = {job.result() for job in jobs}
 
     return unique_file_hashes.pop() if len(unique_file_hashes) == 1 else "hashes_do_not_match"
 
 
+def _get_hash_and_blocks(
+    file_path: Path,
+    block_size: int,
+    progress_queue: Queue[ProgressUpdate] | None,
+    total_files: int,
+    hash_format: str,
+    extra_hashes: dict[str, str] | None = None,
+    limiter: DeviceLimiter | None = None,
+    throttle: Throttle | ThrottleGroup | None = None,
+) -> tuple[str, list[str]]:
+    hasher = BlockHasher(block_size)
+    digest = get_hash(
+        file_path,
+        progress_queue,
+        total_files,
+        block_hasher=hasher,
+        hash_format=hash_format,
+        extra_hashes=extra_hashes,
+        limiter=limiter,
+        throttle=throttle,
+    )
+    return digest, hasher.finish()
+
+
+def multi_block_check(
+    filenames: list[Path],
+    block_size: int,
+    hash_format: str = DEFAULT_HASH_FORMAT,
+    extra_hashes: dict[str, str] | None = None,
+    limiter: DeviceLimiter | None = None,
+    bandwidth: BandwidthLimits | None = None,
+) -> tuple[list[str], list[list[str]]]:
+    """Like :func:`multi_xxhash_check`, but return every file's digest and per-block digests.
+
+    The caller compares the results itself so a mismatch can be traced to the
+    damaged blocks (see :mod:`ocopy.block_hash`).
+    """
+    hash_file = partial(
+        _get_hash_and_blocks,
+        block_size=block_size,
+        progress_queue=get_progress_queue(),
+        total_files=len(filenames),
+        hash_format=hash_format,
+        limiter=limiter,
+    )
+    with span("verify", files=len(filenames)), futures.ThreadPoolExecutor(max_workers=len(filenames)) as executor:
+        jobs = [
+            executor.submit(
+                hash_file,
+                path,
+                extra_hashes=extra_hashes if i == 0 else None,
+                throttle=bandwidth.for_read(path) if bandwidth is not None else None,
+            )
+            for i, path in enumerate(filenames)
+        ]
+        results = [job.result() for job in jobs]
+    return [digest for digest, _ in results], [blocks for _, blocks in results]
+
+
 def _innermost_root_with_marker(file_path: Path, marker: str, *, is_dir: bool) -> Path | None:
     """Walk from ``file_path`` upwards and return the deepest ancestor containing ``marker``.
 
@@ -74,7 +208,7 @@ def _innermost_root_with_marker(file_path: Path, marker: str, *, is_dir: bool) -
     return best
 
 
-def _xxh64_from_checkpoint(content_root: Path, file_path: Path) -> str | None:
+def _digest_from_checkpoint(content_root: Path, file_path: Path, hash_format: str) -> str | None:
     try:
         rel = file_path.resolve().relative_to(content_root.resolve()).as_posix()
     except ValueError:
@@ -83,7 +217,7 @@ def _xxh64_from_checkpoint(content_root: Path, file_path: Path) -> str | None:
         st = file_path.stat()
     except OSError:
         return None
-    return Checkpoint(content_root).lookup(rel, st.st_size, st.st_mtime)
+    return Checkpoint(content_root).lookup(rel, st.st_size, st.st_mtime, hash_format)
 
 
 @lru_cache(maxsize=1024)
@@ -95,6 +229,9 @@ def _cached_load_ascmhl(content_root_str: str, _mtime_ns: int) -> MHLHistory | N
     processes (e.g. GUI) while leaving plenty of headroom for many volumes and
     generations of invalidation keys.
     """
+    from ascmhl import errors as ascmhl_errors
+    from ascmhl.history import MHLHistory
+
     try:
         return MHLHistory.load_from_path(content_root_str)
     except (
@@ -115,7 +252,7 @@ def _load_ascmhl_history(content_root: Path) -> MHLHistory | None:
     return _cached_load_ascmhl(str(content_root.resolve()), mtime_ns)
 
 
-def _xxh64_latest_from_ascmhl(content_root: Path, file_path: Path) -> str | None:
+def _digest_latest_from_ascmhl(content_root: Path, file_path: Path, hash_format: str) -> str | None:
     history = _load_ascmhl_history(content_root)
     if history is None:
         return None
@@ -137,32 +274,41 @@ def _xxh64_latest_from_ascmhl(content_root: Path, file_path: Path) -> str | None
             media_hash = hash_list.find_media_hash_for_path(form)
             if media_hash is None or media_hash.is_directory:
                 continue
-            entry = media_hash.find_hash_entry_for_format("xxh64")
+            entry = media_hash.find_hash_entry_for_format(hash_format)
             if entry is not None and entry.hash_string:
                 return entry.hash_string
     return None
 
 
-def find_hash(file_path: Path) -> str | None:
+def find_hash(file_path: Path, hash_format: str = DEFAULT_HASH_FORMAT) -> str | None:
+    """Return a trusted ``hash_format`` digest for ``file_path`` from a checkpoint, ASC MHL or legacy MHL."""
+    with span("find_hash", file=str(file_path)):
+        return _find_hash(file_path, hash_format)
+
+
+def _find_hash(file_path: Path, hash_format: str) -> str | None:
     ck_root = _innermost_root_with_marker(file_path, Checkpoint.FILENAME, is_dir=False)
     if ck_root is not None:
-        ck_hash = _xxh64_from_checkpoint(ck_root, file_path)
+        ck_hash = _digest_from_checkpoint(ck_root, file_path, hash_format)
         if ck_hash:
             return ck_hash
 
     asc_root = _innermost_root_with_marker(file_path, ascmhl_folder_name, is_dir=True)
     if asc_root is not None:
-        asc_hash = _xxh64_latest_from_ascmhl(asc_root, file_path)
+        asc_hash = _digest_latest_from_ascmhl(asc_root, file_path, hash_format)
         if asc_hash:
             return asc_hash
 
+    # Legacy flat MHL files carry xxh64, md5 and sha1 at most.
+    if hash_format not in LEGACY_MHL_HASH_ELEMENTS:
+        return None
     dot_mhl = find_mhl(file_path)
     if dot_mhl:
         try:
             rel = file_path.resolve().relative_to(dot_mhl.parent.resolve())
         except ValueError:
             return None
-        file_hash = xxh64_from_legacy_mhl_path(dot_mhl, rel)
+        file_hash = digest_from_legacy_mhl_path(dot_mhl, rel, hash_format)
         if file_hash:
             return file_hash
 
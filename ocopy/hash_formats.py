@@ -0,0 +1,222 @@
+"""Content hash formats o/COPY can compute, named like the ASC MHL ``<hash>`` elements.
+
+``xxh64`` is the default and the only primary digest legacy flat MHL files
+support (they can carry ``md5`` and ``sha1`` as extras). ``xxh3`` (64-bit) and ``xxh128`` (xxh3-128) are
+several times faster on modern CPUs; ``benchmarks/test_bench_hash_formats.py``
+measures GB/s per core. ``md5``, ``sha1`` and ``c4`` are slow and meant as
+extra digests for deliveries that require them (see :class:`MultiHasher`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from threading import Lock, Thread
+from typing import Protocol
+
+import xxhash
+
+from ocopy.memory import Lease
+
+DEFAULT_HASH_FORMAT = "xxh64"
+
+
+class Hasher(Protocol):
+    def update(self, data: bytes | memoryview, /) -> None: ...
+
+    def hexdigest(self) -> str: ...
+
+
+class C4Hasher:
+    """C4 ID (SMPTE ST 2114): a SHA-512 digest in base58, padded to 90 characters with a ``c4`` prefix."""
+
+    CHARSET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+    LENGTH = 90
+
+    def __init__(self) -> None:
+        self._sha512 = hashlib.sha512()
+
+    def update(self, data: bytes | memoryview, /) -> None:
+        self._sha512.update(data)
+
+    def hexdigest(self) -> str:
+        value = int.from_bytes(self._sha512.digest(), "big")
+        digits = []
+        while value:
+            value, remainder = divmod(value, 58)
+            digits.append(self.CHARSET[remainder])
+        return "c4" + "".join(reversed(digits)).rjust(self.LENGTH - 2, "1")
+
+
+HASH_FORMATS: dict[str, Callable[[], Hasher]] = {
+    "xxh64": xxhash.xxh64,
+    "xxh3": xxhash.xxh3_64,
+    "xxh128": xxhash.xxh3_128,
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "c4": C4Hasher,
+}
+
+
+def new_hasher(hash_format: str = DEFAULT_HASH_FORMAT) -> Hasher:
+    try:
+        factory = HASH_FORMATS[hash_format]
+    except KeyError:
+        raise ValueError(f"Unsupported hash format {hash_format!r} (choose from {', '.join(HASH_FORMATS)})") from None
+    return factory()
+
+
+def _usable_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = Lock()
+
+
+def _hash_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_usable_cpus(), thread_name_prefix="ocopy-hash")
+        return _executor
+
+
+PARALLEL_HASH_MIN_SIZE = 64 * 1024 * 1024
+"""Once a stream passes this many bytes, :func:`ocopy.hash.get_hash` and
+:func:`ocopy.verified_copy.copy` move its hashing to background threads."""
+
+
+def background_threshold(parallel: bool | None) -> int | None:
+    """``MultiHasher(background_after=...)`` for a ``parallel`` flag.
+
+    ``None`` picks it by size, and never on a single core where the extra
+    threads only add hand-over cost.
+    """
+    if parallel is None:
+        return PARALLEL_HASH_MIN_SIZE if _usable_cpus() > 1 else None
+    return 0 if parallel else None
+
+
+class BackgroundSink:
+    """Feed chunks to ``update`` on a dedicated thread through a bounded queue.
+
+    The producer only blocks when ``depth`` chunks are pending, so reading the
+    next chunk overlaps with hashing the previous ones. Chunks must not be
+    mutated after they were handed over. :meth:`close` waits for the backlog and
+    re-raises the first error ``update`` hit. A chunk's :class:`~ocopy.memory.Lease`
+    is released once it was hashed (or skipped after an error).
+    """
+
+    def __init__(self, update: Callable[[bytes | memoryview], None], depth: int = 8) -> None:
+        self._queue: Queue[tuple[bytes | memoryview, Lease | None] | None] = Queue(maxsize=depth)
+        self._error: BaseException | None = None
+        self._thread = Thread(target=self._run, args=(update,), name="ocopy-hash", daemon=True)
+        self._thread.start()
+
+    def _run(self, update: Callable[[bytes | memoryview], None]) -> None:
+        while (item := self._queue.get()) is not None:
+            chunk, lease = item
+            try:
+                if self._error is None:  # else keep draining so the producer never blocks on a dead consumer
+                    update(chunk)
+            except BaseException as err:
+                self._error = err
+            finally:
+                if lease is not None:
+                    lease.release()
+
+    def update(self, data: bytes | memoryview, lease: Lease | None = None) -> None:
+        if self._error is not None:
+            if lease is not None:
+                lease.release()
+            raise self._error
+        self._queue.put((data, lease))
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+class MultiHasher:
+    """Several digests of the same byte stream, computed in one read pass.
+
+    With more than one format, each chunk is hashed by all of them concurrently on
+    a shared thread pool: xxhash and hashlib release the GIL while hashing a
+    buffer, so e.g. xxh64 + md5 + sha1 costs about as much as md5 alone on a
+    multi-core machine.
+
+    Once ``background_after`` bytes went through (``0``: from the start,
+    ``None``: never), every format instead gets its own :class:`BackgroundSink`
+    thread and :meth:`update` returns as soon as the chunk is queued, so even a
+    single (inherently sequential) xxh64 runs on another core than the reader.
+    Small files never pay for the threads. Call :meth:`close` (or
+    :meth:`hexdigests`) to stop them.
+
+    ``consumers`` (e.g. a :class:`ocopy.block_hash.BlockHasher`'s ``update``) are
+    fed the same chunks, on their own threads in background mode.
+    """
+
+    def __init__(
+        self,
+        hash_formats: Iterable[str],
+        *,
+        background_after: int | None = None,
+        consumers: Iterable[Callable[[bytes | memoryview], None]] = (),
+    ) -> None:
+        self.hashers = {hash_format: new_hasher(hash_format) for hash_format in dict.fromkeys(hash_formats)}
+        self._updates = [hasher.update for hasher in self.hashers.values()] + list(consumers)
+        self._background_after = background_after
+        self._seen = 0
+        self._sinks: list[BackgroundSink] = []
+
+    def update(self, data: bytes | memoryview, lease: Lease | None = None) -> None:
+        """Hash ``data``; ``lease`` is released once every digest and consumer is done with it."""
+        if self._background_after is not None and self._seen >= self._background_after:
+            self._background_after = None
+            self._sinks = [BackgroundSink(update) for update in self._updates]
+        self._seen += len(data)
+
+        if self._sinks:
+            share = Lease(len(self._sinks), lease.release) if lease is not None else None
+            for n, sink in enumerate(self._sinks):
+                try:
+                    sink.update(data, share)
+                except BaseException:
+                    if share is not None:
+                        share.release(len(self._sinks) - n - 1)
+                    raise
+            return
+        try:
+            if len(self._updates) == 1:
+                self._updates[0](data)
+            else:
+                for future in [_hash_executor().submit(update, data) for update in self._updates]:
+                    future.result()
+        finally:
+            if lease is not None:
+                lease.release()
+
+    def close(self) -> None:
+        self._background_after = None
+        sinks, self._sinks = self._sinks, []
+        errors = []
+        for sink in sinks:
+            try:
+                sink.close()
+            except BaseException as err:
+                errors.append(err)
+        if errors:
+            raise errors[0]
+
+    def hexdigests(self) -> dict[str, str]:
+        self.close()
+        return {hash_format: hasher.hexdigest() for hash_format, hasher in self.hashers.items()}
@@ -1,11 +1,17 @@
 """Basenames ignored by copy and post-backup checks (same rule for files and directories at each level)."""
 
-from ascmhl.__version__ import ascmhl_folder_name
+# Same value as ``ascmhl.__version__.ascmhl_folder_name``, spelled out so that importing the
+# CLI doesn't load mhllib; ``tests/test_checkpoint.py`` checks the two stay in sync.
+ascmhl_folder_name = "ascmhl"
 
 ignored_paths = frozenset(
     {
         ".DS_Store",
         ".ocopy-checkpoint",
+        ".ocopy-blocks",
+        ".ocopy-audit",
+        ".ocopy-index",
+        ".ocopy-index-journal",
         ".DocumentRevisions-V100",
         ".Spotlight-V100",
         ".Spotlight",
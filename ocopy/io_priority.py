@@ -0,0 +1,93 @@
+"""Linux I/O scheduling class and level (what ``ionice`` sets) for a copy job.
+
+The priority is set on the calling thread; threads it starts afterwards inherit
+it, which covers the writer and verification threads of a job. Other platforms,
+and schedulers that ignore priorities, run the job unchanged. Like
+:mod:`ocopy.sleep_inhibit` this is best effort: failures are logged, never raised.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import platform
+import sys
+from collections.abc import Generator
+
+logger = logging.getLogger(__name__)
+
+IO_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+"""``ioprio`` classes by their ``ionice`` name. ``realtime`` needs ``CAP_SYS_ADMIN``."""
+
+IO_LEVELS = range(8)
+"""Levels within the ``realtime`` and ``best-effort`` classes; ``0`` is the highest priority."""
+
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_WHO_PROCESS = 1
+# (ioprio_set, ioprio_get) syscall numbers; glibc has no wrappers for them.
+_SYSCALLS = {
+    "x86_64": (251, 252),
+    "aarch64": (30, 31),
+    "i386": (289, 290),
+    "i686": (289, 290),
+    "armv7l": (314, 315),
+}
+
+
+def _syscall(number: int, *args: int) -> int:
+    import ctypes
+    import os
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    result = libc.syscall(number, *args)
+    if result < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return result
+
+
+def _syscall_numbers() -> tuple[int, int] | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    return _SYSCALLS.get(platform.machine())
+
+
+def check_io_priority(io_class: str, level: int | None = None) -> None:
+    """Raise ``ValueError`` for an unknown class or a level outside :data:`IO_LEVELS`."""
+    if io_class not in IO_CLASSES:
+        raise ValueError(f"Unsupported I/O class {io_class!r} (choose from {', '.join(IO_CLASSES)})")
+    if level is not None and level not in IO_LEVELS:
+        raise ValueError(f"I/O priority level must be between 0 and 7, not {level}")
+
+
+@contextlib.contextmanager
+def io_priority(io_class: str | None, level: int | None = None) -> Generator[None]:
+    """Run the block, and the threads started in it, in ``io_class`` (``None``: unchanged).
+
+    ``level`` defaults to ``4``, the kernel's default within a class. The calling
+    thread's previous priority is restored afterwards.
+    """
+    if io_class is None:
+        yield
+        return
+    check_io_priority(io_class, level)
+    numbers = _syscall_numbers()
+    if numbers is None:
+        logger.info(f"I/O priority is not supported on {sys.platform}/{platform.machine()}; ignoring it")
+        yield
+        return
+
+    ioprio_set, ioprio_get = numbers
+    value = IO_CLASSES[io_class] << _IOPRIO_CLASS_SHIFT | (0 if io_class == "idle" else 4 if level is None else level)
+    try:
+        previous = _syscall(ioprio_get, _IOPRIO_WHO_PROCESS, 0)
+        _syscall(ioprio_set, _IOPRIO_WHO_PROCESS, 0, value)
+    except OSError as err:
+        logger.warning(f"Could not set I/O priority {io_class} ({err}); continuing without it")
+        yield
+        return
+    try:
+        yield
+    finally:
+        with contextlib.suppress(OSError):
+            _syscall(ioprio_set, _IOPRIO_WHO_PROCESS, 0, previous)
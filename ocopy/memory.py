@@ -0,0 +1,119 @@
+"""Process-wide cap on the bytes held in read buffers (``--memory-budget``).
+
+Every chunk read from a source or, while verifying, from any file is charged to
+the installed :class:`ByteBudget` until the last party holding it (each writer
+queue of :func:`ocopy.verified_copy.copy` and the hashers) is done with it. A
+reader that would exceed the budget waits (traced as ``memory.wait``) until
+enough chunks were written and hashed, so memory use no longer grows with the
+chunk size, the number of destinations or the number of jobs running at once.
+Like :mod:`ocopy.tracing`, nothing is installed by default and the pipeline
+only pays a global lookup per file.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from threading import Condition, Lock
+from typing import Any, BinaryIO
+
+from ocopy.tracing import span
+
+
+class Lease:
+    """Budget held on behalf of ``holders`` parties; ``on_free`` runs once the last one released it."""
+
+    __slots__ = ("_holders", "_lock", "_on_free")
+
+    def __init__(self, holders: int, on_free: Callable[[], None]) -> None:
+        self._holders = holders
+        self._on_free = on_free
+        self._lock = Lock()
+        if holders <= 0:
+            on_free()
+
+    def release(self, count: int = 1) -> None:
+        with self._lock:
+            self._holders -= count
+            free = self._holders == 0
+        if free:
+            self._on_free()
+
+
+class ByteBudget:
+    """At most ``limit`` bytes in flight across all threads.
+
+    A single request larger than the whole budget still goes through once
+    nothing else is in flight, so an oversized chunk slows the pipeline down
+    instead of deadlocking it.
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit <= 0:
+            raise ValueError(f"Memory budget must be positive, not {limit}")
+        self.limit = limit
+        self.in_flight = 0
+        self.peak = 0
+        self.waits = 0
+        self.waited = 0.0
+        self._changed = Condition()
+
+    def acquire(self, nbytes: int) -> None:
+        """Take ``nbytes``, waiting while they don't fit."""
+        with self._changed:
+            if self.in_flight and self.in_flight + nbytes > self.limit:
+                self.waits += 1
+                start = time.monotonic()
+                with span("memory.wait", nbytes=nbytes):
+                    self._changed.wait_for(lambda: not self.in_flight or self.in_flight + nbytes <= self.limit)
+                self.waited += time.monotonic() - start
+            self.in_flight += nbytes
+            self.peak = max(self.peak, self.in_flight)
+
+    def release(self, nbytes: int) -> None:
+        with self._changed:
+            self.in_flight -= nbytes
+            self._changed.notify_all()
+
+    def read(self, f: BinaryIO, size: int, holders: int = 1) -> tuple[bytes, Lease | None]:
+        """Read up to ``size`` bytes from ``f`` within the budget.
+
+        The chunk stays charged until its :class:`Lease` was released by all
+        ``holders``; an empty chunk (end of file) comes without a lease.
+        """
+        self.acquire(size)
+        try:
+            chunk = f.read(size)
+        except BaseException:
+            self.release(size)
+            raise
+        self.release(size - len(chunk))
+        if not chunk:
+            return chunk, None
+        nbytes = len(chunk)
+        return chunk, Lease(holders, lambda: self.release(nbytes))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Usage figures for the profile report."""
+        with self._changed:
+            return {
+                "limit_bytes": self.limit,
+                "in_flight_bytes": self.in_flight,
+                "peak_bytes": self.peak,
+                "waits": self.waits,
+                "waited_s": round(self.waited, 6),
+            }
+
+
+_budget: ByteBudget | None = None
+
+
+def set_byte_budget(budget: ByteBudget | None) -> ByteBudget | None:
+    """Install ``budget`` process-wide (``None``: unlimited); returns the previous one."""
+    global _budget
+    previous, _budget = _budget, budget
+    return previous
+
+
+def get_byte_budget() -> ByteBudget | None:
+    return _budget
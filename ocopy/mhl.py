@@ -5,15 +5,18 @@ from _socket import gethostname
 from functools import lru_cache
 from pathlib import Path
 
-from defusedxml import ElementTree
-from lxml import etree  # ty: ignore[unresolved-import]
-from lxml.builder import E
-
 from ocopy.file_info import FileInfo
 from ocopy.utils import get_user_display_name
 
+# lxml and defusedxml are imported where they're used so that only legacy MHL runs pay for them.
+
+LEGACY_MHL_HASH_ELEMENTS = {"xxh64": "xxhash64be", "md5": "md5", "sha1": "sha1"}
+"""Hash formats a legacy MHL v1.1 ``<hash>`` entry can hold, and their element names."""
+
 
 def file_info2mhl_hash(file_info: FileInfo, source: Path):
+    from lxml.builder import E
+
     now = datetime.datetime.now(datetime.UTC).replace(microsecond=0, tzinfo=None).isoformat() + "Z"
     new_hash = E.hash(
         # FIXME: use path relative to destination instead of source
@@ -26,12 +29,15 @@ def file_info2mhl_hash(file_info: FileInfo, source: Path):
             + "Z"
         ),
         E.xxhash64be(file_info.file_hash),
+        *(getattr(E, LEGACY_MHL_HASH_ELEMENTS[fmt])(digest) for fmt, digest in file_info.extra_hashes.items()),
         E.hashdate(now),
     )
     return new_hash
 
 
 def create_mhl(start: datetime.datetime):
+    from lxml.builder import E
+
     start_str = start.replace(microsecond=0).isoformat() + "Z"
     finish = datetime.datetime.now(datetime.UTC).replace(microsecond=0, tzinfo=None).isoformat() + "Z"
     new_mhl = E.hashlist(
@@ -49,6 +55,8 @@ def create_mhl(start: datetime.datetime):
 
 
 def write_mhl_to_destinations(new_mhl, destinations: list[Path]):
+    from lxml import etree  # ty: ignore[unresolved-import]
+
     for d in destinations:
         timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%d_%H%M%S")
         mhl_name = f"{os.path.basename(os.path.abspath(d))}_{timestamp}.mhl"
@@ -72,6 +80,7 @@ def get_hash_from_mhl(mhl: str, file_path: Path) -> str | None:
     """
     if not mhl:
         return None
+    from defusedxml import ElementTree
 
     posix_path = file_path.as_posix()
     root = ElementTree.fromstring(mhl)
@@ -85,10 +94,15 @@ def get_hash_from_mhl(mhl: str, file_path: Path) -> str | None:
     return None
 
 
-def _mhl_text_to_xxh64_index(mhl: str) -> dict[str, str]:
-    """Build ``posix_relpath -> xxh64`` from legacy flat MHL XML (first occurrence wins)."""
+def _mhl_text_to_digest_index(mhl: str, element: str = "xxhash64be") -> dict[str, str]:
+    """Build ``posix_relpath -> digest`` from legacy flat MHL XML (first occurrence wins).
+
+    ``element`` is the ``<hash>`` child holding the digest (see :data:`LEGACY_MHL_HASH_ELEMENTS`).
+    """
     if not mhl:
         return {}
+    from defusedxml import ElementTree
+
     root = ElementTree.fromstring(mhl)
     out: dict[str, str] = {}
     for hash_element in root.findall("hash"):
@@ -98,30 +112,41 @@ def _mhl_text_to_xxh64_index(mhl: str) -> dict[str, str]:
         path_key = file_elem.text
         if path_key in out:
             continue
-        xxhash_elem = hash_element.find("xxhash64be")
-        if xxhash_elem is not None and xxhash_elem.text:
-            out[path_key] = xxhash_elem.text
+        digest_elem = hash_element.find(element)
+        if digest_elem is not None and digest_elem.text:
+            out[path_key] = digest_elem.text
     return out
 
 
 @lru_cache(maxsize=128)
-def _cached_load_mhl_index(mhl_path_str: str, mtime_ns: int) -> dict[str, str]:
-    """Parse legacy flat ``*.mhl`` into a path index; keyed by ``(mhl_path_str, mtime_ns)``.
+def _cached_load_mhl_index(mhl_path_str: str, mtime_ns: int, element: str = "xxhash64be") -> dict[str, str]:
+    """Parse legacy flat ``*.mhl`` into a path index; keyed by ``(mhl_path_str, mtime_ns, element)``.
 
     ``maxsize=128``: fewer distinct legacy manifest files per process than ASC roots;
-    each entry is a ``dict`` of relpath→xxh64. Bounds memory in long-lived processes
+    each entry is a ``dict`` of relpath→digest. Bounds memory in long-lived processes
     while matching the bounded-LRU pattern used for :func:`ocopy.hash._cached_load_ascmhl`.
     """
-    return _mhl_text_to_xxh64_index(Path(mhl_path_str).read_text(encoding="utf-8"))
+    return _mhl_text_to_digest_index(Path(mhl_path_str).read_text(encoding="utf-8"), element)
 
 
 def xxh64_from_legacy_mhl_path(mhl_path: Path, file_relative_to_mhl_parent: Path) -> str | None:
     """Resolve xxh64 for ``file_relative_to_mhl_parent`` from the legacy ``*.mhl`` at ``mhl_path``."""
+    return digest_from_legacy_mhl_path(mhl_path, file_relative_to_mhl_parent, "xxh64")
+
+
+def digest_from_legacy_mhl_path(mhl_path: Path, file_relative_to_mhl_parent: Path, hash_format: str) -> str | None:
+    """Resolve the ``hash_format`` digest for ``file_relative_to_mhl_parent`` from the legacy ``*.mhl`` at ``mhl_path``.
+
+    Returns ``None`` for formats a legacy MHL can't hold (see :data:`LEGACY_MHL_HASH_ELEMENTS`).
+    """
+    element = LEGACY_MHL_HASH_ELEMENTS.get(hash_format)
+    if element is None:
+        return None
     try:
         mtime_ns = mhl_path.stat().st_mtime_ns
     except OSError:
         return None
-    index = _cached_load_mhl_index(str(mhl_path.resolve()), mtime_ns)
+    index = _cached_load_mhl_index(str(mhl_path.resolve()), mtime_ns, element)
     return index.get(file_relative_to_mhl_parent.as_posix())
 
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Generator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import StrEnum
 from pathlib import Path
@@ -29,3 +31,15 @@ class ProgressUpdate:
 
 def get_progress_queue() -> Queue[ProgressUpdate] | None:
     return getattr(current_thread(), "_progress_queue", None)
+
+
+@contextmanager
+def progress_queue_of(queue: Queue[ProgressUpdate] | None) -> Generator[None]:
+    """Report this thread's progress to ``queue``, e.g. on a pool thread working for a job's thread."""
+    thread = current_thread()
+    previous = get_progress_queue()
+    thread._progress_queue = queue  # ty: ignore[unresolved-attribute]
+    try:
+        yield
+    finally:
+        thread._progress_queue = previous  # ty: ignore[unresolved-attribute]
@@ -0,0 +1,92 @@
+"""Bandwidth and IOPS caps for reads and writes (``ocopy verify`` audits and copy jobs).
+
+A :class:`Throttle` is shared by every thread doing I/O under the same cap. Each
+``consume`` books its bytes and one I/O operation on a virtual clock per limit
+and sleeps until that clock catches up with real time, so the long-run rate
+never exceeds the cap while up to ``burst`` seconds of unused allowance can be
+spent at once after an idle period.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from threading import Lock
+
+
+class Throttle:
+    """Cap I/O to ``bytes_per_second`` and ``ops_per_second`` (``None``: unlimited) across threads."""
+
+    def __init__(
+        self, bytes_per_second: float | None = None, ops_per_second: float | None = None, burst: float = 1.0
+    ) -> None:
+        self.bytes_per_second = bytes_per_second
+        self.ops_per_second = ops_per_second
+        self.burst = burst
+        self._lock = Lock()
+        self._bytes_clock = self._ops_clock = time.monotonic() - burst
+
+    @property
+    def unlimited(self) -> bool:
+        return not self.bytes_per_second and not self.ops_per_second
+
+    def consume(self, nbytes: int, ops: int = 1) -> None:
+        """Account for ``nbytes`` read in ``ops`` operations, sleeping as long as the caps require."""
+        if self.unlimited:
+            return
+        with self._lock:
+            now = time.monotonic()
+            ready = now
+            if self.bytes_per_second:
+                self._bytes_clock = max(self._bytes_clock, now - self.burst) + nbytes / self.bytes_per_second
+                ready = max(ready, self._bytes_clock)
+            if self.ops_per_second:
+                self._ops_clock = max(self._ops_clock, now - self.burst) + ops / self.ops_per_second
+                ready = max(ready, self._ops_clock)
+        if ready > now:
+            time.sleep(ready - now)
+
+
+class ThrottleGroup:
+    """Charge every operation to several :class:`Throttle` s, e.g. a job-wide and a per-destination cap."""
+
+    def __init__(self, throttles: Iterable[Throttle]) -> None:
+        self.throttles = [throttle for throttle in throttles if not throttle.unlimited]
+
+    def consume(self, nbytes: int, ops: int = 1) -> None:
+        for throttle in self.throttles:
+            throttle.consume(nbytes, ops)
+
+
+class BandwidthLimits:
+    """Bandwidth caps of one copy job, in bytes per second.
+
+    ``job`` caps everything the job reads: the source while copying and every
+    file (source and copies) while verifying. Each of ``destinations`` (keyed by
+    the destination directories the job writes into) caps the writes to that
+    destination and the verification reads of the files on it.
+    """
+
+    def __init__(self, job: float | None = None, destinations: Mapping[Path, float] | None = None) -> None:
+        self.job = Throttle(job)
+        self._destinations = [
+            (Path(os.path.abspath(root)), Throttle(rate)) for root, rate in (destinations or {}).items()
+        ]
+
+    def _destination(self, path: Path) -> Throttle | None:
+        absolute = Path(os.path.abspath(path))
+        for root, throttle in self._destinations:
+            if absolute.is_relative_to(root):
+                return throttle
+        return None
+
+    def for_write(self, path: Path) -> Throttle | None:
+        """Throttle for writing ``path`` (``None`` if its destination is uncapped)."""
+        return self._destination(path)
+
+    def for_read(self, path: Path) -> ThrottleGroup | None:
+        """Throttle for reading ``path``: the job cap plus its destination's cap, if any."""
+        group = ThrottleGroup(t for t in (self.job, self._destination(path)) if t is not None)
+        return group if group.throttles else None
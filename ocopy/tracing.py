@@ -0,0 +1,151 @@
+"""Stage-level tracing hooks for the copy pipeline.
+
+Every pipeline stage runs inside ``with span("stage.name", ...):``. By default no
+tracer is installed and ``span`` hands back a shared no-op context manager, so
+the instrumentation costs one global lookup per call.
+
+A tracer is anything with an OpenTelemetry-style
+``start_as_current_span(name, attributes=None)`` context manager, so an
+``opentelemetry.trace.Tracer`` can be passed to :func:`set_tracer` as is.
+:class:`StageProfiler` is the built-in tracer behind ``ocopy --profile-report``.
+
+Stages:
+
+- ``copy.file``: one :func:`ocopy.verified_copy.copy` call
+- ``copy.read`` / ``copy.hash``: reading and hashing one source chunk
+- ``copy.queue_put``: time the reader is blocked on full writer queues (a slow destination)
+- ``copy.write``: writing one chunk to one destination (or comparing it on resume)
+- ``memory.wait``: a read waiting for buffers to be freed under ``--memory-budget`` (see :mod:`ocopy.memory`)
+- ``copy.sync``: ``fsync`` of a large in-progress file before its durable offset is checkpointed
+- ``copy.rename``: committing ``.copy_in_progress`` files
+- ``verify`` / ``verify.file``: :func:`ocopy.hash.multi_xxhash_check` and each file it reads
+- ``find_hash``: trusted digest lookup (checkpoint, ASC MHL, legacy MHL)
+- ``checkpoint.record``: appending and ``fsync``-ing one checkpoint record
+- ``seal.ascmhl`` / ``seal.legacy_mhl``: writing the manifests
+- ``check.destinations``: the post-copy completeness check
+- ``archive.file`` / ``archive.finish``: reading a file that wasn't copied into ``--archive``, and completing it
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import math
+import time
+from collections.abc import Generator
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Protocol
+
+
+class Tracer(Protocol):
+    def start_as_current_span(
+        self, name: str, attributes: dict[str, Any] | None = None
+    ) -> AbstractContextManager[Any]: ...
+
+
+_NOOP_SPAN = contextlib.nullcontext()
+_tracer: Tracer | None = None
+
+
+def set_tracer(tracer: Tracer | None) -> Tracer | None:
+    """Install ``tracer`` process-wide (``None`` restores the no-op default); returns the previous one."""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def get_tracer() -> Tracer | None:
+    return _tracer
+
+
+def span(name: str, **attributes: Any) -> AbstractContextManager[Any]:
+    """Context manager timing one pipeline stage with the installed tracer."""
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP_SPAN
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+# Upper bucket edges in milliseconds; the last bucket is open-ended.
+HISTOGRAM_EDGES_MS = (0.01, 0.1, 1.0, 10.0, 100.0, 1_000.0, 10_000.0, math.inf)
+
+
+@dataclass
+class StageStats:
+    """Running aggregate for one stage; constant memory no matter how many spans were recorded."""
+
+    count: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(HISTOGRAM_EDGES_MS))
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        ms = seconds * 1000
+        for i, edge in enumerate(HISTOGRAM_EDGES_MS):
+            if ms <= edge:
+                self.buckets[i] += 1
+                break
+
+    def as_dict(self) -> dict[str, Any]:
+        histogram = {}
+        lower = 0.0
+        for edge, n in zip(HISTOGRAM_EDGES_MS, self.buckets, strict=True):
+            label = f">{lower:g}" if math.isinf(edge) else f"<={edge:g}"
+            histogram[label] = n
+            lower = edge
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 6),
+            "mean_ms": round(self.total / self.count * 1000, 4) if self.count else 0.0,
+            "min_ms": round(self.min * 1000, 4) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 4),
+            "histogram_ms": histogram,
+        }
+
+
+class StageProfiler:
+    """Tracer that aggregates span durations per stage name.
+
+    Spans from all threads are summed, so a stage's ``total_s`` can exceed the
+    wall time when it runs concurrently (one writer per destination, parallel
+    verification reads).
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._stages: dict[str, StageStats] = {}
+        self._started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name: str, attributes: dict[str, Any] | None = None) -> Generator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stages.get(name)
+                if stats is None:
+                    stats = self._stages[name] = StageStats()
+                stats.add(elapsed)
+
+    def report(self, **run_info: Any) -> dict[str, Any]:
+        """Per-stage breakdown, slowest total first; ``run_info`` is stored under ``"run"``."""
+        with self._lock:
+            stages = sorted(self._stages.items(), key=lambda item: item[1].total, reverse=True)
+            return {
+                "run": run_info,
+                "wall_time_s": round(time.perf_counter() - self._started, 6),
+                "stages": {name: stats.as_dict() for name, stats in stages},
+            }
+
+    def write_report(self, path: Path, **run_info: Any) -> None:
+        Path(path).write_text(json.dumps(self.report(**run_info), indent=2) + "\n", encoding="utf-8")
@@ -1,3 +1,4 @@
+import errno
 import os
 import platform
 import shutil
@@ -5,7 +6,7 @@ import sys
 from pathlib import Path
 from threading import Thread
 
-from ocopy.ignored import ignored_paths
+from ocopy.ignored import ignored_paths, is_ignored_basename
 
 if sys.platform == "darwin":
     import ctypes
@@ -38,6 +39,8 @@ if sys.platform == "darwin":
     _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
     _libc.statfs.argtypes = (ctypes.c_char_p, ctypes.POINTER(_StatFs))
     _libc.statfs.restype = ctypes.c_int
+    _libc.clonefile.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+    _libc.clonefile.restype = ctypes.c_int
 
     def _statfs_bavail_bytes(path) -> int:
         fs = _StatFs()
@@ -52,6 +55,7 @@ def threaded(fn):
         t = Thread(target=fn, args=args, kwargs=kwargs)
         t.daemon = True
         t.start()
+        return t
 
     return wrapper
 
@@ -65,6 +69,78 @@ def folder_size(path):
     return total
 
 
+def file_count(path: Path) -> int:
+    """Number of files a copy of ``path`` takes along (the same names are ignored as while copying)."""
+    count = 0
+    for _, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if not is_ignored_basename(d)]
+        count += sum(1 for f in files if not is_ignored_basename(f))
+    return count
+
+
+def file_holes(path: Path) -> list[tuple[int, int]] | None:
+    """``(start, end)`` byte ranges of ``path`` that are holes, found with ``SEEK_HOLE`` / ``SEEK_DATA``.
+
+    Returns ``None`` where the platform or filesystem can't report holes.
+    Filesystems that don't track them report none, which is correct if wasteful.
+    """
+    if not hasattr(os, "SEEK_HOLE"):
+        return None
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        holes = []
+        pos = 0
+        while pos < size:
+            try:
+                start = os.lseek(fd, pos, os.SEEK_HOLE)
+            except OSError as err:
+                if err.errno in (errno.EINVAL, errno.EOPNOTSUPP):
+                    return None
+                raise
+            if start >= size:
+                break
+            try:
+                pos = os.lseek(fd, start, os.SEEK_DATA)
+            except OSError as err:
+                if err.errno != errno.ENXIO:
+                    raise
+                pos = size  # nothing but the hole is left
+            holes.append((start, pos))
+        return holes
+    finally:
+        os.close(fd)
+
+
+_FICLONE = 0x40049409
+"""Linux ``ioctl`` that makes a file share all blocks of another (``cp --reflink``)."""
+
+
+def clone_file(src: Path, dst: Path) -> None:
+    """Create ``dst`` as a copy-on-write clone of ``src`` (a reflink), without copying any data.
+
+    Raises ``OSError`` where the platform or filesystem can't clone files, e.g.
+    across volumes or on ext4, HFS+ and exFAT; ``dst`` is not left behind then.
+    """
+    if sys.platform == "darwin":
+        if _libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), os.fspath(dst))
+        return
+    if sys.platform != "linux":
+        raise OSError(errno.EOPNOTSUPP, "Cloning files is not supported on this platform", os.fspath(dst))
+
+    import fcntl
+
+    with open(src, "rb") as src_f, open(dst, "xb") as dst_f:
+        try:
+            fcntl.ioctl(dst_f.fileno(), _FICLONE, src_f.fileno())
+        except OSError:
+            dst_f.close()
+            os.unlink(dst)
+            raise
+
+
 def get_user_display_name() -> str:
     if platform.system() != "Windows":
         import pwd
@@ -3,28 +3,39 @@ from __future__ import annotations
 
 import contextlib
 import datetime
+import logging
 import os
 import time
-from collections.abc import Callable, Iterator
-from concurrent.futures import as_completed
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import Future
 from concurrent.futures.thread import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from queue import Empty, Queue
+from queue import Empty, Full, Queue
 from shutil import copystat
-from threading import Event, Thread
-from time import sleep
+from threading import Condition, Event, Lock, Thread
+from typing import TYPE_CHECKING
 
-import xxhash
-
-from ocopy.ascmhl_seal import ASCMHLSealError, seal_ascmhl_destinations
+from ocopy.block_hash import BlockHasher, BlockStore, mismatched_blocks, repair_blocks
 from ocopy.checkpoint import Checkpoint
+from ocopy.devices import DeviceLimiter
 from ocopy.file_info import FileInfo
-from ocopy.hash import find_hash, multi_xxhash_check
+from ocopy.hash import find_hash, get_hash, multi_block_check, multi_xxhash_check
+from ocopy.hash_formats import DEFAULT_HASH_FORMAT, MultiHasher, background_threshold, new_hasher
 from ocopy.ignored import is_ignored_basename
-from ocopy.mhl import write_mhl
-from ocopy.progress import ProgressPhase, ProgressUpdate, get_progress_queue
-from ocopy.utils import folder_size, threaded
+from ocopy.io_priority import check_io_priority, io_priority
+from ocopy.memory import Lease, get_byte_budget
+from ocopy.mhl import LEGACY_MHL_HASH_ELEMENTS
+from ocopy.progress import ProgressPhase, ProgressUpdate, get_progress_queue, progress_queue_of
+from ocopy.throttle import BandwidthLimits
+from ocopy.tracing import span
+from ocopy.utils import clone_file, file_holes, folder_size, threaded
+
+if TYPE_CHECKING:
+    from ocopy.archive import ArchiveWriter, MemberWriter
+
+logger = logging.getLogger(__name__)
 
 CancelToken = Callable[[], bool]
 """Cancellation signal callable: returns True once the caller should stop."""
@@ -38,6 +49,10 @@ class VerificationError(OSError):
     """Raised when source and destination checksums disagree."""
 
 
+class DestinationStalledError(TimeoutError):
+    """Raised for a destination that accepted no data for ``stall_timeout`` seconds."""
+
+
 @dataclass
 class ErrorListEntry:
     """One failure captured while the traversal continues through sibling files."""
@@ -59,6 +74,22 @@ class CopyResult:
     skipped_files: int = 0
     cancelled: bool = False
     checkpoint_paths: list[Path] = field(default_factory=list)
+    repaired_blocks: int = 0
+    dropped_destinations: dict[Path, list[str]] = field(default_factory=dict)
+    linked_files: int = 0
+    archive_xxh64: str | None = None
+
+
+class DestinationsDropped(CopyTreeError):
+    """Raised by :func:`copy_and_seal` when destinations were dropped but the others completed.
+
+    ``result`` describes the copies on the remaining destinations; the error list
+    has one entry per dropped destination.
+    """
+
+    def __init__(self, errors: list[ErrorListEntry], result: CopyResult) -> None:
+        super().__init__(errors)
+        self.result = result
 
 
 @dataclass
@@ -68,6 +99,25 @@ class _CopyState:
     Uses a plain dataclass (not a context manager or thread-local) so the
     classification/copy logic stays pure: every side channel is an explicit
     field on this object.
+
+    With a ``verify_executor``, files whose destinations all exist already are
+    verified concurrently (reads capped per device by ``device_limiter``), so the
+    counters are only updated through :meth:`add_skipped` / :meth:`add_repaired`.
+    ``bandwidth`` throttles the copy and verification reads and writes.
+    ``io_class`` / ``io_level`` are re-applied in every verification task, since
+    the threads of a ``verify_executor`` shared between jobs were started at
+    another job's (or the server's) I/O priority.
+
+    With ``isolate_destinations``, a destination root (by index) that fails or
+    stalls for ``stall_timeout`` seconds is recorded in ``dropped`` and left out
+    of the rest of the run; ``lacking`` collects the files it is missing.
+    ``sparse`` copies holes in source files as holes.
+
+    With ``dedupe``, every copied file is remembered in ``originals`` (by inode
+    if it has hardlinks, and by size and digest for ``"content"``) so that later
+    duplicates are linked to its copies instead of copied again.
+
+    ``archive`` receives every file of the tree as well (see :mod:`ocopy.archive`).
     """
 
     cancel_token: CancelToken
@@ -75,55 +125,363 @@ class _CopyState:
     source_tree_root: Path
     need_integrity: bool
     skipped_files: int = 0
+    block_size: int | None = None
+    block_stores: list[BlockStore] = field(default_factory=list)
+    repaired_blocks: int = 0
+    hash_format: str = DEFAULT_HASH_FORMAT
+    extra_hash_formats: tuple[str, ...] = ()
+    device_limiter: DeviceLimiter | None = None
+    verify_executor: ThreadPoolExecutor | None = None
+    bandwidth: BandwidthLimits | None = None
+    io_class: str | None = None
+    io_level: int | None = None
+    isolate_destinations: bool = False
+    stall_timeout: float | None = None
+    sparse: bool = False
+    dropped: dict[int, str] = field(default_factory=dict)
+    lacking: dict[int, list[str]] = field(default_factory=dict)
+    dedupe: str | None = None
+    originals: dict[tuple, tuple[list[Path], FileInfo]] = field(default_factory=dict)
+    original_sizes: set[int] = field(default_factory=set)
+    no_clone: set[int] = field(default_factory=set)
+    linked_files: int = 0
+    archive: ArchiveWriter | None = None
+    _counter_lock: Lock = field(default_factory=Lock)
+
+    def add_skipped(self, count: int) -> None:
+        with self._counter_lock:
+            self.skipped_files += count
+
+    def add_repaired(self, count: int) -> None:
+        with self._counter_lock:
+            self.repaired_blocks += count
+
+    def add_linked(self, count: int) -> None:
+        with self._counter_lock:
+            self.linked_files += count
+
+    def drop(self, index: int, error: BaseException | str, rel_path: str | None = None) -> None:
+        """Leave destination root ``index`` out from now on; ``rel_path`` is the file it failed on."""
+        with self._counter_lock:
+            if index not in self.dropped:
+                self.dropped[index] = str(error)
+                self.lacking[index] = []
+            if rel_path is not None and self.lacking[index][-1:] != [rel_path]:
+                self.lacking[index].append(rel_path)
+
+    def note_lacking(self, rel_path: str) -> None:
+        """Record that every dropped destination lacks ``rel_path``."""
+        with self._counter_lock:
+            for files in self.lacking.values():
+                if files[-1:] != [rel_path]:
+                    files.append(rel_path)
+
+    def remember(self, src_path: Path, dst_paths: list[Path], info: FileInfo) -> None:
+        """Offer the copies of ``src_path`` as originals for later duplicates."""
+        st = src_path.stat()
+        if st.st_nlink > 1:
+            self.originals.setdefault(("inode", st.st_dev, st.st_ino), (dst_paths, info))
+        if self.dedupe == "content" and info.file_hash and info.size:
+            self.originals.setdefault(("content", info.size, info.file_hash), (dst_paths, info))
+            self.original_sizes.add(info.size)
+
+    def healthy(self, destinations: list[Path]) -> tuple[list[int], list[Path], list[Checkpoint], list[BlockStore]]:
+        """Indices, paths, checkpoints and block stores of the ``destinations`` that were not dropped."""
+        if not self.dropped:
+            return list(range(len(destinations))), destinations, self.checkpoints, self.block_stores
+        keep = [i for i in range(len(destinations)) if i not in self.dropped]
+
+        def pick(items: list) -> list:
+            return [items[i] for i in keep] if len(items) == len(destinations) else items
+
+        return keep, [destinations[i] for i in keep], pick(self.checkpoints), pick(self.block_stores)
 
 
 def _never_cancelled() -> bool:
     return False
 
 
-def copy(src_file: Path, destinations: list[Path], chunk_size: int = 1024 * 1024) -> str:
-    """Copy one file to multiple destinations chunk by chunk, returning its xxh64."""
-    queues = [Queue(maxsize=10) for _ in destinations]
+VERIFY_WORKERS = 8
+"""Files verified concurrently when resuming with ``skip_existing`` (``1`` verifies them one by one)."""
 
-    def writer(queue: Queue, file_path: Path):
-        with open(file_path, "wb") as dest_f:
-            while True:
-                write_chunk = queue.get()
-                if not write_chunk:
-                    queue.task_done()
-                    break
-                dest_f.write(write_chunk)
-                queue.task_done()
+RESUME_INTERVAL = 256 * 1024 * 1024
+"""Bytes between durable ``partial`` checkpoint records of a large in-progress file."""
 
-    with ThreadPoolExecutor(max_workers=len(destinations)) as executor:
-        futures = [executor.submit(writer, queues[i], d) for i, d in enumerate(destinations)]
+STALL_TIMEOUT = 30.0
+"""Seconds a destination may take no data before ``isolate_destinations`` drops it."""
 
-        x = xxhash.xxh64()
-        progress_queue = get_progress_queue()
+DEDUPE_MODES = ("hardlinks", "content")
+"""``dedupe`` modes: link hardlinked source files only, or files with identical content as well."""
 
-        with open(src_file, "rb") as f:
-            while True:
-                chunk = f.read(chunk_size)
-                for q in queues:
-                    q.put(chunk)
 
-                if not chunk:
-                    break
+class _CopyCancelled(Exception):
+    """Raised by :func:`copy` when the cancel token fires mid-file; in-progress files are kept for resume."""
 
-                x.update(chunk)
-                if progress_queue:
-                    progress_queue.put(ProgressUpdate(ProgressPhase.COPY, src_file, len(chunk)))
 
-        for future in as_completed(futures):
-            future.result()
+@dataclass
+class _InProgress:
+    """Resume bookkeeping for one ``.copy_in_progress`` file handed to :func:`copy`.
+
+    ``resume_from`` bytes of the existing file were durable at the end of an
+    earlier run; they are compared against the source and only rewritten from the
+    first mismatch. ``record`` persists a new durable offset (a bound
+    :meth:`Checkpoint.record_partial`) after the file has been ``fsync``-ed.
+    """
 
-    for q in queues:
-        q.join()
+    resume_from: int = 0
+    record: Callable[[int], None] | None = None
 
-    for d in destinations:
-        copystat(src_file, d)
 
-    return x.hexdigest()
+def _sync(f) -> None:
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def copy(
+    src_file: Path,
+    destinations: list[Path],
+    chunk_size: int = 1024 * 1024,
+    *,
+    in_progress: list[_InProgress] | None = None,
+    cancel_token: CancelToken | None = None,
+    block_hasher: BlockHasher | None = None,
+    hash_format: str = DEFAULT_HASH_FORMAT,
+    extra_hashes: dict[str, str] | None = None,
+    parallel_hash: bool | None = None,
+    bandwidth: BandwidthLimits | None = None,
+    dropped: dict[int, BaseException] | None = None,
+    stall_timeout: float | None = None,
+    sparse: bool = False,
+    consumers: Sequence[Callable[[bytes | memoryview], None]] = (),
+) -> str:
+    """Copy one file to multiple destinations chunk by chunk, returning its ``hash_format`` digest.
+
+    The source is always read and hashed from the first byte, so the digest is the
+    same whether or not a destination resumed an earlier partial copy. Formats
+    named by ``extra_hashes`` keys are hashed from the same chunks and their
+    digests stored under those keys. ``parallel_hash`` works like ``parallel``
+    in :func:`ocopy.hash.get_hash`: hashing moves off the reading thread.
+    With ``bandwidth``, source reads are held to the job cap and each writer to
+    its destination's cap.
+
+    A failing writer stops the copy at the next chunk and its error is raised.
+    With ``dropped`` the failing destination is left behind instead: its index
+    and error are stored there and the others are written to the end. A
+    destination that takes no chunk for ``stall_timeout`` seconds is dropped the
+    same way with a :class:`DestinationStalledError`. The error is only raised
+    when every destination has been dropped.
+
+    With a :func:`~ocopy.memory.set_byte_budget` installed, every chunk is
+    charged to it until all writers and hashers are done with it.
+
+    With ``sparse``, holes in the source (see :func:`ocopy.utils.file_holes`)
+    are not read but hashed as the zeros they stand for, and the writers seek
+    past them so the copies stay sparse.
+
+    ``consumers`` (e.g. an archive member's ``write``) get every chunk of the
+    source in order, like ``block_hasher``.
+    """
+    # Holes travel as memoryviews of one zero buffer; data read from the source is always bytes.
+    queues: list[Queue[tuple[bytes | memoryview, Lease | None]]] = [Queue(maxsize=10) for _ in destinations]
+    targets = in_progress or [_InProgress() for _ in destinations]
+    stopped = Event()
+    failed = Event()
+    failures: dict[int, BaseException] = {}
+    abandoned = [Event() for _ in destinations]
+    ended = [False] * len(destinations)
+    live = list(range(len(destinations)))
+
+    def write(
+        i: int, queue: Queue[tuple[bytes | memoryview, Lease | None]], file_path: Path, target: _InProgress
+    ) -> None:
+        throttle = bandwidth.for_write(file_path) if bandwidth is not None else None
+        verified_limit = target.resume_from
+        recorded = verified_limit
+        pos = 0
+        # A hole at the end only exists once the file was extended to ``pos``.
+        unextended = False
+        with open(file_path, "r+b" if verified_limit else "wb") as dest_f:
+            while True:
+                write_chunk, lease = queue.get()
+                try:
+                    if not write_chunk:
+                        ended[i] = True
+                        break
+                    if abandoned[i].is_set():
+                        break
+                    with span("copy.write"):
+                        if pos < verified_limit:
+                            # Resuming: keep the existing prefix as long as it matches the source.
+                            n = min(len(write_chunk), verified_limit - pos)
+                            if dest_f.read(n) == write_chunk[:n]:
+                                pos += n
+                                write_chunk = write_chunk[n:]
+                            else:
+                                verified_limit = pos
+                            if pos >= verified_limit:
+                                dest_f.seek(pos)
+                                dest_f.truncate()
+                        if isinstance(write_chunk, memoryview):
+                            dest_f.seek(len(write_chunk), os.SEEK_CUR)
+                            pos += len(write_chunk)
+                            unextended = True
+                        elif write_chunk:
+                            if throttle is not None:
+                                throttle.consume(len(write_chunk))
+                            dest_f.write(write_chunk)
+                            pos += len(write_chunk)
+                            unextended = False
+                finally:
+                    if lease is not None:
+                        lease.release()
+                if target.record and pos - recorded >= RESUME_INTERVAL:
+                    with span("copy.sync"):
+                        if unextended:
+                            dest_f.truncate(pos)
+                            unextended = False
+                        _sync(dest_f)
+                    target.record(pos)
+                    recorded = pos
+            if unextended:
+                dest_f.truncate(pos)
+            if stopped.is_set() and target.record and pos > recorded:
+                with span("copy.sync"):
+                    _sync(dest_f)
+                target.record(pos)
+
+    def writer(i: int) -> None:
+        try:
+            write(i, queues[i], destinations[i], targets[i])
+        except BaseException as err:
+            failures[i] = err
+            failed.set()
+            # Keep taking chunks until the end marker so the reader never blocks on a dead writer.
+            while not ended[i]:
+                chunk, lease = queues[i].get()
+                if lease is not None:
+                    lease.release()
+                if not chunk:
+                    break
+
+    def drop(i: int, err: BaseException) -> None:
+        assert dropped is not None
+        dropped[i] = err
+        abandoned[i].set()
+        live.remove(i)
+
+    def abandon(i: int, err: BaseException) -> None:
+        # A stalled writer may never take its backlog: free it and leave an end marker.
+        drop(i, err)
+        with contextlib.suppress(Empty):
+            while True:
+                _, lease = queues[i].get_nowait()
+                if lease is not None:
+                    lease.release()
+        with contextlib.suppress(Full):
+            queues[i].put_nowait((b"", None))
+
+    def put(chunk: bytes | memoryview, lease: Lease | None = None) -> None:
+        for i in list(live):
+            if i in failures and dropped is not None:
+                drop(i, failures[i])
+                # Its writer is draining: let it see the end marker and exit.
+                queues[i].put((b"", None))
+            else:
+                try:
+                    queues[i].put((chunk, lease), timeout=stall_timeout if dropped is not None else None)
+                    continue
+                except Full:
+                    abandon(
+                        i, DestinationStalledError(f"{destinations[i]} accepted no data for {stall_timeout:g} seconds")
+                    )
+            if lease is not None:
+                lease.release()
+
+    threads = [Thread(target=writer, args=(i,), name=f"ocopy-write-{i}", daemon=True) for i in range(len(destinations))]
+    for thread in threads:
+        thread.start()
+
+    x = MultiHasher(
+        [hash_format, *(extra_hashes or ())],
+        background_after=background_threshold(parallel_hash),
+        consumers=[*([block_hasher.update] if block_hasher is not None else []), *consumers],
+    )
+    progress_queue = get_progress_queue()
+    budget = get_byte_budget()
+    holes = (file_holes(src_file) or []) if sparse else []
+    zeros = memoryview(bytes(chunk_size)) if holes else None
+    pos = 0
+
+    with span("copy.file", file=str(src_file)):
+        finished = False
+        try:
+            with open(src_file, "rb") as f:
+                while live:
+                    lease = None
+                    chunk: bytes | memoryview
+                    if cancel_token is not None and cancel_token():
+                        stopped.set()
+                        chunk = b""
+                    elif failed.is_set() and dropped is None:
+                        # Fail fast: stop reading as soon as any writer died.
+                        chunk = b""
+                    elif holes and pos >= holes[0][0]:
+                        assert zeros is not None
+                        chunk = zeros[: min(chunk_size, holes[0][1] - pos)]
+                        pos += len(chunk)
+                        if pos >= holes[0][1]:
+                            f.seek(holes.pop(0)[1])
+                    else:
+                        size = min(chunk_size, holes[0][0] - pos) if holes else chunk_size
+                        with span("copy.read"):
+                            if budget is None:
+                                chunk = f.read(size)
+                            else:
+                                # One holder per writer plus the hasher.
+                                chunk, lease = budget.read(f, size, holders=len(live) + 1)
+                        pos += len(chunk)
+                        if bandwidth is not None and chunk:
+                            bandwidth.job.consume(len(chunk))
+                    with span("copy.queue_put"):
+                        put(chunk, lease)
+
+                    if not chunk:
+                        finished = True
+                        break
+
+                    with span("copy.hash"):
+                        x.update(chunk, lease)
+                    if progress_queue:
+                        progress_queue.put(ProgressUpdate(ProgressPhase.COPY, src_file, len(chunk)))
+        finally:
+            x.close()
+            if not finished:
+                # Reading failed: let the remaining writers close their files.
+                put(b"")
+            for i in list(live):
+                threads[i].join(stall_timeout if dropped is not None else None)
+                if threads[i].is_alive():
+                    abandon(i, DestinationStalledError(f"{destinations[i]} did not finish writing in time"))
+
+    if dropped is not None:
+        for i in list(live):
+            if i in failures:
+                drop(i, failures[i])
+        if not live:
+            raise dropped[min(dropped)]
+    elif failures:
+        raise failures[min(failures)]
+
+    if stopped.is_set():
+        raise _CopyCancelled(src_file)
+
+    for i in live:
+        copystat(src_file, destinations[i])
+
+    digests = x.hexdigests()
+    if extra_hashes is not None:
+        extra_hashes.update((extra, digests[extra]) for extra in extra_hashes)
+    return digests[hash_format]
 
 
 def _default_state(source_root: Path, verify: bool) -> _CopyState:
@@ -152,15 +510,63 @@ def copytree(
 
     ``state`` is an internal plumbing parameter; direct callers (tests, library use)
     may omit it and receive default "no cancellation, no checkpoints" behavior.
+
+    With ``state.verify_executor`` set and ``skip_existing``, files whose
+    destinations all exist are verified on that executor while the walk goes on;
+    ``file_infos`` keeps the walk order regardless. With ``state.archive`` set,
+    pending results are collected before the walk archives anything else, so
+    the archive keeps the walk order too; with ``state.dedupe``, before anything
+    else is copied, so a later duplicate is linked to them.
     """
     if state is None:
         state = _default_state(source.resolve(), verify)
 
-    for d in destinations:
-        d.mkdir(parents=True, exist_ok=True)
+    def archive(src_path: Path) -> None:
+        # Files that weren't copied in this run (skipped, linked) are read into the archive separately.
+        assert state.archive is not None
+        rel_path = src_path.resolve().relative_to(state.source_tree_root).as_posix()
+        if rel_path not in state.archive:
+            throttle = state.bandwidth.for_read(src_path) if state.bandwidth is not None else None
+            state.archive.add_file(rel_path, src_path, throttle)
+
+    for i, d in enumerate(destinations):
+        if i in state.dropped:
+            continue
+        try:
+            d.mkdir(parents=True, exist_ok=True)
+        except OSError as err:
+            if not state.isolate_destinations:
+                raise
+            state.drop(i, err)
 
     file_infos: list[FileInfo] = []
     errors: list[ErrorListEntry] = []
+    # (position in ``file_infos``, source, destinations, pending verification)
+    deferred: list[tuple[int, Path, list[Path], Future[FileInfo]]] = []
+    settled = 0
+
+    def settle() -> None:
+        # Collect pending results in walk order; positions were taken before earlier results were inserted.
+        nonlocal settled
+        while deferred:
+            position, src_path, dst_paths, future = deferred.pop(0)
+            if state.cancel_token() and future.cancel():
+                continue
+            try:
+                info = future.result()
+                file_infos.insert(position + settled, info)
+                settled += 1
+                if state.dedupe:
+                    # Already on every destination, so it can't be a link itself, but later duplicates can be.
+                    state.remember(src_path, dst_paths, info)
+                if state.archive is not None:
+                    archive(src_path)
+            except _CopyCancelled:
+                continue
+            except CopyTreeError as err:
+                errors.extend(err.args[0])
+            except OSError as why:
+                errors.append(ErrorListEntry(src_path, dst_paths, str(why)))
 
     for src_path in sorted(source.glob("*"), key=lambda p: p.name):
         if state.cancel_token():
@@ -170,7 +576,13 @@ def copytree(
             continue
         dst_paths = [d / src_path.name for d in destinations]
         try:
+            defer = _is_deferred(src_path, dst_paths, skip_existing, state)
+            if (state.archive is not None or state.dedupe) and not defer:
+                settle()
             if src_path.is_dir():
+                if state.archive is not None:
+                    rel_path = src_path.resolve().relative_to(state.source_tree_root).as_posix()
+                    state.archive.add_directory(rel_path, src_path.stat())
                 file_infos += copytree(
                     src_path,
                     dst_paths,
@@ -179,17 +591,30 @@ def copytree(
                     skip_existing,
                     state=state,
                 )
-            else:
-                file_hash = verified_copy(
-                    src_path,
-                    dst_paths,
-                    overwrite,
-                    verify,
-                    skip_existing,
-                    state=state,
+            elif defer:
+                assert state.verify_executor is not None
+                args = (src_path, dst_paths, overwrite, verify, skip_existing, state, get_progress_queue())
+                deferred.append(
+                    (
+                        len(file_infos) - settled,
+                        src_path,
+                        dst_paths,
+                        state.verify_executor.submit(_deferred_file_info, *args),
+                    )
                 )
-                stat = src_path.stat()
-                file_infos.append(FileInfo(src_path, file_hash, stat.st_size, stat.st_mtime))
+            else:
+                info = _link_duplicate(src_path, dst_paths, verify, state) if state.dedupe else None
+                if info is None:
+                    info = _verified_file_info(
+                        src_path, dst_paths, overwrite, verify, skip_existing, state, archive=state.archive
+                    )
+                    if state.dedupe:
+                        state.remember(src_path, dst_paths, info)
+                if state.archive is not None:
+                    archive(src_path)
+                file_infos.append(info)
+        except _CopyCancelled:
+            break
 
         # Continue past per-file failures so one bad file doesn't abort the tree.
         except CopyTreeError as err:
@@ -197,21 +622,143 @@ def copytree(
         except OSError as why:
             errors.append(ErrorListEntry(src_path, dst_paths, str(why)))
 
+    settle()
+
     if errors:
         raise CopyTreeError(errors)
 
     return file_infos
 
 
+def _is_deferred(src_path: Path, dst_paths: list[Path], skip_existing: bool, state: _CopyState) -> bool:
+    return (
+        state.verify_executor is not None
+        and skip_existing
+        and not src_path.is_dir()
+        and all(p.exists() for i, p in enumerate(dst_paths) if i not in state.dropped)
+    )
+
+
+def _verified_file_info(
+    src_path: Path,
+    dst_paths: list[Path],
+    overwrite: bool,
+    verify: bool,
+    skip_existing: bool,
+    state: _CopyState,
+    archive: ArchiveWriter | None = None,
+) -> FileInfo:
+    extra_hashes = dict.fromkeys(state.extra_hash_formats, "")
+    file_hash = verified_copy(
+        src_path,
+        dst_paths,
+        overwrite,
+        verify,
+        skip_existing,
+        state=state,
+        extra_hashes=extra_hashes,
+        archive=archive,
+    )
+    stat = src_path.stat()
+    return FileInfo(
+        src_path,
+        file_hash,
+        stat.st_size,
+        stat.st_mtime,
+        state.hash_format,
+        {extra: digest for extra, digest in extra_hashes.items() if digest},
+    )
+
+
+def _deferred_file_info(
+    src_path: Path,
+    dst_paths: list[Path],
+    overwrite: bool,
+    verify: bool,
+    skip_existing: bool,
+    state: _CopyState,
+    progress_queue: Queue[ProgressUpdate] | None,
+) -> FileInfo:
+    # Pool threads may be shared with other jobs: report to, and read at the priority of, the submitting job.
+    with io_priority(state.io_class, state.io_level), progress_queue_of(progress_queue):
+        return _verified_file_info(src_path, dst_paths, overwrite, verify, skip_existing, state)
+
+
+def _link_duplicate(src_path: Path, dst_paths: list[Path], verify: bool, state: _CopyState) -> FileInfo | None:
+    """Recreate ``src_path`` from copies made earlier in the run, or return ``None`` to copy it as usual.
+
+    A hardlink of a copied file is hardlinked to its copies. With
+    ``state.dedupe == "content"``, a file with the size and digest of a copied
+    one is cloned from its copies (see :func:`ocopy.utils.clone_file`), which
+    costs one read of the source but no writes. Any destination that can't link
+    makes the file fall back to a regular copy, as does a destination that is
+    already there (the usual skip-existing rules apply then).
+    """
+    keep, dests, checkpoints, _ = state.healthy(dst_paths)
+    if not dests or any(d.exists() for d in dests):
+        return None
+    st = src_path.stat()
+    original = state.originals.get(("inode", st.st_dev, st.st_ino)) if st.st_nlink > 1 else None
+    link = os.link
+    if (
+        original is None
+        and st.st_size in state.original_sizes
+        and not state.no_clone.intersection(keep)
+        and state.dedupe == "content"
+    ):
+        throttle = state.bandwidth.for_read(src_path) if state.bandwidth is not None else None
+        digest = get_hash(src_path, hash_format=state.hash_format, limiter=state.device_limiter, throttle=throttle)
+        original = state.originals.get(("content", st.st_size, digest))
+        link = clone_file
+    if original is None:
+        return None
+
+    copies, info = original
+    made: list[Path] = []
+    for i in keep:
+        try:
+            link(copies[i], dst_paths[i])
+        except OSError:
+            if link is clone_file:
+                state.no_clone.add(i)
+            for path in made:
+                path.unlink()
+            return None
+        made.append(dst_paths[i])
+    if link is clone_file:
+        for path in made:
+            copystat(src_path, path)
+
+    rel_path = src_path.resolve().relative_to(state.source_tree_root.resolve()).as_posix()
+    if state.dropped:
+        state.note_lacking(rel_path)
+    if info.file_hash:
+        _record_checkpoints(
+            checkpoints, rel_path, st.st_size, st.st_mtime, info.file_hash, info.hash_format, info.extra_hashes
+        )
+    state.add_linked(len(made))
+    if progress_queue := get_progress_queue():
+        progress_queue.put(ProgressUpdate(ProgressPhase.COPY, src_path, st.st_size))
+        if verify:
+            progress_queue.put(ProgressUpdate(ProgressPhase.VERIFY, src_path, st.st_size))
+    return FileInfo(src_path, info.file_hash, st.st_size, st.st_mtime, info.hash_format, dict(info.extra_hashes))
+
+
 def _classify_destinations(
     destinations: list[Path],
     src_stat_fn: Callable[[], os.stat_result],
     overwrite: bool,
     skip_existing: bool,
     need_integrity: bool,
-) -> tuple[list[int], list[int], list[int], list[str]]:
+    hash_format: str = DEFAULT_HASH_FORMAT,
+    extra_hash_formats: tuple[str, ...] = (),
+) -> tuple[list[int], list[int], list[int], list[dict[str, str]]]:
     """Split destinations into ``(to_copy, to_verify, trusted, trusted_hashes)`` buckets.
 
+    A destination is only trusted when a digest is on record for ``hash_format``
+    and every extra format; ``trusted_hashes`` maps each of those formats to its
+    digest.
+
     ``src_stat_fn`` is a zero-arg callable so we don't ``stat()`` the source unless
     a destination actually exists and needs metadata comparison. Tests that mock
     the filesystem rely on this deferral; so does the general principle of not
@@ -223,7 +770,7 @@ def _classify_destinations(
     copy_idx: list[int] = []
     verify_idx: list[int] = []
     trusted_idx: list[int] = []
-    trusted_hashes: list[str] = []
+    trusted_hashes: list[dict[str, str]] = []
 
     for i, dest in enumerate(destinations):
         if not dest.exists():
@@ -246,7 +793,7 @@ def _classify_destinations(
         if not need_integrity:
             continue
 
-        existing = find_hash(dest)
+        existing = _trusted_digests(dest, (hash_format, *extra_hash_formats))
         if existing:
             trusted_hashes.append(existing)
             trusted_idx.append(i)
@@ -256,6 +803,17 @@ def _classify_destinations(
     return copy_idx, verify_idx, trusted_idx, trusted_hashes
 
 
+def _trusted_digests(dest: Path, hash_formats: tuple[str, ...]) -> dict[str, str] | None:
+    """Trusted digests of ``dest`` for every one of ``hash_formats``, or ``None`` if any is missing."""
+    digests = {}
+    for hash_format in hash_formats:
+        digest = find_hash(dest, hash_format)
+        if not digest:
+            return None
+        digests[hash_format] = digest
+    return digests
+
+
 def verified_copy(
     src_file: Path,
     destinations: list[Path],
@@ -264,9 +822,15 @@ def verified_copy(
     skip_existing: bool = False,
     *,
     state: _CopyState | None = None,
+    extra_hashes: dict[str, str] | None = None,
+    archive: ArchiveWriter | None = None,
 ) -> str:
     """Copy ``src_file`` to ``destinations`` with integrity guarantees.
 
+    Returns the ``state.hash_format`` digest; digests for ``extra_hashes`` keys
+    come from the same source read (or from trusted records) and are stored
+    under those keys.
+
     Behavior matrix (see the issue #9 plan for the rationale):
 
     - Destination missing -> copy into a ``.copy_in_progress`` temp, then rename.
@@ -274,11 +838,21 @@ def verified_copy(
     - Destination present + ``skip_existing`` + match + no trusted hash + integrity required -> re-hash.
     - Destination present + not matching -> ``FileExistsError`` unless ``overwrite`` is set.
     - Verification mismatch + ``overwrite`` -> repair once; second mismatch raises.
+
+    With ``state.isolate_destinations``, destinations dropped earlier in the run
+    are left out, and one that fails or stalls while this file is copied is
+    dropped while the others carry on.
+
+    Whenever the file is copied, its data is streamed into ``archive`` as well;
+    the member is taken out again if the copy or its verification fails.
     """
     if state is None:
         state = _default_state(src_file.parent.resolve(), verify)
 
     rel_path = src_file.resolve().relative_to(state.source_tree_root.resolve()).as_posix()
+    requested = destinations
+    if state.dropped:
+        state.note_lacking(rel_path)
 
     src_stat_cache: os.stat_result | None = None
 
@@ -290,12 +864,15 @@ def verified_copy(
 
     max_attempts = 2  # initial + at most one repair retry
     for attempt in range(max_attempts):
+        keep, destinations, checkpoints, block_stores = state.healthy(requested)
         copy_idx, verify_idx, trusted_idx, trusted_hashes = _classify_destinations(
             destinations,
             src_stat,
             overwrite=overwrite,
             skip_existing=skip_existing,
             need_integrity=state.need_integrity,
+            hash_format=state.hash_format,
+            extra_hash_formats=tuple(extra_hashes or ()),
         )
 
         # Nothing to copy and nothing to re-verify: either every destination is a
@@ -305,24 +882,77 @@ def verified_copy(
         # with empty buckets and returns the no-integrity marker.
         if not copy_idx and not verify_idx:
             if trusted_hashes:
-                if len(set(trusted_hashes)) > 1:
+                if len({hashes[state.hash_format] for hashes in trusted_hashes}) > 1:
                     raise VerificationError(f"Conflicting trusted hashes for {src_file}")
-                digest = trusted_hashes[0]
+                digest = trusted_hashes[0][state.hash_format]
+                if extra_hashes is not None:
+                    extra_hashes.update((extra, trusted_hashes[0][extra]) for extra in extra_hashes)
                 s = src_stat()
-                _record_checkpoints(state.checkpoints, rel_path, s.st_size, s.st_mtime, digest)
-                state.skipped_files += len(trusted_idx)
+                _record_checkpoints(
+                    checkpoints, rel_path, s.st_size, s.st_mtime, digest, state.hash_format, extra_hashes
+                )
+                state.add_skipped(len(trusted_idx))
                 return digest
-            state.skipped_files += len(destinations)
+            state.add_skipped(len(destinations))
             return ""
 
         tmps = [destinations[i].with_name(destinations[i].name + ".copy_in_progress") for i in copy_idx]
         copy_hash: str | None = None
+        copied_blocks = BlockHasher(state.block_size) if state.block_size and tmps else None
+        gone: set[int] = set()
+        member: MemberWriter | None = None
         if tmps:
+            targets = checkpoints if len(checkpoints) == len(destinations) else [None] * len(destinations)
+            in_progress = _in_progress_targets(tmps, [targets[i] for i in copy_idx], rel_path, src_stat)
+            dropped: dict[int, BaseException] | None = {} if state.isolate_destinations else None
+            member = archive.open_member(rel_path, src_stat()) if archive is not None else None
             try:
-                copy_hash = copy(src_file, tmps)
+                copy_hash = copy(
+                    src_file,
+                    tmps,
+                    in_progress=in_progress,
+                    cancel_token=state.cancel_token,
+                    block_hasher=copied_blocks,
+                    hash_format=state.hash_format,
+                    extra_hashes=extra_hashes,
+                    bandwidth=state.bandwidth,
+                    dropped=dropped,
+                    stall_timeout=state.stall_timeout,
+                    sparse=state.sparse,
+                    consumers=[member.write] if member is not None else [],
+                )
+                if member is not None:
+                    member.close()
+            except _CopyCancelled:
+                _discard_member(member)
+                # Keep the in-progress files: their durable prefix is recorded for the next run.
+                raise
+            except OSError:
+                _discard_member(member)
+                # Dropped destinations are not touched again: a stalled drive may not answer at all.
+                for j, err in (dropped or {}).items():
+                    state.drop(keep[copy_idx[j]], err, rel_path)
+                if dropped is None or len(dropped) < len(tmps):
+                    _cleanup_tmps([tmp for j, tmp in enumerate(tmps) if j not in (dropped or {})])
+                    raise
+                if len(copy_idx) == len(destinations):
+                    raise
+                # Every destination being copied to was dropped; the ones already present are still verified.
+                return verified_copy(
+                    src_file, requested, overwrite, verify, skip_existing, state=state, extra_hashes=extra_hashes
+                )
             except BaseException:
+                _discard_member(member)
                 _cleanup_tmps(tmps)
                 raise
+            if dropped:
+                for j, err in dropped.items():
+                    state.drop(keep[copy_idx[j]], err, rel_path)
+                gone = {copy_idx[j] for j in dropped}
+                tmps = [tmp for j, tmp in enumerate(tmps) if j not in dropped]
+                copy_idx = [i for i in copy_idx if i not in gone]
+                checkpoints = [cp for i, cp in enumerate(checkpoints) if i not in gone]
+                block_stores = [store for i, store in enumerate(block_stores) if i not in gone]
 
         # Build the verification pool lazily; trusted destinations are included whenever
         # we're already running a pool check so a lying manifest doesn't slip through.
@@ -337,17 +967,29 @@ def verified_copy(
                 _rename_tmps(tmps, [destinations[i] for i in copy_idx])
                 # Any destination that wasn't in ``copy_idx`` or ``verify_idx`` was a
                 # pure metadata-matched skip that never entered the classification lists.
-                state.skipped_files += len(destinations) - len(copy_idx)
+                state.add_skipped(len(destinations) - len(copy_idx) - len(gone))
                 return copy_hash
 
+            block_list = copied_blocks.finish() if copied_blocks is not None else None
             if need_pool_verify:
-                combined = multi_xxhash_check(pool)
+                # Extra digests already came from the copy pass unless nothing was copied.
+                verify_extras = None if tmps else extra_hashes
+                if state.block_size:
+                    repairable = [False] + [True] * len(tmps) + [overwrite] * (len(pool) - 1 - len(tmps))
+                    combined, block_list = _verify_blocks(
+                        pool, repairable, state, src_stat().st_size, block_list, verify_extras
+                    )
+                else:
+                    combined = multi_xxhash_check(
+                        pool, state.hash_format, verify_extras, state.device_limiter, state.bandwidth
+                    )
                 if combined == "hashes_do_not_match":
                     last_attempt = attempt == max_attempts - 1
                     if not overwrite or last_attempt:
                         raise VerificationError(f"Verification failed for {src_file}")
                     _cleanup_tmps(tmps)
-                    for dest in destinations:
+                    _discard_member(member)
+                    for dest in (d for i, d in enumerate(destinations) if i not in gone):
                         with contextlib.suppress(FileNotFoundError):
                             dest.unlink()
                     continue  # retry from classification
@@ -356,29 +998,108 @@ def verified_copy(
                 assert copy_hash is not None
                 digest = copy_hash
 
-            present_hash = find_hash(src_file)
+            present_hash = find_hash(src_file, state.hash_format)
             if present_hash and present_hash != digest:
                 raise VerificationError(
-                    f"Verification failed for {src_file}. xxHash present on source medium is not correct"
+                    f"Verification failed for {src_file}. {state.hash_format} present on source medium is not correct"
                 )
 
             _rename_tmps(tmps, [destinations[i] for i in copy_idx])
             s = src_stat()
-            _record_checkpoints(state.checkpoints, rel_path, s.st_size, s.st_mtime, digest)
+            _record_checkpoints(checkpoints, rel_path, s.st_size, s.st_mtime, digest, state.hash_format, extra_hashes)
+            if block_list is not None and state.block_size:
+                for store in block_stores:
+                    store.record(rel_path, s.st_size, s.st_mtime, state.block_size, block_list)
             # ``verify_idx`` destinations were present already and did not receive new bytes,
             # so they count as skipped (just with a paid-for verification read).
-            state.skipped_files += len(verify_idx) + len(trusted_idx)
+            state.add_skipped(len(verify_idx) + len(trusted_idx))
             return digest
         except BaseException:
+            _discard_member(member)
             _cleanup_tmps(tmps)
             raise
 
     raise AssertionError("unreachable: verified_copy retry loop exited without returning")
 
 
-def _record_checkpoints(checkpoints: list[Checkpoint], rel_path: str, size: int, mtime: float, digest: str) -> None:
+def _in_progress_targets(
+    tmps: list[Path],
+    checkpoints: list[Checkpoint | None],
+    rel_path: str,
+    src_stat_fn: Callable[[], os.stat_result],
+) -> list[_InProgress]:
+    """Pair each in-progress file with its resume offset and a recorder for new durable offsets.
+
+    The checkpoint is only parsed when an in-progress file is actually on disk, so
+    regular (non-resumed) copies don't re-read a growing checkpoint per file.
+    """
+    targets: list[_InProgress] = []
+    for tmp, cp in zip(tmps, checkpoints, strict=True):
+        if cp is None:
+            targets.append(_InProgress())
+            continue
+        s = src_stat_fn()
+        resume_from = 0
+        with contextlib.suppress(FileNotFoundError):
+            tmp_size = tmp.stat().st_size
+            resume_from = min(cp.partial_offset(rel_path, s.st_size, s.st_mtime), tmp_size)
+        targets.append(_InProgress(resume_from, partial(cp.record_partial, rel_path, s.st_size, s.st_mtime)))
+    return targets
+
+
+def _verify_blocks(
+    pool: list[Path],
+    repairable: list[bool],
+    state: _CopyState,
+    size: int,
+    copied_blocks: list[str] | None,
+    extra_hashes: dict[str, str] | None = None,
+) -> tuple[str, list[str] | None]:
+    """Block-aware :func:`multi_xxhash_check`: repair damaged blocks in place instead of failing the file.
+
+    ``pool[0]`` is the source. A pool member that disagrees with it gets only its
+    mismatching blocks rewritten and re-verified, provided it is ``repairable``
+    (our own in-progress files always are, pre-existing destinations only with
+    ``overwrite``) and the source read back the same as while it was copied.
+    Anything else returns ``"hashes_do_not_match"`` so the caller falls back to
+    the whole-file behavior.
+    """
+    assert state.block_size is not None
+    digests, blocks = multi_block_check(
+        pool, state.block_size, state.hash_format, extra_hashes, state.device_limiter, state.bandwidth
+    )
+    reference = blocks[0]
+    if len(set(digests)) == 1:
+        return digests[0], reference
+
+    damaged = {j: mismatched_blocks(reference, blocks[j]) for j in range(1, len(pool)) if digests[j] != digests[0]}
+    if (copied_blocks is not None and copied_blocks != reference) or not all(repairable[j] for j in damaged):
+        return "hashes_do_not_match", None
+    for j, indices in damaged.items():
+        if not repair_blocks(pool[0], pool[j], indices, reference, size, state.block_size):
+            return "hashes_do_not_match", None
+        # copy() set the source's timestamps before verification; the repair's writes bumped them again.
+        copystat(pool[0], pool[j])
+        state.add_repaired(len(indices))
+    return digests[0], reference
+
+
+def _record_checkpoints(
+    checkpoints: list[Checkpoint],
+    rel_path: str,
+    size: int,
+    mtime: float,
+    digest: str,
+    hash_format: str,
+    extra_hashes: dict[str, str] | None,
+) -> None:
     for cp in checkpoints:
-        cp.record(rel_path, size, mtime, digest)
+        cp.record(rel_path, size, mtime, digest, hash_format, extra_hashes)
+
+
+def _discard_member(member: MemberWriter | None) -> None:
+    if member is not None:
+        member.discard()
 
 
 def _cleanup_tmps(tmps: list[Path]) -> None:
@@ -388,8 +1109,25 @@ def _cleanup_tmps(tmps: list[Path]) -> None:
 
 
 def _rename_tmps(tmps: list[Path], final_paths: list[Path]) -> None:
-    for tmp, final in zip(tmps, final_paths, strict=True):
-        tmp.rename(final)
+    with span("copy.rename"):
+        for tmp, final in zip(tmps, final_paths, strict=True):
+            tmp.rename(final)
+
+
+def _check_dedupe(dedupe: str | None) -> None:
+    if dedupe is not None and dedupe not in DEDUPE_MODES:
+        raise ValueError(f"Unsupported dedupe mode {dedupe!r}, expected one of {', '.join(DEDUPE_MODES)}")
+
+
+def _check_hash_format(hash_format: str, extra_hash_formats: Sequence[str], legacy_mhl: bool) -> None:
+    """Reject unknown formats and ones legacy MHL can't hold before any destination is touched."""
+    for fmt in (hash_format, *extra_hash_formats):
+        new_hasher(fmt)
+    if legacy_mhl and hash_format != "xxh64":
+        raise ValueError(f"Legacy MHL files only support xxh64, not {hash_format}")
+    unsupported = [fmt for fmt in extra_hash_formats if legacy_mhl and fmt not in LEGACY_MHL_HASH_ELEMENTS]
+    if unsupported:
+        raise ValueError(f"Legacy MHL files can't hold {', '.join(unsupported)} digests")
 
 
 def copy_and_seal(
@@ -401,14 +1139,72 @@ def copy_and_seal(
     mhl: bool = True,
     legacy_mhl: bool = False,
     cancel_token: CancelToken | None = None,
+    block_size: int | None = None,
+    hash_format: str = DEFAULT_HASH_FORMAT,
+    extra_hash_formats: Sequence[str] = (),
+    verify_workers: int = VERIFY_WORKERS,
+    readers_per_device: int | None = None,
+    bandwidth_limit: float | None = None,
+    destination_bandwidth_limits: Mapping[Path, float] | None = None,
+    io_class: str | None = None,
+    io_level: int | None = None,
+    isolate_destinations: bool = False,
+    stall_timeout: float | None = STALL_TIMEOUT,
+    verify_executor: ThreadPoolExecutor | None = None,
+    device_limiter: DeviceLimiter | None = None,
+    sparse: bool = False,
+    dedupe: str | None = None,
+    archive: Path | None = None,
 ) -> CopyResult:
     """Copy ``source`` into each destination and (optionally) seal an ASC MHL.
 
     The returned :class:`CopyResult` exposes ``skipped_files``, ``cancelled``, and
     ``checkpoint_paths`` so callers don't need to poke at thread attributes.
+    ``block_size`` enables per-block digests (see :mod:`ocopy.block_hash`) so a
+    verification mismatch only rewrites the damaged blocks.
+    ``hash_format`` selects the file digest (see :mod:`ocopy.hash_formats`);
+    legacy MHL files can only hold ``xxh64``, so other formats raise ``ValueError``
+    together with ``legacy_mhl``. ``extra_hash_formats`` (e.g. ``md5``, ``sha1``,
+    ``c4``) are computed in the same read pass and recorded in the manifests too.
+    With ``skip_existing``, up to ``verify_workers`` files that are already on
+    every destination are verified at once; reads are capped per device (see
+    :mod:`ocopy.devices`, ``readers_per_device`` overrides the automatic limit).
+    Jobs running side by side can share a ``verify_executor`` and a
+    ``device_limiter`` instead, so the caps hold across all of them.
+    ``bandwidth_limit`` caps everything the job reads and
+    ``destination_bandwidth_limits`` what it writes to and reads back from each
+    of ``destinations``, in bytes per second (see
+    :class:`ocopy.throttle.BandwidthLimits`). ``io_class`` / ``io_level`` set the
+    Linux I/O priority of the job's threads and of its tasks on a shared
+    ``verify_executor`` (see :mod:`ocopy.io_priority`).
     Raises :class:`CopyTreeError` if any file failed to copy; in that case the
     caller is expected to consult the exception's error list.
+
+    With ``isolate_destinations``, a destination whose writes fail, or that takes
+    no data for ``stall_timeout`` seconds, is dropped for the rest of the run
+    instead of holding the others back. The remaining destinations are copied and
+    sealed as usual, then :class:`DestinationsDropped` is raised; its ``result``
+    lists the files each dropped destination lacks.
+
+    With ``sparse``, holes in source files (e.g. preallocated clip files or VM
+    images) are neither read nor written but recreated as holes on filesystems
+    that support them; the digests are the same as for a full copy.
+
+    ``dedupe`` (one of :data:`DEDUPE_MODES`) copies the data of hardlinked
+    source files once and hardlinks them on the destinations as well; with
+    ``"content"``, files with the same size and digest as a copied file are
+    cloned from it where the destination filesystem supports reflinks. The
+    manifests still list every path; ``linked_files`` counts the links made.
+
+    ``archive`` names a tar file that receives a copy of the tree in the same
+    pass (see :mod:`ocopy.archive`); its xxh64 ends up in ``archive_xxh64``.
     """
+    _check_hash_format(hash_format, extra_hash_formats, mhl and legacy_mhl)
+    _check_dedupe(dedupe)
+    if io_class is not None:
+        check_io_priority(io_class, io_level)
+    if archive is not None and not destinations:
+        raise ValueError("An archive is written alongside directory destinations; give at least one")
     token = cancel_token or _never_cancelled
 
     dest_roots = [d / source.name for d in destinations]
@@ -421,41 +1217,120 @@ def copy_and_seal(
         checkpoints=checkpoints,
         source_tree_root=source.resolve(),
         need_integrity=mhl or verify,
+        block_size=block_size,
+        block_stores=[BlockStore(root) for root in dest_roots] if block_size else [],
+        hash_format=hash_format,
+        extra_hash_formats=tuple(dict.fromkeys(fmt for fmt in extra_hash_formats if fmt != hash_format)),
+        device_limiter=device_limiter or DeviceLimiter(readers_per_device),
+        isolate_destinations=isolate_destinations,
+        stall_timeout=stall_timeout,
+        sparse=sparse,
+        dedupe=dedupe,
+        io_class=io_class,
+        io_level=io_level,
     )
+    if bandwidth_limit or destination_bandwidth_limits:
+        state.bandwidth = BandwidthLimits(bandwidth_limit, destination_bandwidth_limits)
+    if archive is not None:
+        from ocopy.archive import ArchiveWriter
+
+        state.archive = ArchiveWriter(archive, source.name)
+
+    try:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(io_priority(io_class, io_level))
+            if verify_executor is not None:
+                state.verify_executor = verify_executor
+            elif verify_workers > 1:
+                state.verify_executor = stack.enter_context(
+                    ThreadPoolExecutor(max_workers=verify_workers, thread_name_prefix="ocopy-verify")
+                )
+            try:
+                file_infos = copytree(
+                    source,
+                    dest_roots,
+                    overwrite=overwrite,
+                    verify=verify,
+                    skip_existing=skip_existing,
+                    state=state,
+                )
+            except CopyTreeError as err:
+                err.args[0].extend(_dropped_errors(source, destinations, state))
+                raise
 
-    file_infos = copytree(
-        source,
-        dest_roots,
-        overwrite=overwrite,
-        verify=verify,
-        skip_existing=skip_existing,
-        state=state,
-    )
+        result = CopyResult(
+            file_infos=file_infos,
+            skipped_files=state.skipped_files,
+            checkpoint_paths=[cp.path for cp in checkpoints],
+            repaired_blocks=state.repaired_blocks,
+            dropped_destinations={destinations[i]: files for i, files in sorted(state.lacking.items())},
+            linked_files=state.linked_files,
+        )
 
-    result = CopyResult(
-        file_infos=file_infos,
-        skipped_files=state.skipped_files,
-        checkpoint_paths=[cp.path for cp in checkpoints],
-    )
+        if token():
+            result.cancelled = True
+            return result
+
+        if state.dropped:
+            # Dropped destinations are not touched again; their checkpoints stay for a later run.
+            dest_roots = [root for i, root in enumerate(dest_roots) if i not in state.dropped]
+            checkpoints = [cp for i, cp in enumerate(checkpoints) if i not in state.dropped]
+            if not dest_roots:
+                raise DestinationsDropped(_dropped_errors(source, destinations, state), result)
+
+        if mhl:
+            # Imported per flavor: mhllib and lxml are only loaded by runs that write that manifest.
+            if legacy_mhl:
+                from ocopy.mhl import write_mhl
+
+                start = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+                with span("seal.legacy_mhl"):
+                    write_mhl(dest_roots, file_infos, source, start)
+            else:
+                from ocopy.ascmhl_seal import ASCMHLSealError, seal_ascmhl_destinations
 
-    if token():
-        result.cancelled = True
-        return result
+                try:
+                    with span("seal.ascmhl"):
+                        seal_ascmhl_destinations(dest_roots, source, file_infos)
+                except ASCMHLSealError as err:
+                    raise CopyTreeError([ErrorListEntry(source, dest_roots, str(err))]) from err
+
+        if state.archive is not None:
+            from ocopy.archive import ArchiveError
 
-    if mhl:
-        if legacy_mhl:
-            start = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
-            write_mhl(dest_roots, file_infos, source, start)
-        else:
             try:
-                seal_ascmhl_destinations(dest_roots, source, file_infos)
-            except ASCMHLSealError as err:
-                raise CopyTreeError([ErrorListEntry(source, dest_roots, str(err))]) from err
+                result.archive_xxh64 = state.archive.finish()
+            except ArchiveError as err:
+                raise CopyTreeError([ErrorListEntry(source, [state.archive.path], str(err))]) from err
 
-    for cp in checkpoints:
-        cp.clear()
+        for cp in checkpoints:
+            cp.clear()
 
-    return result
+        if state.dropped:
+            raise DestinationsDropped(_dropped_errors(source, destinations, state), result)
+        return result
+
+    finally:
+        # Only a finished archive is kept; a partial one can't be resumed.
+        if state.archive is not None:
+            state.archive.abort()
+
+
+def _dropped_errors(source: Path, destinations: list[Path], state: _CopyState) -> list[ErrorListEntry]:
+    """One entry per dropped destination with the reason and the files it lacks."""
+    errors = []
+    for i, reason in sorted(state.dropped.items()):
+        lacking = state.lacking[i]
+        listed = "\n".join(lacking[:20]) + (f"\n... and {len(lacking) - 20} more" if len(lacking) > 20 else "")
+        errors.append(
+            ErrorListEntry(
+                source,
+                [destinations[i]],
+                f"{destinations[i]} was dropped for the rest of the job: {reason}\n"
+                f"It lacks {len(lacking)} file{'s' if len(lacking) != 1 else ''}" + (f":\n{listed}" if lacking else ""),
+            )
+        )
+    return errors
 
 
 class CopyJob(Thread):
@@ -476,11 +1351,38 @@ class CopyJob(Thread):
         legacy_mhl: bool = False,
         auto_start: bool = True,
         cancel_token: CancelToken | None = None,
+        block_size: int | None = None,
+        hash_format: str = DEFAULT_HASH_FORMAT,
+        extra_hash_formats: Sequence[str] = (),
+        verify_workers: int = VERIFY_WORKERS,
+        readers_per_device: int | None = None,
+        bandwidth_limit: float | None = None,
+        destination_bandwidth_limits: Mapping[Path, float] | None = None,
+        io_class: str | None = None,
+        io_level: int | None = None,
+        isolate_destinations: bool = False,
+        stall_timeout: float | None = STALL_TIMEOUT,
+        progress_changed: Condition | None = None,
+        verify_executor: ThreadPoolExecutor | None = None,
+        device_limiter: DeviceLimiter | None = None,
+        sparse: bool = False,
+        dedupe: str | None = None,
+        archive: Path | None = None,
     ):
+        _check_hash_format(hash_format, extra_hash_formats, mhl and legacy_mhl)
+        _check_dedupe(dedupe)
+        if io_class is not None:
+            check_io_priority(io_class, io_level)
         super().__init__()
         self.daemon = True
         self.errors = []
-        self._progress_queue: Queue[ProgressUpdate] = Queue()
+        # ``None`` is the end-of-run sentinel that lets the reader exit without polling.
+        self._progress_queue: Queue[ProgressUpdate | None] = Queue()
+        # Notified on every ``total_done`` change and once more on completion, so
+        # :attr:`progress` and :meth:`wait` block on real events instead of sleeping.
+        # A batch passes one condition to all its jobs to follow them together.
+        self._progress_changed = progress_changed if progress_changed is not None else Condition()
+        self._done = Event()
         self._cancel = Event()
         # Allow tests and library users to inject a custom cancellation signal
         # (e.g. a counter-based token that fires mid-tree). Production code uses
@@ -494,6 +1396,22 @@ class CopyJob(Thread):
         self.skip_existing = skip_existing
         self.mhl = mhl
         self.legacy_mhl = legacy_mhl
+        self.block_size = block_size
+        self.hash_format = hash_format
+        self.extra_hash_formats = tuple(extra_hash_formats)
+        self.verify_workers = verify_workers
+        self.readers_per_device = readers_per_device
+        self.bandwidth_limit = bandwidth_limit
+        self.destination_bandwidth_limits = destination_bandwidth_limits
+        self.io_class = io_class
+        self.io_level = io_level
+        self.isolate_destinations = isolate_destinations
+        self.stall_timeout = stall_timeout
+        self.verify_executor = verify_executor
+        self.device_limiter = device_limiter
+        self.sparse = sparse
+        self.dedupe = dedupe
+        self.archive = archive
 
         # Pre-compute checkpoint paths so CLI cancel reporting works even before
         # the run thread has had a chance to create the files on disk.
@@ -513,6 +1431,10 @@ class CopyJob(Thread):
     def cancel(self) -> None:
         self._cancel.set()
 
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the job has finished; returns ``False`` if ``timeout`` expired first."""
+        return self._done.wait(timeout)
+
     @property
     def cancelled(self) -> bool:
         return self._cancel.is_set()
@@ -529,6 +1451,18 @@ class CopyJob(Thread):
     def skipped_files(self) -> int:
         return self.result.skipped_files
 
+    @property
+    def repaired_blocks(self) -> int:
+        return self.result.repaired_blocks
+
+    @property
+    def linked_files(self) -> int:
+        return self.result.linked_files
+
+    @property
+    def archive_xxh64(self) -> str | None:
+        return self.result.archive_xxh64
+
     @property
     def checkpoint_paths(self) -> list[Path]:
         return self.result.checkpoint_paths
@@ -536,21 +1470,20 @@ class CopyJob(Thread):
     @threaded
     def _progress_reader(self):
         while True:
-            try:
-                update = self._progress_queue.get(timeout=0.5)
-            except Empty:
-                if self.finished or self.cancelled:
-                    break
-                continue
+            update = self._progress_queue.get()
+            if update is None:
+                break
             name = update.path.name
             if name.endswith(".copy_in_progress"):
                 name = name.removesuffix(".copy_in_progress")
-            self.current_item = name
-            if update.phase == ProgressPhase.VERIFY:
-                denom = max(1, update.parallel_verify_readers)
-                self.total_done += update.nbytes / denom
-            else:
-                self.total_done += update.nbytes
+            with self._progress_changed:
+                self.current_item = name
+                if update.phase == ProgressPhase.VERIFY:
+                    denom = max(1, update.parallel_verify_readers)
+                    self.total_done += update.nbytes / denom
+                else:
+                    self.total_done += update.nbytes
+                self._progress_changed.notify_all()
 
     @property
     def percent_done(self) -> int:
@@ -565,12 +1498,14 @@ class CopyJob(Thread):
     @property
     def progress(self) -> Iterator[str | None]:
         for i in range(1, 101):
-            while self.percent_done < i:
-                sleep(0.1)
+            with self._progress_changed:
+                self._progress_changed.wait_for(lambda i=i: self.percent_done >= i)
             yield self.current_item
 
     def run(self):
-        self._progress_reader()
+        # Jobs of a batch may be created long before they are started.
+        self._start_time = time.time()
+        reader = self._progress_reader()
 
         try:
             try:
@@ -582,10 +1517,39 @@ class CopyJob(Thread):
                     skip_existing=self.skip_existing,
                     mhl=self.mhl,
                     legacy_mhl=self.legacy_mhl,
+                    block_size=self.block_size,
+                    hash_format=self.hash_format,
+                    extra_hash_formats=self.extra_hash_formats,
+                    verify_workers=self.verify_workers,
+                    readers_per_device=self.readers_per_device,
+                    bandwidth_limit=self.bandwidth_limit,
+                    destination_bandwidth_limits=self.destination_bandwidth_limits,
+                    io_class=self.io_class,
+                    io_level=self.io_level,
+                    isolate_destinations=self.isolate_destinations,
+                    stall_timeout=self.stall_timeout,
+                    verify_executor=self.verify_executor,
+                    device_limiter=self.device_limiter,
+                    sparse=self.sparse,
+                    dedupe=self.dedupe,
+                    archive=self.archive,
                     cancel_token=self._cancel_token,
                 )
+            except DestinationsDropped as e:
+                self.result = e.result
+                self.errors = e.args[0]
             except CopyTreeError as e:
                 self.errors = e.args[0]
+            except Exception as e:
+                # E.g. a destination root that is a file. Without an error entry the job would look complete.
+                logger.exception(f"Copying {self.source} failed")
+                self.errors = [ErrorListEntry(self.source, self.destinations, str(e) or type(e).__name__)]
         finally:
-            self.finished = True
-            self.total_done = float(self.todo_size)
+            # Drain the reader first so late updates can't push ``total_done`` past 100 %.
+            self._progress_queue.put(None)
+            reader.join()
+            with self._progress_changed:
+                self.finished = True
+                self.total_done = float(self.todo_size)
+                self._progress_changed.notify_all()
+            self._done.set()
@@ -5,14 +5,23 @@ import pytest
 
 @pytest.fixture(autouse=True)
 def _clear_hash_caches():
+    from ocopy.cli.update import _INSTALLER_CACHE
     from ocopy.hash import _cached_load_ascmhl
     from ocopy.mhl import _cached_load_mhl_index
 
     for fn in (_cached_load_ascmhl, _cached_load_mhl_index):
         fn.cache_clear()
+    _INSTALLER_CACHE.clear()
     yield
 
 
+@pytest.fixture(autouse=True)
+def _isolated_update_cache(tmp_path, monkeypatch):
+    """Keep the on-disk update check cache per test (and out of the real home directory)."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
+    monkeypatch.delenv("OCOPY_NO_UPDATE_CHECK", raising=False)
+
+
 @pytest.fixture
 def card(tmp_path):
     src_dir = tmp_path / "src"
@@ -0,0 +1,139 @@
+"""Tar archive destinations (``--archive``)."""
+
+from __future__ import annotations
+
+import json
+import os
+import tarfile
+
+import pytest
+import xxhash
+from click.testing import CliRunner
+
+from ocopy.archive import ArchiveWriter
+from ocopy.cli.ocopy import cli
+from ocopy.verified_copy import copy_and_seal
+
+
+@pytest.fixture
+def card(tmp_path):
+    src = tmp_path / "A001"
+    (src / "CLIPS").mkdir(parents=True)
+    (src / "CLIPS" / "clip.mov").write_bytes(os.urandom(3 * 1024 * 1024 + 7))
+    (src / "CLIPS" / "clip.xml").write_bytes(b"<clip/>")
+    (src / "empty").mkdir()
+    return src
+
+
+def check_archive(path, card):
+    manifest = json.loads(path.with_name(path.name + ".json").read_text())
+    data = path.read_bytes()
+    assert manifest["xxh64"] == xxhash.xxh64(data).hexdigest()
+    assert manifest["size"] == len(data) and len(data) % tarfile.RECORDSIZE == 0
+    for member in manifest["members"]:
+        content = data[member["offset"] : member["offset"] + member["size"]]
+        assert member["xxh64"] == xxhash.xxh64(content).hexdigest()
+
+    with tarfile.open(path) as tar:
+        names = tar.getnames()
+        assert "A001/empty" in names
+        for rel in ("CLIPS/clip.mov", "CLIPS/clip.xml"):
+            member = tar.getmember(f"A001/{rel}")
+            extracted = tar.extractfile(member)
+            assert extracted is not None and extracted.read() == (card / rel).read_bytes()
+            assert member.mtime == pytest.approx((card / rel).stat().st_mtime)
+    return manifest
+
+
+def test_archive_is_written_in_the_copy_pass(tmp_path, card, mocker):
+    dst = tmp_path / "raid"
+    dst.mkdir()
+    archive = tmp_path / "A001.tar"
+    add_file = mocker.spy(ArchiveWriter, "add_file")
+
+    result = copy_and_seal(card, [dst], archive=archive)
+
+    # Every file came out of the copy's own read of the source.
+    assert add_file.call_count == 0
+    manifest = check_archive(archive, card)
+    assert result.archive_xxh64 == manifest["xxh64"]
+    by_name = {member["name"]: member["xxh64"] for member in manifest["members"]}
+    assert {f"A001/{info.source.relative_to(card).as_posix()}": info.file_hash for info in result.file_infos} == by_name
+    assert (dst / "A001" / "CLIPS" / "clip.mov").read_bytes() == (card / "CLIPS" / "clip.mov").read_bytes()
+    assert not list(tmp_path.glob("*.copy_in_progress"))
+
+
+def test_skipped_files_are_read_into_the_archive(tmp_path, card):
+    dst = tmp_path / "raid"
+    dst.mkdir()
+    copy_and_seal(card, [dst])
+
+    archive = tmp_path / "A001.tar"
+    result = copy_and_seal(card, [dst], skip_existing=True, archive=archive)
+
+    assert result.skipped_files == 2
+    check_archive(archive, card)
+
+
+def test_resumed_archive_keeps_the_walk_order(tmp_path):
+    src = tmp_path / "A001"
+    src.mkdir()
+    for name in ("a.mov", "b.mov", "d.mov", "e.mov"):
+        (src / name).write_bytes(os.urandom(64 * 1024))
+    dst = tmp_path / "raid"
+    dst.mkdir()
+    copy_and_seal(src, [dst])
+    (src / "c.mov").write_bytes(os.urandom(64 * 1024))
+    (src / "f").mkdir()
+    (src / "f" / "g.mov").write_bytes(b"g")
+
+    archive = tmp_path / "A001.tar"
+    result = copy_and_seal(src, [dst], skip_existing=True, archive=archive, verify_workers=4)
+
+    assert result.skipped_files == 4
+    walk = ["A001/a.mov", "A001/b.mov", "A001/c.mov", "A001/d.mov", "A001/e.mov", "A001/f", "A001/f/g.mov"]
+    with tarfile.open(archive) as tar:
+        assert tar.getnames() == walk
+    assert [f"A001/{info.source.relative_to(src).as_posix()}" for info in result.file_infos] == [
+        name for name in walk if name != "A001/f"
+    ]
+
+
+def test_cancelled_copy_leaves_no_archive(tmp_path, card):
+    dst = tmp_path / "raid"
+    dst.mkdir()
+    archive = tmp_path / "A001.tar"
+
+    result = copy_and_seal(card, [dst], archive=archive, cancel_token=lambda: True)
+
+    assert result.cancelled
+    assert not list(tmp_path.glob("A001.tar*"))
+
+
+def test_discarded_member_leaves_no_trace(tmp_path, card):
+    clip = card / "CLIPS" / "clip.xml"
+    with_retry, plain = ArchiveWriter(tmp_path / "a.tar", "A001"), ArchiveWriter(tmp_path / "b.tar", "A001")
+
+    member = with_retry.open_member("CLIPS/clip.xml", clip.stat())
+    member.write(b"<clip")
+    member.discard()
+    assert "CLIPS/clip.xml" not in with_retry
+    for writer in (with_retry, plain):
+        writer.add_file("CLIPS/clip.xml", clip)
+
+    assert with_retry.finish() == plain.finish()
+    assert (tmp_path / "a.tar").read_bytes() == (tmp_path / "b.tar").read_bytes()
+
+
+def test_archive_cli(tmp_path, card):
+    dst = tmp_path / "raid"
+    dst.mkdir()
+    archive = tmp_path / "A001.tar"
+
+    result = CliRunner().invoke(cli, ["--archive", str(archive), "--no-update-check", str(card), str(dst)])
+    assert result.exit_code == 0, result.output
+    assert f"Archive {archive} written" in result.output
+    check_archive(archive, card)
+
+    result = CliRunner().invoke(cli, ["--archive", str(archive), str(card)])
+    assert result.exit_code == 2 and "give at least one" in result.output
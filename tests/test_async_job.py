@@ -0,0 +1,93 @@
+"""``AsyncCopyJob``: following copies from an asyncio event loop."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from ocopy.async_job import AsyncCopyJob, CopyFinished, CopyProgress
+
+
+def _card(tmp_path, name="A001", size=300_000):
+    src = tmp_path / name
+    src.mkdir()
+    for i in range(3):
+        (src / f"C00{i}.mov").write_bytes(bytes([i]) * size)
+    return src
+
+
+def test_events_and_result(tmp_path):
+    src = _card(tmp_path)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+
+    async def main():
+        events = []
+        async with AsyncCopyJob(src, [dst], mhl=False) as job:
+            async for event in job.events():
+                events.append(event)
+        return job, events, await job
+
+    job, events, result = asyncio.run(main())
+
+    assert isinstance(events[-1], CopyFinished) and not events[-1].errors and not events[-1].cancelled
+    progress = [event.percent_done for event in events if isinstance(event, CopyProgress)]
+    assert progress == sorted(progress) and progress[-1] <= 100
+    assert len(result.file_infos) == 3 and job.result is result and job.percent_done == 100
+    assert (dst / "A001" / "C002.mov").read_bytes() == bytes([2]) * 300_000
+
+
+def test_many_jobs_on_one_loop(tmp_path):
+    sources = [_card(tmp_path, f"A{i:03d}", 1000) for i in range(20)]
+    dst = tmp_path / "dst"
+    dst.mkdir()
+
+    async def main():
+        jobs = [AsyncCopyJob(src, [dst], mhl=False) for src in sources]
+        for job in jobs:
+            job.start()
+        return await asyncio.gather(*jobs)
+
+    results = asyncio.run(main())
+    assert [len(result.file_infos) for result in results] == [3] * 20
+
+
+def test_cancel(tmp_path):
+    src = _card(tmp_path)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+
+    async def cancel_job():
+        job = AsyncCopyJob(src, [dst], mhl=False)
+        job.start()
+        job.cancel()
+        return await job
+
+    assert asyncio.run(cancel_job()).cancelled
+
+    async def cancel_waiting_task():
+        job = AsyncCopyJob(src, [dst], mhl=False)
+        job.start()
+        task = asyncio.ensure_future(job.wait())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return job, await job
+
+    job, result = asyncio.run(cancel_waiting_task())
+    assert job.cancelled and result.cancelled
+
+
+def test_failure_is_raised(tmp_path):
+    src = _card(tmp_path)
+
+    async def main():
+        async with AsyncCopyJob(src, [tmp_path], hash_format="crc32") as job:
+            async for event in job.events():
+                assert isinstance(event, CopyFinished) and "crc32" in event.errors[0].error_message
+            await job
+
+    with pytest.raises(ValueError, match="crc32"):
+        asyncio.run(main())
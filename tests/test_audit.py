@@ -0,0 +1,152 @@
+"""``ocopy verify``: re-verifying existing copies against their MHL histories."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+from ascmhl.history import MHLHistory
+from click.testing import CliRunner
+
+from ocopy.audit import AuditBudget, AuditError, AuditState, audit_destination
+from ocopy.cli.ocopy import cli
+from ocopy.throttle import Throttle
+from ocopy.verified_copy import copy_and_seal
+
+pytest.importorskip("ascmhl")
+
+
+@pytest.fixture
+def copied(tmp_path):
+    src = tmp_path / "A001"
+    (src / "CLIPS").mkdir(parents=True)
+    for i in range(3):
+        (src / "CLIPS" / f"C00{i}.mov").write_bytes(os.urandom(50_000))
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    return src, dst
+
+
+def test_audit_reports_missing_altered_and_new(copied):
+    src, dst = copied
+    copy_and_seal(src, [dst], hash_format="xxh128")
+    root = dst / "A001"
+    (root / "CLIPS" / "C000.mov").unlink()
+    with open(root / "CLIPS" / "C001.mov", "r+b") as f:
+        f.write(b"bitrot")
+    (root / "CLIPS" / "C003.mov").write_bytes(b"new")
+
+    report = audit_destination(root, workers=2)
+
+    assert report.history == "ascmhl"
+    assert report.missing == ["CLIPS/C000.mov"]
+    assert report.altered == ["CLIPS/C001.mov"]
+    assert report.new == ["CLIPS/C003.mov"]
+    assert [(f.rel_path, f.hash_format) for f in report.verified] == [("CLIPS/C002.mov", "xxh128")]
+    assert not report.ok
+
+    result = CliRunner().invoke(cli, ["verify", "--seal", str(root)])
+    assert result.exit_code == 1
+    assert "Altered" in result.output
+    assert len(MHLHistory.load_from_path(str(root)).hash_lists) == 1
+
+
+def test_audit_lists_leftovers_of_a_cancelled_copy_apart(copied):
+    src, dst = copied
+    copy_and_seal(src, [dst])
+    root = dst / "A001"
+    (root / "CLIPS" / "C003.mov.copy_in_progress").write_bytes(b"partial")
+
+    report = audit_destination(root)
+
+    assert report.ok and not report.new
+    assert report.in_progress == ["CLIPS/C003.mov.copy_in_progress"]
+    result = CliRunner().invoke(cli, ["verify", str(root)])
+    assert result.exit_code == 0
+    assert "In progress (left by a cancelled copy)" in result.output and "New (not in history)" not in result.output
+
+
+def test_verify_seal_appends_verified_generation(copied):
+    src, dst = copied
+    copy_and_seal(src, [dst])
+    root = dst / "A001"
+
+    result = CliRunner().invoke(cli, ["verify", "--seal", "--readers-per-device", "1", str(root)])
+
+    assert result.exit_code == 0, result.output
+    assert "all 3 recorded files verified" in result.output
+    history = MHLHistory.load_from_path(str(root))
+    assert len(history.hash_lists) == 2
+    media_hash = history.hash_lists[-1].find_media_hash_for_path("CLIPS/C001.mov")
+    assert media_hash is not None
+    assert [(e.hash_format, e.action) for e in media_hash.hash_entries] == [("xxh64", "verified")]
+
+
+def test_audit_legacy_mhl(copied):
+    src, dst = copied
+    copy_and_seal(src, [dst], legacy_mhl=True)
+    root = dst / "A001"
+
+    report = audit_destination(root)
+
+    assert report.history == "mhl"
+    assert report.ok and len(report.verified) == 3 and not report.new
+
+
+def test_audit_requires_history(tmp_path):
+    with pytest.raises(AuditError, match="no ASC MHL history"):
+        audit_destination(tmp_path)
+    result = CliRunner().invoke(cli, ["verify", str(tmp_path)])
+    assert result.exit_code == 1
+
+
+def test_audit_in_resumable_slices(copied, tmp_path):
+    src, dst = copied
+    copy_and_seal(src, [dst])
+    root = dst / "A001"
+    state = AuditState(root)
+
+    slices = []
+    for _ in range(3):
+        report = audit_destination(root, workers=1, state=state, budget=AuditBudget(max_bytes=1))
+        slices.append([f.rel_path for f in report.verified])
+        assert report.ok
+        assert report.complete == (not state.path.exists())
+
+    assert slices == [["CLIPS/C000.mov"], ["CLIPS/C001.mov"], ["CLIPS/C002.mov"]]
+    assert len(report.previously_verified) == 2 and report.complete
+
+    # A file that changed since an earlier slice verified it is checked again.
+    audit_destination(root, workers=1, state=state, budget=AuditBudget(max_bytes=1))
+    with open(root / "CLIPS" / "C000.mov", "r+b") as f:
+        f.write(b"bitrot")
+    os.utime(root / "CLIPS" / "C000.mov", (0, 0))
+    report = audit_destination(root, state=state)
+    assert report.altered == ["CLIPS/C000.mov"]
+
+    report_path = tmp_path / "audit.jsonl"
+    result = CliRunner().invoke(
+        cli, ["verify", "--slice-gb", "0.000001", "--max-bandwidth", "1000", "--report", str(report_path), str(root)]
+    )
+    assert result.exit_code == 1
+    [line] = [json.loads(line) for line in report_path.read_text().splitlines()]
+    assert line["altered"] == ["CLIPS/C000.mov"] and line["remaining"] == 2 and not line["complete"]
+
+
+def test_throttle_caps_bandwidth_and_iops(mocker):
+    sleep = mocker.patch("ocopy.throttle.time.sleep")
+    throttle = Throttle(bytes_per_second=1000, burst=0)
+    for _ in range(5):
+        throttle.consume(100)
+    assert max(call.args[0] for call in sleep.call_args_list) == pytest.approx(0.5, abs=0.05)
+
+    sleep.reset_mock()
+    throttle = Throttle(ops_per_second=10, burst=0)
+    for _ in range(5):
+        throttle.consume(1)
+    assert max(call.args[0] for call in sleep.call_args_list) == pytest.approx(0.5, abs=0.05)
+
+    sleep.reset_mock()
+    Throttle().consume(10**12)
+    sleep.assert_not_called()
@@ -5,7 +5,8 @@ from tempfile import TemporaryDirectory
 
 import pytest
 
-from ocopy.backup_check import get_missing
+from ocopy.backup_check import check_destinations, get_missing
+from ocopy.file_info import FileInfo
 
 
 @pytest.fixture()
@@ -85,3 +86,39 @@ def test_destination_ascmhl_folder_ignored(tmp_path):
     ascmhl.mkdir()
     (ascmhl / "gen.mhl").write_bytes(b"fake manifest")
     assert get_missing(str(card), str(backup)) == ([], 4)
+
+
+def test_check_destinations_reports_each_destination(data, tmp_path):
+    """Missing files and in-progress temps are collected per destination, in input order."""
+    card, _backup, backup_destination = data
+    second = tmp_path / "SECOND" / card.name
+    shutil.copytree(card, second)
+    (second / "A001C003_XXXX_XXXX.mov").rename(second / "A001C003_XXXX_XXXX.mov.copy_in_progress")
+
+    reports = check_destinations(card, [backup_destination, second])
+
+    assert [r.destination for r in reports] == [backup_destination, second]
+    assert reports[0].missing == []
+    assert reports[0].in_progress == []
+    assert reports[1].missing == ["A001C003_XXXX_XXXX.mov"]
+    assert reports[1].in_progress == [second / "A001C003_XXXX_XXXX.mov.copy_in_progress"]
+
+
+def test_check_destinations_against_copy_plan_is_path_aware(tmp_path):
+    """Same-named clips in different folders must not mask each other in the plan-based check."""
+    src = tmp_path / "card"
+    for day in ("DAY1", "DAY2"):
+        (src / day).mkdir(parents=True)
+        (src / day / "A001C001.mov").write_bytes(b"x" * 10)
+    dst = tmp_path / "dst" / "card"
+    shutil.copytree(src, dst)
+    (dst / "DAY2" / "A001C001.mov").unlink()
+    (dst / "DAY2" / "A001C001.mov.copy_in_progress").write_bytes(b"x")
+
+    plan = [FileInfo(p, "", p.stat().st_size, p.stat().st_mtime) for p in sorted(src.rglob("*.mov"))]
+    [report] = check_destinations(src, [dst], plan)
+
+    assert report.missing == ["DAY2/A001C001.mov"]
+    assert report.in_progress == [dst / "DAY2" / "A001C001.mov.copy_in_progress"]
+    # The signature-based deep check can't tell the two clips apart.
+    assert check_destinations(src, [dst])[0].missing == []
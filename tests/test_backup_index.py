@@ -0,0 +1,85 @@
+"""Persistent archive index used by ``ocopy backup-check``."""
+
+from __future__ import annotations
+
+import os
+import shutil
+
+import pytest
+
+from ocopy.ascmhl_seal import seal_ascmhl_at_destination
+from ocopy.backup_index import BackupIndex
+from ocopy.verified_copy import copytree
+
+
+@pytest.fixture
+def shoot(tmp_path):
+    """Two shoot days whose cards reuse the same clip names with different sizes."""
+    archive = tmp_path / "ARCHIVE"
+    cards = {}
+    for day, size in (("DAY1", 10), ("DAY2", 20)):
+        card = tmp_path / day / "A001XXXX"
+        (card / "CLIPS").mkdir(parents=True)
+        for i in range(1, 4):
+            (card / "CLIPS" / f"A001C00{i}.mov").write_bytes(b"x" * size * i)
+        shutil.copytree(card, archive / day / "A001XXXX")
+        cards[day] = card
+    return archive, cards
+
+
+def test_find_backups_is_path_and_size_aware(shoot):
+    archive, cards = shoot
+    with BackupIndex(archive) as index:
+        stats = index.update()
+        assert stats.scanned == 6
+        assert stats.added == 6
+
+        [match] = [m for m in index.find_backups(cards["DAY2"]) if m.complete]
+        assert match.root == "DAY2/A001XXXX"
+        assert match.matched == 3
+
+
+def test_find_backups_reports_missing_at_closest_match(shoot):
+    archive, cards = shoot
+    (archive / "DAY1" / "A001XXXX" / "CLIPS" / "A001C002.mov").unlink()
+    with BackupIndex(archive) as index:
+        index.update()
+        best = index.find_backups(cards["DAY1"])[0]
+
+    assert best.root == "DAY1/A001XXXX"
+    assert best.missing == ["CLIPS/A001C002.mov"]
+
+
+def test_update_is_incremental(shoot):
+    archive, _ = shoot
+    with BackupIndex(archive) as index:
+        index.update()
+        assert index.update().added == index.update().changed == 0
+
+        clip = archive / "DAY1" / "A001XXXX" / "CLIPS" / "A001C001.mov"
+        clip.write_bytes(b"changed")
+        (archive / "DAY2" / "A001XXXX" / "CLIPS" / "A001C003.mov").unlink()
+        stats = index.update()
+        assert (stats.added, stats.changed, stats.removed) == (0, 1, 1)
+        assert len(index) == 5
+
+    # The index persists next to the archive and is reopened without a rescan.
+    with BackupIndex(archive) as index:
+        assert len(index) == 5
+
+
+def test_index_reads_xxh64_from_ascmhl(tmp_path):
+    card = tmp_path / "A001XXXX"
+    card.mkdir()
+    (card / "clip.mov").write_bytes(os.urandom(256))
+    archive = tmp_path / "ARCHIVE"
+    root = archive / "2024" / card.name
+    infos = copytree(card, [root])
+    seal_ascmhl_at_destination(root, card, infos)
+
+    with BackupIndex(archive) as index:
+        assert index.update().hashes == 1
+        [match] = index.find_backups(card)
+        assert match.complete
+        assert match.with_xxh64 == 1
+        assert index.update().hashes == 0, "an unchanged history is not re-read"
@@ -0,0 +1,96 @@
+"""``ocopy batch``: several cards to the same destinations, scheduled per device."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from click.testing import CliRunner
+
+from ocopy import verified_copy
+from ocopy.batch import BatchJob
+from ocopy.cli.ocopy import cli
+
+
+def _cards(tmp_path, count):
+    cards = []
+    for i in range(count):
+        card = tmp_path / "cards" / f"A00{i}" / f"A00{i}"
+        (card / "CLIPS").mkdir(parents=True)
+        (card / "CLIPS" / "C001.mov").write_bytes(bytes([i]) * 10_000)
+        cards.append(card)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    return cards, dst
+
+
+def test_batch_limits_concurrent_jobs_per_device(tmp_path, mocker):
+    cards, dst = _cards(tmp_path, 5)
+    # Cards 0 and 1 share a reader; the others each have their own.
+    devices = {cards[0]: 10, cards[1]: 10, cards[2]: 11, cards[3]: 12, cards[4]: 13, dst: 20}
+    mocker.patch("ocopy.batch.device_of", side_effect=lambda path: devices[path])
+
+    lock = threading.Lock()
+    active: list[str] = []
+    overlaps: list[list[str]] = []
+    real_copy_and_seal = verified_copy.copy_and_seal
+
+    def tracking_copy_and_seal(source, *args, **kwargs):
+        with lock:
+            active.append(source.name)
+            overlaps.append(sorted(active))
+        time.sleep(0.05)
+        try:
+            return real_copy_and_seal(source, *args, **kwargs)
+        finally:
+            with lock:
+                active.remove(source.name)
+
+    mocker.patch("ocopy.verified_copy.copy_and_seal", side_effect=tracking_copy_and_seal)
+
+    batch = BatchJob(cards, [dst], writers_per_destination_device=2, mhl=False)
+    assert batch.wait(timeout=60)
+
+    assert max(len(running) for running in overlaps) == 2
+    assert not any({"A000", "A001"} <= set(running) for running in overlaps)
+    assert not batch.errors and batch.percent_done == 100
+    assert [job.verified_files_count for job in batch.jobs] == [1] * 5
+    assert (dst / "A004" / "CLIPS" / "C001.mov").read_bytes() == bytes([4]) * 10_000
+
+
+def test_batch_cli(tmp_path):
+    cards, dst = _cards(tmp_path, 2)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["batch", "-d", str(dst), *map(str, cards)])
+
+    assert result.exit_code == 0, result.output
+    assert f"{cards[1]}: 1 file(s) copied" in result.output
+    assert (dst / "A000" / "ascmhl").is_dir() and (dst / "A001" / "CLIPS" / "C001.mov").exists()
+
+    clash = tmp_path / "other" / "A000"
+    clash.mkdir(parents=True)
+    result = runner.invoke(cli, ["batch", "-d", str(dst), str(cards[0]), str(clash)])
+    assert result.exit_code == 2 and "same folder: A000" in result.output
+
+
+def test_batch_cli_fails_for_crashed_or_incomplete_jobs(tmp_path, mocker):
+    cards, dst = _cards(tmp_path, 2)
+    # A000's copy root is a file, so its job dies before copying anything.
+    (dst / "A000").write_text("in the way")
+
+    result = CliRunner().invoke(cli, ["batch", "-d", str(dst), *map(str, cards)])
+
+    assert result.exit_code == 1
+    assert f"{cards[0]}: 1 error(s)" in result.output
+    assert f"{cards[1]}: 1 file(s) copied" in result.output
+
+    (dst / "A000").unlink()
+    real_copytree = verified_copy.copytree
+    mocker.patch.object(
+        verified_copy, "copytree", side_effect=lambda *args, **kwargs: real_copytree(*args, **kwargs)[:0]
+    )
+    result = CliRunner().invoke(cli, ["batch", "-d", str(dst), str(cards[0])])
+
+    assert result.exit_code == 1
+    assert f"{cards[0]}: only 0 of 1 file(s) copied" in result.output
@@ -0,0 +1,119 @@
+"""Per-block digests: localized repair of verification mismatches."""
+
+import json
+import os
+from shutil import copystat
+
+import pytest
+import xxhash
+
+import ocopy.verified_copy as vc
+from ocopy.block_hash import BlockHasher, BlockStore, mismatched_blocks
+from ocopy.hash import get_hash
+from ocopy.verified_copy import CopyTreeError, copy_and_seal
+
+BLOCK = 64 * 1024
+
+
+def _damage(path, offset):
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+
+def test_block_hasher_splits_unaligned_chunks():
+    data = os.urandom(10_000)
+    hasher = BlockHasher(block_size=4096)
+    for start in range(0, len(data), 3000):
+        hasher.update(data[start : start + 3000])
+
+    expected = [xxhash.xxh3_128(data[i : i + 4096]).hexdigest() for i in range(0, len(data), 4096)]
+    assert hasher.finish() == expected
+    assert mismatched_blocks(expected, [*expected[:1], "x"]) == [1, 2]
+
+
+def test_damaged_copy_is_repaired_block_by_block(tmp_path, mocker):
+    src = tmp_path / "src"
+    src.mkdir()
+    clip = src / "clip.mov"
+    clip.write_bytes(os.urandom(4 * BLOCK + 123))
+    d1, d2 = tmp_path / "d1", tmp_path / "d2"
+    d1.mkdir()
+    d2.mkdir()
+
+    real_copy = vc.copy
+
+    def flaky_copy(src_file, destinations, *args, **kwargs):
+        digest = real_copy(src_file, destinations, *args, **kwargs)
+        _damage(destinations[1], 2 * BLOCK + 7)
+        return digest
+
+    mocker.patch.object(vc, "copy", side_effect=flaky_copy)
+    repair = mocker.spy(vc, "repair_blocks")
+
+    result = copy_and_seal(src, [d1, d2], block_size=BLOCK)
+
+    assert result.repaired_blocks == 1
+    assert repair.call_args.args[2] == [2], "only the damaged block may be rewritten"
+    for d in (d1, d2):
+        assert (d / "src" / "clip.mov").read_bytes() == clip.read_bytes()
+    assert [fi.file_hash for fi in result.file_infos] == [get_hash(clip)]
+
+    st = clip.stat()
+    lines = (d2 / "src" / BlockStore.FILENAME).read_text().splitlines()
+    recorded = json.loads(lines[-1])
+    assert (recorded["rel_path"], recorded["size"], recorded["mtime"]) == ("clip.mov", st.st_size, st.st_mtime)
+    assert recorded["block_size"] == BLOCK
+    assert len(recorded["blocks"]) == 5
+
+
+def test_repaired_copy_keeps_source_mtime(tmp_path, mocker):
+    src = tmp_path / "src"
+    src.mkdir()
+    clip = src / "clip.mov"
+    clip.write_bytes(os.urandom(3 * BLOCK + 5))
+    os.utime(clip, (1_000_000_000, 1_000_000_000))
+    dst = tmp_path / "dst"
+    dst.mkdir()
+
+    real_copy = vc.copy
+
+    def flaky_copy(src_file, destinations, *args, **kwargs):
+        digest = real_copy(src_file, destinations, *args, **kwargs)
+        _damage(destinations[0], BLOCK + 3)
+        return digest
+
+    mocker.patch.object(vc, "copy", side_effect=flaky_copy)
+    result = copy_and_seal(src, [dst], block_size=BLOCK)
+    assert result.repaired_blocks == 1
+    assert (dst / "src" / "clip.mov").stat().st_mtime == clip.stat().st_mtime
+    mocker.stopall()
+
+    again = copy_and_seal(src, [dst], skip_existing=True, block_size=BLOCK)
+    assert again.skipped_files == 1 and again.repaired_blocks == 0
+
+
+@pytest.mark.parametrize("overwrite", [False, True])
+def test_damaged_existing_destination_needs_overwrite(tmp_path, overwrite):
+    """Pre-existing destination files are only rewritten (block-wise) when overwriting is allowed."""
+    src = tmp_path / "src"
+    src.mkdir()
+    clip = src / "clip.mov"
+    clip.write_bytes(os.urandom(3 * BLOCK))
+    dest_parent = tmp_path / "d1"
+    existing = dest_parent / "src" / "clip.mov"
+    existing.parent.mkdir(parents=True)
+    existing.write_bytes(clip.read_bytes())
+    _damage(existing, BLOCK + 1)
+    copystat(clip, existing)
+
+    if not overwrite:
+        with pytest.raises(CopyTreeError, match="Verification failed"):
+            copy_and_seal(src, [dest_parent], skip_existing=True, block_size=BLOCK)
+        return
+
+    result = copy_and_seal(src, [dest_parent], skip_existing=True, overwrite=True, block_size=BLOCK)
+    assert result.repaired_blocks == 1
+    assert existing.read_bytes() == clip.read_bytes()
@@ -15,6 +15,19 @@ def test_checkpoint_roundtrip(tmp_path):
     assert cp.lookup("foo/bar.txt", 12, 9999.0) is None
 
 
+def test_checkpoint_partial_records(tmp_path):
+    """Partial (in-progress) records never satisfy a digest lookup; the latest offset wins."""
+    cp = Checkpoint(tmp_path / "dest_root")
+    cp.ensure_exists()
+    cp.record_partial("clip.mov", 3000, 1234.0, 1000)
+    cp.record_partial("clip.mov", 3000, 1234.0, 2000)
+
+    assert cp.lookup("clip.mov", 3000, 1234.0) is None
+    assert cp.partial_offset("clip.mov", 3000, 1234.0) == 2000
+    assert cp.partial_offset("clip.mov", 3000, 9999.0) == 0
+    assert cp.partial_offset("clip.mov", 4000, 1234.0) == 0
+
+
 def test_checkpoint_truncated_last_record_ignored(tmp_path):
     """A partially-written final JSON line must be skipped without losing earlier records."""
     root = tmp_path / "r"
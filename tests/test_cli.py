@@ -1,3 +1,4 @@
+import json
 import re
 from io import BytesIO
 from pathlib import Path
@@ -10,6 +11,7 @@ import requests_mock
 from click.testing import CliRunner
 
 from ocopy.cli.ocopy import cli
+from ocopy.tracing import get_tracer
 
 
 @pytest.fixture(autouse=True)
@@ -43,6 +45,58 @@ def test_copy(card):
     assert "in progress" not in result.output
 
 
+def test_copy_source_named_like_a_subcommand(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "batch").mkdir()
+    (tmp_path / "batch" / "clip.mov").write_bytes(b"X" * 42)
+    (tmp_path / "dst").mkdir()
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["batch", "dst"])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "dst" / "batch" / "clip.mov").read_bytes() == b"X" * 42
+
+
+def test_copy_deep_check(card):
+    src_dir, destinations = card
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--deep-check", src_dir.as_posix(), *[d.as_posix() for d in destinations]])
+    assert result.exit_code == 0
+    assert "missing" not in result.output
+    assert "in progress" not in result.output
+
+
+def test_copy_job_crash_fails_the_run(card):
+    src_dir, destinations = card
+    # The copy root on a destination is a file: creating its checkpoint fails before any file is copied.
+    (destinations[0] / src_dir.name).write_text("in the way")
+
+    result = CliRunner().invoke(cli, [src_dir.as_posix(), *[d.as_posix() for d in destinations]])
+
+    assert result.exit_code == 1
+    assert "missing on" in result.output
+    assert f"Failed to copy {src_dir.name}" in result.output
+
+
+def test_profile_report(tmp_path, card):
+    src_dir, destinations = card
+    report_path = tmp_path / "profile.json"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli, ["--profile-report", report_path.as_posix(), src_dir.as_posix(), *[d.as_posix() for d in destinations]]
+    )
+    assert result.exit_code == 0
+
+    report = json.loads(report_path.read_text())
+    assert report["run"]["source"] == src_dir.as_posix()
+    for stage in ("copy.file", "copy.read", "copy.write", "verify", "checkpoint.record", "seal.ascmhl"):
+        assert report["stages"][stage]["count"] > 0, stage
+    assert report["stages"]["copy.file"]["count"] == 8
+    assert get_tracer() is None
+
+
 def test_skip(tmp_path, card):
     _, destinations = card
 
@@ -249,6 +303,9 @@ class _FakeCancelledJob:
     def join(self, timeout=None):
         return None
 
+    def wait(self, timeout=None):
+        return True
+
     @property
     def percent_done(self) -> int:
         return min(100, self._pct)
@@ -295,6 +352,30 @@ def test_cancel_machine_readable(tmp_path, mocker):
     assert "dst2" in summary
 
 
+def test_ctrl_c_cancels_job(tmp_path, mocker):
+    """Ctrl-C during the progress loop cancels the job gracefully instead of killing it mid-file."""
+    cancelled = []
+
+    class _InterruptedJob(_FakeCancelledJob):
+        @property
+        def progress(self):
+            yield self.current_item
+            raise KeyboardInterrupt
+
+        def cancel(self):
+            cancelled.append(True)
+
+    src = tmp_path / "src"
+    src.mkdir()
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    mocker.patch("ocopy.cli.ocopy.CopyJob", _InterruptedJob)
+    result = CliRunner().invoke(cli, [src.as_posix(), dst.as_posix()])
+    assert cancelled == [True]
+    assert result.exit_code == 3
+    assert "Cancelled." in result.output
+
+
 def test_cancel_end_to_end(tmp_path, mocker):
     """A real CopyJob cancelled before start must exit 3 with proper JSON output."""
     from ocopy.verified_copy import CopyJob as RealCopyJob
@@ -331,3 +412,33 @@ def test_update(card):
     result = runner.invoke(cli, [src_dir.as_posix(), *[d.as_posix() for d in destinations]])
     assert result.exit_code == 0
     assert "update" in result.output
+
+
+def test_backup_check(card, tmp_path):
+    src_dir, destinations = card
+
+    runner = CliRunner()
+    assert runner.invoke(cli, [src_dir.as_posix(), destinations[0].as_posix()]).exit_code == 0
+
+    result = runner.invoke(cli, ["backup-check", src_dir.as_posix(), destinations[0].as_posix()])
+    assert result.exit_code == 0
+    assert "is backed up at" in result.output
+
+    next((destinations[0] / "src").rglob("*.mov")).unlink()
+    result = runner.invoke(cli, ["backup-check", src_dir.as_posix(), destinations[0].as_posix()])
+    assert result.exit_code == 1
+    assert "1 file missing" in result.output
+
+    result = runner.invoke(cli, ["backup-check", src_dir.as_posix(), destinations[1].as_posix()])
+    assert result.exit_code == 1
+    assert "No file" in result.output
+
+
+def test_no_update_check(card, github):
+    src_dir, destinations = card
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--no-update-check", src_dir.as_posix(), *[d.as_posix() for d in destinations]])
+    assert result.exit_code == 0
+    assert "Please update" not in result.output
+    assert github.call_count == 0
@@ -333,13 +333,13 @@ def test_copy_job_finishes_while_source_tree_grows(tmp_path, mocker):
 
     real_copy = vc.copy
 
-    def gated_copy(src_file, destinations, chunk_size=1024 * 1024):
+    def gated_copy(src_file, destinations, chunk_size=1024 * 1024, **kwargs):
         if src_file == big_file:
             copy_started.set()
             growth_observed["ok"] = sub_added_after_copy_started.wait(timeout=5) and root_added_after_copy_started.wait(
                 timeout=5
             )
-        return real_copy(src_file, destinations, chunk_size)
+        return real_copy(src_file, destinations, chunk_size, **kwargs)
 
     mocker.patch("ocopy.verified_copy.copy", side_effect=gated_copy)
 
@@ -545,6 +545,8 @@ def test_copy_job_progress(card):
         pass
 
     assert progress == 100
+    # 100 % is reached before the rename/seal steps; don't leak the job thread into the next test.
+    assert job.wait(timeout=10)
 
 
 def test_copy_job_verification_error(card, mocker):
@@ -0,0 +1,155 @@
+"""``ocopy serve``: the job queue and its HTTP API."""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from ocopy.daemon import JobRequestError, JobServer, default_queue_file, make_server
+
+
+@pytest.fixture
+def card(tmp_path):
+    src = tmp_path / "A001"
+    (src / "CLIPS").mkdir(parents=True)
+    for i in range(3):
+        (src / "CLIPS" / f"C00{i}.mov").write_bytes(bytes([i]) * 20_000)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    return src, dst
+
+
+@pytest.fixture
+def api(tmp_path):
+    jobs = JobServer(tmp_path / "queue.json")
+    server = make_server(jobs, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def request(method, path, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        req = urllib.request.Request(server.url + path, data=data, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as err:
+            return err.code, json.loads(err.read())
+
+    yield request
+    server.shutdown()
+    server.server_close()
+    jobs.close()
+
+
+def test_submit_and_follow_a_job(api, card):
+    src, dst = card
+
+    status, job = api("POST", "/jobs", {"source": str(src), "destinations": [str(dst)], "options": {"mhl": False}})
+    assert status == 201 and job["state"] in ("queued", "running")
+
+    while job["state"] in ("queued", "running"):
+        status, job = api("GET", f"/jobs/{job['id']}/progress?after={job['percent_done']}&timeout=5")
+        assert status == 200
+
+    assert job["state"] == "done" and job["percent_done"] == 100 and job["files_verified"] == 3
+    assert (dst / "A001" / "CLIPS" / "C002.mov").read_bytes() == bytes([2]) * 20_000
+    assert [j["id"] for j in api("GET", "/jobs")[1]] == [job["id"]]
+
+
+def test_api_errors(api, card, tmp_path):
+    src, dst = card
+
+    status, body = api("POST", "/jobs", {"source": str(src), "destinations": [str(dst)], "options": {"speed": 1}})
+    assert status == 400 and "Unknown option 'speed'" in body["error"]
+    status, body = api("POST", "/jobs", {"source": str(tmp_path / "nope"), "destinations": [str(dst)]})
+    assert status == 400 and "is not a directory" in body["error"]
+    status, body = api(
+        "POST", "/jobs", {"source": str(src), "destinations": [str(dst)], "options": {"hash_format": "crc"}}
+    )
+    assert status == 400
+    assert api("GET", "/jobs/unknown")[0] == 404
+    assert api("DELETE", "/jobs/unknown")[0] == 404
+    assert api("GET", "/nothing")[0] == 404
+
+
+def test_crashed_job_is_reported_as_failed(api, card):
+    src, dst = card
+    # The job can't even create its checkpoint in a copy root that is a file.
+    (dst / "A001").write_text("in the way")
+
+    status, job = api("POST", "/jobs", {"source": str(src), "destinations": [str(dst)]})
+    assert status == 201
+    while job["state"] in ("queued", "running"):
+        status, job = api("GET", f"/jobs/{job['id']}/progress?after={job['percent_done']}&timeout=5")
+
+    assert job["state"] == "failed"
+    assert len(job["errors"]) == 1 and job["errors"][0].startswith("A001: ")
+
+
+def test_browser_requests_are_refused(api, card):
+    src, dst = card
+    job = {"source": str(src), "destinations": [str(dst)]}
+
+    # A form post or fetch() with text/plain needs no CORS preflight.
+    status, body = api("POST", "/jobs", job, headers={"Content-Type": "text/plain"})
+    assert status == 415 and "application/json" in body["error"]
+    # A page that rebound its own DNS name to 127.0.0.1 still sends that name.
+    status, body = api("POST", "/jobs", job, headers={"Host": "attacker.example:8765"})
+    assert status == 403 and "Host" in body["error"]
+    assert api("GET", "/jobs", headers={"Host": "attacker.example:8765"})[0] == 403
+    assert api("GET", "/jobs")[1] == []
+
+
+def test_queue_survives_restart_and_cancel(card, tmp_path):
+    src, dst = card
+    queue_file = tmp_path / "queue.json"
+
+    jobs = JobServer(queue_file, auto_start=False)
+    kept = jobs.submit(src, [dst], {"mhl": False})
+    dropped = jobs.submit(src, [dst], {"mhl": False})
+    assert jobs.cancel(dropped.id).state == "cancelled"
+    with pytest.raises(JobRequestError, match="wrong type"):
+        jobs.submit(src, [dst], {"verify": "yes"})
+    jobs.close()
+
+    jobs = JobServer(queue_file)
+    try:
+        assert jobs.wait_for_progress(kept.id, 100, timeout=30).state == "done"
+        assert jobs.get(dropped.id).state == "cancelled"
+    finally:
+        jobs.close()
+    assert {job["id"]: job["state"] for job in json.loads(queue_file.read_text())} == {
+        kept.id: "done",
+        dropped.id: "cancelled",
+    }
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+def test_unix_socket(tmp_path):
+    jobs = JobServer(None, auto_start=False)
+    path = tmp_path / "ocopy.sock"
+    server = make_server(jobs, socket_path=path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(path))
+            client.sendall(b"GET /jobs HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+    finally:
+        server.shutdown()
+        server.server_close()
+        jobs.close()
+    assert response.startswith(b"HTTP/1.0 200") and response.endswith(b"[]")
+
+
+def test_default_queue_file_is_kept_in_the_state_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))
+    assert default_queue_file() == tmp_path / "state" / "ocopy" / "daemon-queue.json"
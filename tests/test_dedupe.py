@@ -0,0 +1,133 @@
+"""Copying hardlinked and duplicate source files once (``--dedupe``)."""
+
+from __future__ import annotations
+
+import os
+import shutil
+
+import pytest
+from click.testing import CliRunner
+
+from ocopy import verified_copy
+from ocopy.cli.ocopy import cli
+from ocopy.hash import get_hash
+from ocopy.verified_copy import copy_and_seal
+
+
+@pytest.fixture
+def card(tmp_path):
+    src = tmp_path / "card"
+    (src / "A").mkdir(parents=True)
+    (src / "B").mkdir()
+    (src / "A" / "clip.mov").write_bytes(os.urandom(300_000))
+    try:
+        os.link(src / "A" / "clip.mov", src / "B" / "clip.mov")
+    except OSError:
+        pytest.skip("the filesystem doesn't support hardlinks")
+    (src / "A" / "sidecar.xml").write_bytes(b"<clip/>" * 100)
+    (src / "B" / "sidecar.xml").write_bytes(b"<clip/>" * 100)
+    return src
+
+
+def destinations(tmp_path):
+    paths = [tmp_path / "raid", tmp_path / "shuttle"]
+    for path in paths:
+        path.mkdir()
+    return paths
+
+
+def test_hardlinks_are_linked_on_destinations(tmp_path, card, mocker):
+    dests = destinations(tmp_path)
+    spy = mocker.spy(verified_copy, "copy")
+
+    result = copy_and_seal(card, dests, dedupe="hardlinks")
+
+    # The hardlinked clip is copied once; the identical sidecars are not hardlinks.
+    assert spy.call_count == 3
+    assert result.linked_files == 2
+    digest = get_hash(card / "A" / "clip.mov")
+    assert {info.source.relative_to(card).as_posix(): info.file_hash for info in result.file_infos}[
+        "B/clip.mov"
+    ] == digest
+    for dest in dests:
+        first, second = dest / "card" / "A" / "clip.mov", dest / "card" / "B" / "clip.mov"
+        assert second.stat().st_ino == first.stat().st_ino
+        assert get_hash(second) == digest
+        manifest = next((dest / "card" / "ascmhl").glob("*.mhl")).read_text()
+        assert "A/clip.mov" in manifest and "B/clip.mov" in manifest
+
+    # The linked file was checkpointed like any other, so a rerun skips it.
+    again = copy_and_seal(card, dests, skip_existing=True, dedupe="hardlinks")
+    assert again.skipped_files == 8 and again.linked_files == 0
+
+
+def test_resumed_run_links_to_files_already_copied(tmp_path, card):
+    dests = destinations(tmp_path)
+    copy_and_seal(card, dests, dedupe="hardlinks")
+    for dest in dests:
+        (dest / "card" / "B" / "clip.mov").unlink()
+
+    # With several verify workers, files that are already there are verified off the walk.
+    result = copy_and_seal(card, dests, skip_existing=True, dedupe="hardlinks", verify_workers=2)
+
+    assert result.linked_files == 2
+    for dest in dests:
+        first, second = dest / "card" / "A" / "clip.mov", dest / "card" / "B" / "clip.mov"
+        assert second.stat().st_ino == first.stat().st_ino
+
+
+def test_resumed_run_links_to_files_already_copied_in_the_same_directory(tmp_path):
+    src = tmp_path / "card"
+    src.mkdir()
+    (src / "a.mov").write_bytes(os.urandom(300_000))
+    try:
+        os.link(src / "a.mov", src / "b.mov")
+    except OSError:
+        pytest.skip("the filesystem doesn't support hardlinks")
+    dests = destinations(tmp_path)
+    copy_and_seal(src, dests, dedupe="hardlinks")
+    for dest in dests:
+        (dest / "card" / "b.mov").unlink()
+
+    result = copy_and_seal(src, dests, skip_existing=True, dedupe="hardlinks", verify_workers=2)
+
+    assert result.linked_files == 2
+    for dest in dests:
+        assert (dest / "card" / "b.mov").stat().st_ino == (dest / "card" / "a.mov").stat().st_ino
+
+
+def test_identical_content_is_cloned(tmp_path, card, mocker):
+    dests = destinations(tmp_path)
+    clone = mocker.patch.object(verified_copy, "clone_file", side_effect=shutil.copyfile)
+
+    result = copy_and_seal(card, dests, dedupe="content")
+
+    assert clone.call_count == 2
+    assert result.linked_files == 4
+    for dest in dests:
+        assert (dest / "card" / "B" / "sidecar.xml").read_bytes() == b"<clip/>" * 100
+
+
+def test_falls_back_to_copying_when_cloning_fails(tmp_path, card, mocker):
+    dests = destinations(tmp_path)
+    clone = mocker.patch.object(verified_copy, "clone_file", side_effect=OSError("not supported"))
+
+    result = copy_and_seal(card, dests, dedupe="content")
+
+    # After the first failure the destination isn't asked to clone again.
+    assert clone.call_count == 1
+    assert result.linked_files == 2
+    for dest in dests:
+        assert (dest / "card" / "B" / "sidecar.xml").read_bytes() == b"<clip/>" * 100
+        assert not list((dest / "card").glob("**/*.copy_in_progress"))
+
+
+def test_dedupe_cli(tmp_path, card):
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    result = CliRunner().invoke(cli, ["--dedupe", "hardlinks", "--no-update-check", str(card), str(dst)])
+    assert result.exit_code == 0, result.output
+    assert "Linked 1 duplicate file" in result.output
+
+    with pytest.raises(ValueError, match="Unsupported dedupe mode"):
+        copy_and_seal(card, [dst], dedupe="inodes")
@@ -6,11 +6,13 @@ unavailable while a ``CopyJob`` is running. The failure must surface on
 
 Originally motivated by https://github.com/ottomatic-io/ocopy/issues/15.
 
-Two tests live here:
+The tests here:
 
 1. A fast mocked test that raises ``OSError(ENODEV)`` on destination writes. This
    covers the portable "drive errors out" variant and is the actual regression guard.
-2. A macOS-only empirical probe that creates a real disk image, lets ``hdiutil``
+2. The same failure, and a destination that stops taking data, with
+   ``--isolate-failing-destinations``: the other destination must still get everything.
+3. A macOS-only empirical probe that creates a real disk image, lets ``hdiutil``
    mount it under ``/Volumes/<volname>`` the same way the system does for real
    drives, runs a ``CopyJob`` against that mount, force-detaches mid-copy, and
    records whether the failure is observable to ocopy or whether any files slipped
@@ -30,8 +32,10 @@ import uuid
 from pathlib import Path
 
 import pytest
+from click.testing import CliRunner
 
-from ocopy.verified_copy import CopyJob
+from ocopy.cli.ocopy import cli
+from ocopy.verified_copy import CopyJob, DestinationsDropped, copy_and_seal
 
 
 def test_destination_unmount_mid_copy_surfaces_error(tmp_path, mocker):
@@ -70,6 +74,76 @@ def test_destination_unmount_mid_copy_surfaces_error(tmp_path, mocker):
     )
 
 
+def test_failing_destination_is_dropped_and_others_finish(tmp_path, mocker):
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    for i in range(3):
+        (src / f"clip_{i}.mov").write_bytes(os.urandom(8_000))
+    (src / "sub" / "sidecar.xml").write_bytes(b"<xml/>")
+    dst_ok, victim = tmp_path / "dst_ok", tmp_path / "dst_victim"
+    dst_ok.mkdir()
+    victim.mkdir()
+
+    real_open = builtins.open
+
+    def fake_open(file, *args, **kwargs):
+        if str(victim) in str(file) and "clip_1.mov.copy_in_progress" in str(file):
+            raise OSError(errno.ENODEV, "No such device", str(file))
+        return real_open(file, *args, **kwargs)
+
+    mocker.patch("builtins.open", side_effect=fake_open)
+
+    result = CliRunner().invoke(cli, ["--isolate-failing-destinations", str(src), str(dst_ok), str(victim)])
+
+    assert result.exit_code == 1
+    assert f"{victim} was dropped for the rest of the job" in result.output
+    assert "No such device" in result.output
+    assert "It lacks 3 files:\nclip_1.mov\nclip_2.mov\nsub/sidecar.xml" in result.output
+    assert sorted(
+        p.relative_to(dst_ok / "src").as_posix() for p in (dst_ok / "src").rglob("*.*") if p.parent.name != "ascmhl"
+    ) == [
+        "clip_0.mov",
+        "clip_1.mov",
+        "clip_2.mov",
+        "sub/sidecar.xml",
+    ]
+    assert (dst_ok / "src" / "ascmhl").is_dir() and not (victim / "src" / "ascmhl").exists()
+    assert not (victim / "src" / "sub").exists()
+
+
+def test_stalled_destination_is_dropped(tmp_path, mocker):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a_big.mov").write_bytes(os.urandom(12 * 1024 * 1024))
+    (src / "b_small.mov").write_bytes(b"x" * 1000)
+    dst_ok, victim = tmp_path / "dst_ok", tmp_path / "dst_victim"
+    dst_ok.mkdir()
+    victim.mkdir()
+
+    real_open = builtins.open
+    release = threading.Event()
+
+    def fake_open(file, *args, **kwargs):
+        if str(victim) in str(file) and ".copy_in_progress" in str(file):
+            release.wait(timeout=30)
+        return real_open(file, *args, **kwargs)
+
+    mocker.patch("builtins.open", side_effect=fake_open)
+
+    try:
+        with pytest.raises(DestinationsDropped) as raised:
+            copy_and_seal(src, [dst_ok, victim], isolate_destinations=True, stall_timeout=0.2, mhl=False)
+    finally:
+        release.set()
+
+    assert raised.value.result.dropped_destinations == {victim: ["a_big.mov", "b_small.mov"]}
+    assert [f.source.name for f in raised.value.result.file_infos] == ["a_big.mov", "b_small.mov"]
+    [error] = raised.value.args[0]
+    assert "accepted no data for 0.2 seconds" in error.error_message
+    assert (dst_ok / "src" / "a_big.mov").read_bytes() == (src / "a_big.mov").read_bytes()
+    assert (dst_ok / "src" / "b_small.mov").exists() and not (victim / "src" / "b_small.mov").exists()
+
+
 def _hdiutil(*args: str) -> subprocess.CompletedProcess[str]:
     return subprocess.run(["hdiutil", *args], check=True, capture_output=True, text=True)
 
@@ -0,0 +1,63 @@
+"""Per-device reader limits and the parallel skip-existing verification they gate."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ocopy.devices import DeviceLimiter, device_of, is_rotational
+from ocopy.verified_copy import copy_and_seal
+
+
+def test_device_of_missing_path_uses_existing_parent(tmp_path):
+    assert device_of(tmp_path / "not" / "there.mov") == tmp_path.stat().st_dev
+    assert is_rotational(device_of(tmp_path)) in (True, False, None)
+
+
+@pytest.mark.parametrize("readers", [1, 3])
+def test_device_limiter_caps_concurrent_readers(tmp_path, readers):
+    limiter = DeviceLimiter(readers_per_device=readers)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def read(name: str) -> None:
+        nonlocal active, peak
+        with limiter.reading(tmp_path / name):
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=read, args=(f"f{i}",)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == readers
+
+
+def _card(root: Path, files: int) -> Path:
+    src = root / "card"
+    for i in range(files):
+        clip = src / f"CLIP{i // 5:02d}" / f"A{i:03d}.mov"
+        clip.parent.mkdir(parents=True, exist_ok=True)
+        clip.write_bytes(bytes([i]) * (1000 + i))
+    return src
+
+
+def test_parallel_resume_verification_keeps_order(tmp_path):
+    src = _card(tmp_path, 20)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    # Without a manifest there is no trusted digest, so every file is re-verified.
+    copy_and_seal(src, [dst], mhl=False)
+
+    sequential = copy_and_seal(src, [dst], skip_existing=True, mhl=False, verify_workers=1)
+    parallel = copy_and_seal(src, [dst], skip_existing=True, mhl=False, verify_workers=8, readers_per_device=4)
+
+    assert [fi.source for fi in parallel.file_infos] == [fi.source for fi in sequential.file_infos]
+    assert [fi.file_hash for fi in parallel.file_infos] == [fi.file_hash for fi in sequential.file_infos]
+    assert parallel.skipped_files == sequential.skipped_files == 20
@@ -72,7 +72,7 @@ def test_legacy_mhl_index_loaded_once_per_many_files(tmp_path, mocker):
 
     # Spy the uncached XML→dict builder: ``@cache`` wraps ``_cached_load_mhl_index``,
     # so spying that name would count every ``find_hash`` call, not cache misses.
-    spy = mocker.spy(mhl_mod, "_mhl_text_to_xxh64_index")
+    spy = mocker.spy(mhl_mod, "_mhl_text_to_digest_index")
 
     hl = E.hashlist(E.creatorinfo(E.name("t")), version="1.1")
     for name in ("a.txt", "b.txt", "c.txt"):
@@ -119,7 +119,7 @@ def test_legacy_mhl_cache_invalidates_when_mhl_mtime_changes(tmp_path, mocker):
     mhl_path = find_mhl(f)
     assert mhl_path is not None
 
-    spy = mocker.spy(mhl_mod, "_mhl_text_to_xxh64_index")
+    spy = mocker.spy(mhl_mod, "_mhl_text_to_digest_index")
 
     find_hash(f)
     assert spy.call_count == 1
@@ -0,0 +1,217 @@
+"""Selectable file digests (``--hash-format``) and extra digests from the same pass (``--extra-hash``)."""
+
+from __future__ import annotations
+
+import hashlib
+import random
+
+import pytest
+import xxhash
+from ascmhl.history import MHLHistory
+
+from ocopy.block_hash import BlockHasher
+from ocopy.checkpoint import Checkpoint
+from ocopy.hash import find_hash, get_hash, multi_xxhash_check
+from ocopy.hash_formats import BackgroundSink, MultiHasher, new_hasher
+from ocopy.verified_copy import CopyTreeError, copy_and_seal
+
+pytest.importorskip("ascmhl")
+
+
+def test_new_hasher_rejects_unknown_format():
+    with pytest.raises(ValueError, match="Unsupported hash format 'md4'"):
+        new_hasher("md4")
+
+
+def test_checkpoint_keeps_formats_apart(tmp_path):
+    cp = Checkpoint(tmp_path / "dest_root")
+    cp.ensure_exists()
+    cp.record("clip.mov", 12, 1234.0, "a" * 16)
+    cp.record("clip.mov", 12, 1234.0, "b" * 32, "xxh128")
+
+    assert cp.lookup("clip.mov", 12, 1234.0) == "a" * 16
+    assert cp.lookup("clip.mov", 12, 1234.0, "xxh128") == "b" * 32
+    assert cp.lookup("clip.mov", 12, 1234.0, "xxh3") is None
+
+
+@pytest.mark.parametrize(
+    ("hash_format", "reference"), [("xxh3", xxhash.xxh3_64), ("xxh128", xxhash.xxh3_128), ("xxh64", xxhash.xxh64)]
+)
+def test_copy_and_seal_records_selected_format(tmp_path, hash_format, reference):
+    src = tmp_path / "card"
+    src.mkdir()
+    payload = random.randbytes(300_000)
+    (src / "clip.mov").write_bytes(payload)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+
+    result = copy_and_seal(src, [dst], hash_format=hash_format)
+
+    [info] = result.file_infos
+    assert info.hash_format == hash_format
+    assert info.file_hash == reference(payload).hexdigest()
+    copied = dst / "card" / "clip.mov"
+    assert get_hash(copied, hash_format=hash_format) == info.file_hash
+
+    history = MHLHistory.load_from_path(str(dst / "card"))
+    media_hash = history.hash_lists[-1].find_media_hash_for_path("clip.mov")
+    assert media_hash is not None
+    entry = media_hash.find_hash_entry_for_format(hash_format)
+    assert entry is not None and entry.hash_string == info.file_hash
+    assert find_hash(copied, hash_format) == info.file_hash
+
+
+def test_skip_existing_only_trusts_matching_format(tmp_path, mocker):
+    """An xxh64-sealed destination isn't trusted by an xxh128 run: it gets re-hashed instead."""
+    src = tmp_path / "card"
+    src.mkdir()
+    (src / "clip.mov").write_bytes(random.randbytes(10_000))
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    copy_and_seal(src, [dst])
+
+    check = mocker.patch("ocopy.verified_copy.multi_xxhash_check", wraps=multi_xxhash_check)
+    result = copy_and_seal(src, [dst], skip_existing=True, hash_format="xxh128")
+
+    assert check.call_count == 1
+    assert check.call_args.args[1] == "xxh128"
+    assert result.skipped_files == 1
+    latest = MHLHistory.load_from_path(str(dst / "card")).hash_lists[-1].find_media_hash_for_path("clip.mov")
+    assert latest is not None
+    assert {e.hash_format: e.action for e in latest.hash_entries} == {"xxh64": "verified", "xxh128": "verified"}
+
+    check.reset_mock()
+    copy_and_seal(src, [dst], skip_existing=True, hash_format="xxh128")
+    assert check.call_count == 0
+
+
+def test_wrong_digest_on_source_names_the_format(tmp_path, mocker):
+    src = tmp_path / "card"
+    src.mkdir()
+    (src / "clip.mov").write_bytes(b"x")
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    mocker.patch("ocopy.verified_copy.find_hash", return_value="0" * 32)
+
+    with pytest.raises(CopyTreeError, match="xxh128 present on source medium is not correct"):
+        copy_and_seal(src, [dst], hash_format="xxh128")
+
+
+def test_legacy_mhl_requires_xxh64(tmp_path):
+    src = tmp_path / "card"
+    src.mkdir()
+    (src / "clip.mov").write_bytes(b"x")
+    dst = tmp_path / "dst"
+    dst.mkdir()
+
+    with pytest.raises(ValueError, match="only support xxh64"):
+        copy_and_seal(src, [dst], legacy_mhl=True, hash_format="xxh3")
+    assert not (dst / "card").exists()
+
+
+def test_c4_matches_ascmhl():
+    from ascmhl.hasher import C4
+
+    payload = random.randbytes(100_000)
+    reference = C4()
+    reference.hasher.update(payload)
+    ours = new_hasher("c4")
+    ours.update(payload)
+    assert ours.hexdigest() == reference.string_digest()
+
+
+def test_multi_hasher_matches_single_hashers():
+    payload = random.randbytes(3 * 1024 * 1024 + 17)
+    hasher = MultiHasher(["xxh64", "md5", "sha1", "c4"])
+    for offset in range(0, len(payload), 1024 * 1024):
+        hasher.update(payload[offset : offset + 1024 * 1024])
+
+    digests = hasher.hexdigests()
+    assert digests["md5"] == hashlib.md5(payload).hexdigest()
+    assert digests["sha1"] == hashlib.sha1(payload).hexdigest()
+    assert digests["xxh64"] == xxhash.xxh64(payload).hexdigest()
+    assert len(digests["c4"]) == 90 and digests["c4"].startswith("c4")
+
+
+def test_extra_hashes_recorded_in_ascmhl(tmp_path, mocker):
+    src = tmp_path / "card"
+    src.mkdir()
+    payload = random.randbytes(200_000)
+    (src / "clip.mov").write_bytes(payload)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+
+    result = copy_and_seal(src, [dst], extra_hash_formats=["md5", "sha1"])
+
+    [info] = result.file_infos
+    assert info.extra_hashes == {"md5": hashlib.md5(payload).hexdigest(), "sha1": hashlib.sha1(payload).hexdigest()}
+    history = MHLHistory.load_from_path(str(dst / "card"))
+    media_hash = history.hash_lists[-1].find_media_hash_for_path("clip.mov")
+    assert media_hash is not None
+    assert {e.hash_format: e.hash_string for e in media_hash.hash_entries} == {
+        "xxh64": info.file_hash,
+        **info.extra_hashes,
+    }
+
+    # Every requested digest is on record now, so a rerun trusts the destination without reading it.
+    check = mocker.patch("ocopy.verified_copy.multi_xxhash_check", wraps=multi_xxhash_check)
+    rerun = copy_and_seal(src, [dst], skip_existing=True, extra_hash_formats=["md5", "sha1"])
+    assert check.call_count == 0
+    assert rerun.file_infos[0].extra_hashes == info.extra_hashes
+
+    # A new extra digest forces one verification pass that computes it from the source.
+    rerun = copy_and_seal(src, [dst], skip_existing=True, extra_hash_formats=["c4"])
+    assert check.call_count == 1
+    assert rerun.file_infos[0].extra_hashes["c4"].startswith("c4")
+
+
+def test_legacy_mhl_extra_hashes(tmp_path, mocker):
+    src = tmp_path / "card"
+    src.mkdir()
+    payload = b"delivery" * 1000
+    (src / "clip.mov").write_bytes(payload)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+
+    copy_and_seal(src, [dst], legacy_mhl=True, extra_hash_formats=["md5"])
+
+    [mhl] = (dst / "card").glob("*.mhl")
+    assert f"<md5>{hashlib.md5(payload).hexdigest()}</md5>" in mhl.read_text()
+    assert find_hash(dst / "card" / "clip.mov", "md5") == hashlib.md5(payload).hexdigest()
+    assert find_hash(dst / "card" / "clip.mov", "sha1") is None
+
+    # The checkpoint is gone; the legacy MHL alone vouches for both digests.
+    check = mocker.patch("ocopy.verified_copy.multi_xxhash_check", wraps=multi_xxhash_check)
+    rerun = copy_and_seal(src, [dst], skip_existing=True, legacy_mhl=True, extra_hash_formats=["md5"])
+    assert check.call_count == 0
+    assert rerun.skipped_files == 1
+    with pytest.raises(ValueError, match="can't hold c4"):
+        copy_and_seal(src, [dst], legacy_mhl=True, extra_hash_formats=["c4"])
+
+
+@pytest.mark.parametrize("background_after", [None, 0, 2 * 1024 * 1024])
+def test_background_hashing_gives_same_digests(tmp_path, background_after):
+    payload = random.randbytes(5 * 1024 * 1024 + 3)
+    blocks = BlockHasher(1024 * 1024)
+    hasher = MultiHasher(["xxh64", "md5"], background_after=background_after, consumers=[blocks.update])
+    for offset in range(0, len(payload), 1024 * 1024):
+        hasher.update(payload[offset : offset + 1024 * 1024])
+
+    assert hasher.hexdigests() == {"xxh64": xxhash.xxh64(payload).hexdigest(), "md5": hashlib.md5(payload).hexdigest()}
+    assert len(blocks.finish()) == 6
+
+    path = tmp_path / "clip.mov"
+    path.write_bytes(payload)
+    extra = {"sha1": ""}
+    assert get_hash(path, parallel=True, extra_hashes=extra) == get_hash(path, parallel=False)
+    assert extra["sha1"] == hashlib.sha1(payload).hexdigest()
+
+
+def test_background_sink_reraises_consumer_error():
+    def explode(data):
+        raise OSError("boom")
+
+    sink = BackgroundSink(explode)
+    sink.update(b"x")
+    with pytest.raises(OSError, match="boom"):
+        sink.close()
@@ -0,0 +1,112 @@
+"""The process-wide read buffer budget (``--memory-budget``)."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+from threading import Thread
+
+import pytest
+from click.testing import CliRunner
+
+from ocopy.cli.ocopy import cli
+from ocopy.memory import ByteBudget, Lease, get_byte_budget, set_byte_budget
+from ocopy.verified_copy import copy_and_seal
+
+CHUNK = 1024 * 1024
+
+
+@pytest.fixture
+def budget():
+    budget = ByteBudget(3 * CHUNK)
+    previous = set_byte_budget(budget)
+    yield budget
+    set_byte_budget(previous)
+
+
+def test_lease_frees_after_last_holder():
+    freed = []
+    lease = Lease(3, lambda: freed.append(True))
+    lease.release()
+    lease.release()
+    assert not freed
+    lease.release()
+    assert freed == [True]
+
+
+def test_oversized_read_does_not_deadlock():
+    budget = ByteBudget(10)
+    chunk, lease = budget.read(io.BytesIO(b"x" * 100), 100)
+    assert chunk == b"x" * 100 and budget.in_flight == 100
+
+    waiting = Thread(target=budget.acquire, args=(5,))
+    waiting.start()
+    waiting.join(0.1)
+    assert waiting.is_alive()
+    assert lease is not None
+    lease.release()
+    waiting.join(5)
+    assert not waiting.is_alive()
+    assert budget.in_flight == 5 and budget.waits == 1
+    budget.release(5)
+
+    chunk, lease = budget.read(io.BytesIO(b""), 100)
+    assert chunk == b"" and lease is None and budget.in_flight == 0
+
+
+def test_concurrent_copies_stay_within_budget(tmp_path, budget):
+    destinations = [tmp_path / "raid", tmp_path / "shuttle"]
+    for destination in destinations:
+        destination.mkdir()
+    sources = []
+    for n in range(3):
+        source = tmp_path / f"card{n}"
+        source.mkdir()
+        (source / "clip.mov").write_bytes(os.urandom(8 * CHUNK + 17))
+        sources.append(source)
+
+    errors = []
+
+    def run(source):
+        try:
+            copy_and_seal(source, [d / source.name for d in destinations], mhl=False)
+        except Exception as e:
+            errors.append(e)
+
+    for destination in destinations:
+        for source in sources:
+            (destination / source.name).mkdir()
+    threads = [Thread(target=run, args=(source,)) for source in sources]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    for source in sources:
+        for destination in destinations:
+            copied = destination / source.name / source.name / "clip.mov"
+            assert copied.read_bytes() == (source / "clip.mov").read_bytes()
+    assert budget.peak <= budget.limit
+    assert budget.waits > 0
+    assert budget.in_flight == 0
+
+
+def test_memory_budget_cli_reports_usage(tmp_path):
+    src = tmp_path / "card"
+    src.mkdir()
+    (src / "clip.mov").write_bytes(os.urandom(3 * CHUNK))
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    report = tmp_path / "profile.json"
+
+    result = CliRunner().invoke(
+        cli, ["--memory-budget", "4", "--profile-report", str(report), "--no-update-check", str(src), str(dst)]
+    )
+    assert result.exit_code == 0, result.output
+    memory = json.loads(report.read_text())["run"]["memory"]
+    assert memory["limit_bytes"] == 4_000_000
+    assert 0 < memory["peak_bytes"] <= 4_000_000
+    assert memory["in_flight_bytes"] == 0
+    assert get_byte_budget() is None
@@ -5,7 +5,7 @@ from __future__ import annotations
 from collections.abc import Sequence
 from pathlib import Path
 from queue import Empty, Queue
-from threading import Thread
+from threading import Condition, Thread
 from time import sleep
 
 import pytest
@@ -146,3 +146,59 @@ def test_progress_reader_exits_when_copy_finishes(tmp_path, mocker):
     assert len(reader_threads) == 1
     reader_threads[0].join(timeout=5.0)
     assert not reader_threads[0].is_alive(), "progress reader thread should exit after the copy job completes"
+
+
+def test_copy_job_wait_returns_on_completion(tmp_path):
+    """``wait()`` blocks on the completion event rather than a polling loop."""
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("hello")
+    dest = tmp_path / "dst"
+    dest.mkdir()
+
+    job = CopyJob(source, [dest], auto_start=False)
+    assert job.wait(timeout=0) is False
+
+    job.start()
+    assert job.wait(timeout=30) is True
+    assert job.finished
+    assert job.percent_done == 100
+    assert (dest / "src" / "a.txt").read_text() == "hello"
+
+
+def test_progress_iterator_ends_with_job(tmp_path):
+    """The progress iterator wakes on the final notification even when no bytes were reported."""
+    source = tmp_path / "src"
+    source.mkdir()
+    dest = tmp_path / "dst"
+    dest.mkdir()
+
+    job = CopyJob(source, [dest], mhl=False)
+    assert len(list(job.progress)) == 100
+    assert job.wait(timeout=5)
+
+
+def test_parallel_skip_existing_resume_reports_verify_progress(tmp_path):
+    """Files verified on the ``verify_executor`` threads advance the job's progress as they are read."""
+    source = tmp_path / "src"
+    source.mkdir()
+    for i in range(6):
+        (source / f"clip{i}.mov").write_bytes(bytes([i]) * 300_000)
+    dest = tmp_path / "dst"
+    dest.mkdir()
+    assert CopyJob(source, [dest], mhl=False).wait(timeout=30)
+
+    seen: list[tuple[bool, float]] = []
+
+    class RecordingCondition(Condition):
+        def notify_all(self) -> None:
+            seen.append((job.finished, job.total_done))
+            super().notify_all()
+
+    job = CopyJob(
+        source, [dest], skip_existing=True, mhl=False, verify_workers=4, progress_changed=RecordingCondition()
+    )
+    assert job.wait(timeout=30)
+
+    assert job.skipped_files == 6
+    assert max(done for finished, done in seen if not finished) > 0
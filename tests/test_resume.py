@@ -5,13 +5,18 @@ interrupted prior run. Doing so keeps the checkpoint - not an ASC MHL manifest -
 the sole trust source, so the assertions actually exercise the resume path.
 """
 
+import builtins
 import importlib
+import os
 from shutil import copystat
 
+import ocopy.verified_copy as vc
 from ocopy.checkpoint import Checkpoint
 from ocopy.hash import get_hash
 from ocopy.verified_copy import copy_and_seal
 
+MiB = 1024 * 1024
+
 
 def _seed_resume_state(tmp_path, names: list[str]):
     """Create ``src/`` with the given files plus a matching destination + checkpoint.
@@ -97,3 +102,91 @@ def test_checkpoint_cleared_after_successful_seal(tmp_path):
     dest_parent.mkdir()
     copy_and_seal(src, [dest_parent], skip_existing=True)
     assert not (dest_parent / "src" / Checkpoint.FILENAME).exists()
+
+
+def _cancel_after(calls: int):
+    """Token that fires on its ``calls + 1``-th call (copytree asks once per entry, copy() once per chunk)."""
+    seen = {"n": 0}
+
+    def token() -> bool:
+        seen["n"] += 1
+        return seen["n"] > calls
+
+    return token
+
+
+def _count_written_bytes(mocker) -> dict[str, int]:
+    """Count bytes ``copy()`` writes to destination files (resume must skip the verified prefix)."""
+    written = {"n": 0}
+
+    class CountingFile:
+        def __init__(self, f):
+            self._f = f
+
+        def write(self, data):
+            written["n"] += len(data)
+            return self._f.write(data)
+
+        def __getattr__(self, name):
+            return getattr(self._f, name)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self._f.close()
+            return False
+
+    def counting_open(path, mode="r", *args, **kwargs):
+        f = builtins.open(path, mode, *args, **kwargs)  # noqa: SIM115  (closed by the wrapper)
+        return CountingFile(f) if "b" in mode and mode != "rb" else f
+
+    mocker.patch.object(vc, "open", side_effect=counting_open, create=True)
+    return written
+
+
+def _interrupted_large_file(tmp_path, monkeypatch):
+    """Cancel a 3 MiB copy after two 1 MiB chunks with durable records every MiB."""
+    monkeypatch.setattr(vc, "RESUME_INTERVAL", MiB)
+    src = tmp_path / "src"
+    src.mkdir()
+    big = src / "clip.mov"
+    big.write_bytes(os.urandom(3 * MiB))
+    dest_parent = tmp_path / "d1"
+    dest_parent.mkdir()
+
+    result = copy_and_seal(src, [dest_parent], cancel_token=_cancel_after(3))
+
+    tmp = dest_parent / "src" / "clip.mov.copy_in_progress"
+    assert result.cancelled
+    assert tmp.stat().st_size == 2 * MiB, "in-progress file must survive a mid-file cancel"
+    st = big.stat()
+    assert Checkpoint(dest_parent / "src").partial_offset("clip.mov", st.st_size, st.st_mtime) == 2 * MiB
+    return src, dest_parent, big, tmp
+
+
+def test_resume_continues_partial_file(tmp_path, monkeypatch, mocker):
+    src, dest_parent, big, tmp = _interrupted_large_file(tmp_path, monkeypatch)
+    written = _count_written_bytes(mocker)
+
+    result = copy_and_seal(src, [dest_parent])
+
+    final = dest_parent / "src" / "clip.mov"
+    assert final.read_bytes() == big.read_bytes()
+    assert not tmp.exists()
+    assert written["n"] == 1 * MiB, "only the missing tail may be written on resume"
+    assert [fi.file_hash for fi in result.file_infos] == [get_hash(big)], "digest must match a non-resumed copy"
+
+
+def test_resume_rewrites_from_first_mismatch(tmp_path, monkeypatch, mocker):
+    """A damaged in-progress prefix is detected against the source and rewritten from there."""
+    src, dest_parent, big, tmp = _interrupted_large_file(tmp_path, monkeypatch)
+    with open(tmp, "r+b") as f:
+        f.seek(MiB + 10)
+        f.write(b"\0" * 4)
+    written = _count_written_bytes(mocker)
+
+    copy_and_seal(src, [dest_parent])
+
+    assert (dest_parent / "src" / "clip.mov").read_bytes() == big.read_bytes()
+    assert written["n"] == 2 * MiB
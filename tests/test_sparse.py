@@ -0,0 +1,77 @@
+"""Hole-aware copying (``--sparse``)."""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+
+import pytest
+
+from ocopy.hash import get_hash
+from ocopy.throttle import Throttle
+from ocopy.utils import file_holes
+from ocopy.verified_copy import copy_and_seal
+
+MIB = 1024 * 1024
+
+
+def make_sparse(path, size, data):
+    with open(path, "wb") as f:
+        f.truncate(size)
+        for offset, chunk in data.items():
+            f.seek(offset)
+            f.write(chunk)
+    if not file_holes(path):
+        pytest.skip("the filesystem doesn't report holes")
+
+
+def allocated(path) -> int:
+    return os.stat(path).st_blocks * 512
+
+
+def test_sparse_copy_keeps_holes_and_digest(tmp_path, mocker):
+    src = tmp_path / "card"
+    src.mkdir()
+    clip = src / "clip.mov"
+    size = 64 * MIB + 123
+    head, middle = os.urandom(MIB + 5), os.urandom(3 * MIB)
+    make_sparse(clip, size, {0: head, 40 * MIB: middle})
+    raid, shuttle = tmp_path / "raid", tmp_path / "shuttle"
+    raid.mkdir()
+    shuttle.mkdir()
+    charged: Counter[float | None] = Counter()
+
+    def consume(self, nbytes, ops=1):
+        charged[self.bytes_per_second] += nbytes
+
+    mocker.patch.object(Throttle, "consume", consume)
+
+    result = copy_and_seal(src, [raid, shuttle], sparse=True, bandwidth_limit=1e12)
+
+    # Verification reads the source and both copies in full; the copy itself only reads the data.
+    assert charged[1e12] - 3 * size < 8 * MIB
+    digest = get_hash(clip)
+    assert [info.file_hash for info in result.file_infos] == [digest]
+    for destination in (raid, shuttle):
+        copied = destination / "card" / "clip.mov"
+        assert copied.stat().st_size == size
+        assert get_hash(copied) == digest
+        assert allocated(copied) < 8 * MIB
+        with open(copied, "rb") as f:
+            assert f.read(len(head)) == head
+            f.seek(40 * MIB)
+            assert f.read(len(middle)) == middle
+
+
+def test_sparse_copy_of_a_file_that_is_all_hole(tmp_path):
+    src = tmp_path / "card"
+    src.mkdir()
+    make_sparse(src / "empty.mov", 5 * MIB, {})
+    dst = tmp_path / "dst"
+    dst.mkdir()
+
+    copy_and_seal(src, [dst], sparse=True, mhl=False)
+
+    copied = dst / "card" / "empty.mov"
+    assert copied.read_bytes() == bytes(5 * MIB)
+    assert allocated(copied) < MIB
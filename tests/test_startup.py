@@ -0,0 +1,38 @@
+"""Startup guard: ``ocopy --version`` and ``--help`` must not import the deferred heavy dependencies.
+
+Runs in a fresh interpreter because the test session itself has long since imported
+everything. Checking the module set rather than wall-clock time keeps the guard
+deterministic across CI runners.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Loaded only by the code paths that need them: MHL flavors, the update check,
+# sleep inhibit and the archive index.
+DEFERRED = {"ascmhl", "lxml", "defusedxml", "requests", "urllib3", "wakepy", "sqlite3", "packaging"}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from ocopy.cli.ocopy import cli
+try:
+    cli([sys.argv[1]])
+except SystemExit:
+    pass
+print(json.dumps({"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}))
+"""
+
+
+@pytest.mark.parametrize("flag", ["--version", "--help"])
+def test_cli_startup_defers_heavy_imports(flag):
+    proc = subprocess.run([sys.executable, "-c", _PROBE, flag], capture_output=True, text=True, check=True)
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    loaded = {name.partition(".")[0] for name in probe["modules"]}
+    assert not loaded & DEFERRED, f"ocopy {flag} took {probe['seconds']:.3f}s and imported {sorted(loaded & DEFERRED)}"
@@ -0,0 +1,131 @@
+"""Bandwidth caps (``--max-bandwidth``, ``--destination-bandwidth``) and I/O priority (``--io-class``) of copy jobs."""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+
+import pytest
+from click.testing import CliRunner
+
+from ocopy import io_priority as io_priority_module
+from ocopy import verified_copy
+from ocopy.cli.ocopy import cli
+from ocopy.io_priority import io_priority
+from ocopy.throttle import BandwidthLimits, Throttle
+from ocopy.verified_copy import copy_and_seal
+
+
+def test_bandwidth_limits_pick_destination_caps(tmp_path):
+    limits = BandwidthLimits(100.0, {tmp_path / "raid": 10.0})
+
+    raid = limits.for_write(tmp_path / "raid" / "card" / "clip.mov")
+    assert raid is not None and raid.bytes_per_second == 10.0
+    assert limits.for_write(tmp_path / "shuttle" / "clip.mov") is None
+
+    reads = limits.for_read(tmp_path / "raid" / "card" / "clip.mov")
+    assert reads is not None and [t.bytes_per_second for t in reads.throttles] == [100.0, 10.0]
+    assert BandwidthLimits().for_read(tmp_path / "card" / "clip.mov") is None
+
+
+def test_copy_charges_job_and_destination_caps(tmp_path, mocker):
+    src = tmp_path / "card"
+    src.mkdir()
+    size = 3 * 1024 * 1024 + 5
+    (src / "clip.mov").write_bytes(os.urandom(size))
+    raid, shuttle = tmp_path / "raid", tmp_path / "shuttle"
+    raid.mkdir()
+    shuttle.mkdir()
+
+    charged: Counter[float | None] = Counter()
+
+    def consume(self, nbytes, ops=1):
+        charged[self.bytes_per_second] += nbytes
+
+    mocker.patch.object(Throttle, "consume", consume)
+    copy_and_seal(src, [raid, shuttle], bandwidth_limit=1e12, destination_bandwidth_limits={raid: 1e9})
+
+    # The job cap sees the source copy read and the verification reads of the source and both copies.
+    assert charged == {1e12: 4 * size, 1e9: 2 * size}
+
+
+def test_destination_bandwidth_cli_errors(tmp_path):
+    src = tmp_path / "card"
+    src.mkdir()
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    runner = CliRunner()
+
+    result = runner.invoke(cli, [str(src), str(dst), "--destination-bandwidth", f"{tmp_path / 'other'}=100"])
+    assert result.exit_code == 2 and "is not one of the destinations" in result.output
+    result = runner.invoke(cli, [str(src), str(dst), "--destination-bandwidth", "fast"])
+    assert result.exit_code == 2 and "positive number" in result.output
+    result = runner.invoke(cli, [str(src), str(dst), "--io-level", "3"])
+    assert result.exit_code == 2 and "--io-level needs --io-class" in result.output
+
+
+def test_io_priority_is_inherited_by_new_threads():
+    numbers = io_priority_module._syscall_numbers()
+    if numbers is None:
+        pytest.skip("ioprio syscalls are Linux-only")
+    _, ioprio_get = numbers
+
+    def current() -> int:
+        return io_priority_module._syscall(ioprio_get, io_priority_module._IOPRIO_WHO_PROCESS, 0)
+
+    before = current()
+    seen: list[int] = []
+    with io_priority("idle"):
+        thread = Thread(target=lambda: seen.append(current()))
+        thread.start()
+        thread.join()
+    assert seen == [io_priority_module.IO_CLASSES["idle"] << io_priority_module._IOPRIO_CLASS_SHIFT]
+    assert current() == before
+
+    with pytest.raises(ValueError, match="Unsupported I/O class"), io_priority("urgent"):
+        pass
+
+
+def test_shared_verify_pool_runs_at_the_jobs_io_priority(tmp_path, mocker):
+    numbers = io_priority_module._syscall_numbers()
+    if numbers is None:
+        pytest.skip("ioprio syscalls are Linux-only")
+    _, ioprio_get = numbers
+    src = tmp_path / "card"
+    src.mkdir()
+    for n in range(3):
+        (src / f"clip{n}.mov").write_bytes(bytes([n]) * 1000)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    copy_and_seal(src, [dst], mhl=False)
+
+    seen: list[int] = []
+    real = verified_copy._verified_file_info
+
+    def record(*args, **kwargs):
+        seen.append(io_priority_module._syscall(ioprio_get, io_priority_module._IOPRIO_WHO_PROCESS, 0))
+        return real(*args, **kwargs)
+
+    mocker.patch.object(verified_copy, "_verified_file_info", side_effect=record)
+    # Its thread was started before the job, like the pool of ``ocopy serve``.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(lambda: None).result()
+        copy_and_seal(src, [dst], skip_existing=True, mhl=False, io_class="idle", verify_executor=executor)
+
+    assert seen == [io_priority_module.IO_CLASSES["idle"] << io_priority_module._IOPRIO_CLASS_SHIFT] * 3
+
+
+def test_copy_with_io_class(tmp_path):
+    src = tmp_path / "card"
+    src.mkdir()
+    (src / "clip.mov").write_bytes(b"x" * 1000)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+
+    result = copy_and_seal(src, [dst], io_class="best-effort", io_level=7, mhl=False)
+    assert len(result.file_infos) == 1
+    assert (dst / "card" / "clip.mov").read_bytes() == b"x" * 1000
+    with pytest.raises(ValueError, match="between 0 and 7"):
+        copy_and_seal(src, [dst], io_class="best-effort", io_level=9)
@@ -0,0 +1,48 @@
+import contextlib
+
+from ocopy.tracing import StageProfiler, get_tracer, set_tracer, span
+from ocopy.verified_copy import copy_and_seal
+
+
+def test_span_is_a_shared_noop_without_tracer():
+    assert get_tracer() is None
+    assert span("copy.read") is span("verify", files=3)
+
+
+def test_stage_profiler_aggregates_and_buckets():
+    profiler = StageProfiler()
+    for _ in range(3):
+        with profiler.start_as_current_span("stage"):
+            pass
+
+    stage = profiler.report(note="x")["stages"]["stage"]
+    assert stage["count"] == 3
+    assert sum(stage["histogram_ms"].values()) == 3
+    assert stage["min_ms"] <= stage["mean_ms"] <= stage["max_ms"]
+    assert profiler.report(note="x")["run"] == {"note": "x"}
+
+
+def test_custom_tracer_sees_pipeline_stages(card):
+    """Any object with an OpenTelemetry-style ``start_as_current_span`` can be plugged in."""
+
+    class RecordingTracer:
+        def __init__(self):
+            self.spans = []
+
+        @contextlib.contextmanager
+        def start_as_current_span(self, name, attributes=None):
+            self.spans.append((name, attributes))
+            yield
+
+    src_dir, destinations = card
+    tracer = RecordingTracer()
+    previous = set_tracer(tracer)
+    try:
+        copy_and_seal(src_dir, destinations)
+    finally:
+        set_tracer(previous)
+
+    names = {name for name, _ in tracer.spans}
+    assert {"copy.file", "copy.queue_put", "copy.rename", "verify.file", "seal.ascmhl"} <= names
+    copied = {attributes["file"] for name, attributes in tracer.spans if name == "copy.file"}
+    assert copied == {str(p) for p in src_dir.rglob("*.mov")}
@@ -1,3 +1,4 @@
+import json
 import time
 
 import requests
@@ -5,7 +6,10 @@ from packaging.version import Version
 
 import ocopy
 from ocopy.cli.update import (
+    RELEASES_URL,
+    UPDATE_CHECK_TTL,
     Updater,
+    _cache_path,
     _is_pipx_environment,
     _is_uv_tool_environment,
     _normalize_installer_label,
@@ -212,3 +216,59 @@ def test_suggested_update_command_conda_installer(mocker, tmp_path, monkeypatch)
     mocker.patch("ocopy.cli.update._read_installer", return_value="conda")
     mocker.patch("ocopy.cli.update._is_uv_tool_environment", return_value=False)
     assert suggested_update_command() == "python -m pip install -U ocopy"
+
+
+def _finished_updater(**kwargs) -> Updater:
+    updater = Updater(**kwargs)
+    updater.join(timeout=5)
+    assert updater.finished
+    return updater
+
+
+def test_updater_caches_latest_release(requests_mock, mocker):
+    requests_mock.get(RELEASES_URL, json={"tag_name": "0.6.5"})
+    mocker.patch("ocopy.cli.update.get_version", return_value="0.0.1")
+
+    assert _finished_updater().needs_update is True
+    assert _finished_updater().needs_update is True
+    assert requests_mock.call_count == 1, "a fresh cache entry must answer without touching the network"
+
+
+def test_updater_caches_failed_lookup(requests_mock, mocker):
+    requests_mock.get(RELEASES_URL, exc=requests.exceptions.ConnectTimeout)
+    mocker.patch("ocopy.cli.update.get_version", return_value="0.0.1")
+
+    assert _finished_updater().needs_update is False
+    assert _finished_updater().needs_update is False
+    assert requests_mock.call_count == 1, "offline runs must not retry until the cache expires"
+
+
+def test_updater_refreshes_stale_cache(requests_mock, mocker):
+    requests_mock.get(RELEASES_URL, json={"tag_name": "0.6.5"})
+    mocker.patch("ocopy.cli.update.get_version", return_value="0.0.1")
+    _cache_path().parent.mkdir(parents=True)
+    _cache_path().write_text(json.dumps({"checked_at": time.time() - UPDATE_CHECK_TTL - 1, "tag_name": "0.0.1"}))
+
+    assert _finished_updater().latest_version == Version("0.6.5")
+    assert requests_mock.call_count == 1
+
+
+def test_updater_disabled(requests_mock, monkeypatch):
+    requests_mock.get(RELEASES_URL, json={"tag_name": "0.6.5"})
+
+    assert _finished_updater(enabled=False).needs_update is False
+    monkeypatch.setenv("OCOPY_NO_UPDATE_CHECK", "1")
+    assert _finished_updater().needs_update is False
+    assert requests_mock.call_count == 0
+
+
+def test_read_installer_is_memoized(mocker):
+    mock_dist = mocker.Mock()
+    mock_dist.metadata = {"Name": "ocopy"}
+    mock_dist.read_text = mocker.Mock(return_value="pip\n")
+    mock_dist._path = "/fake/ocopy-1.0.dist-info"
+    scan = mocker.patch("ocopy.cli.update.distributions", return_value=[mock_dist])
+
+    assert _read_installer("ocopy") == "pip"
+    assert _read_installer("ocopy") == "pip"
+    assert scan.call_count == 1